@@ -1,9 +1,13 @@
 """Admin endpoints. Laravel-exact: status, message, editors/editor/creators/user/projects/project. id/email in path = uuid or email."""
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from app.core.dependencies import require_auth
+from app.core.dependencies import require_auth, strict_rate_limit
+from app.core.json_response import json_response
 from app.core.laravel_response import success_with_message
+from app.core.lookup_cache import get_lookup_cache
 from app.db.session import get_db
 from app.services.admin_service import AdminService
 
@@ -18,15 +22,17 @@ def get_admin_service(db: Session = Depends(get_db)) -> AdminService:
 @router.get("/editors", dependencies=[Depends(require_auth)])
 def list_editors(
     page: int = Query(1, ge=1),
+    approximate: bool = Query(False, description="Estimate total from table statistics instead of counting"),
     service: AdminService = Depends(get_admin_service),
 ):
-    result = service.list_editors(page=page)
-    return success_with_message(
+    result = service.list_editors(page=page, approximate=approximate)
+    return json_response(success_with_message(
         "Editors Loaded Successfully",
         editors=result["editors"],
         total=result["total"],
         page=result["page"],
-    )
+        total_approximate=result["approximate"],
+    ))
 
 
 @router.get("/editors/{id}", dependencies=[Depends(require_auth)])
@@ -48,29 +54,36 @@ def get_creator(id: str, service: AdminService = Depends(get_admin_service)):
 @router.get("/creators", dependencies=[Depends(require_auth)])
 def list_creators(
     page: int = Query(1, ge=1),
+    approximate: bool = Query(False, description="Estimate total from table statistics instead of counting"),
     service: AdminService = Depends(get_admin_service),
 ):
-    result = service.list_creators(page=page)
-    return success_with_message(
+    result = service.list_creators(page=page, approximate=approximate)
+    return json_response(success_with_message(
         "Creators Loaded Successfully",
         creators=result["creators"],
         total=result["total"],
         page=result["page"],
-    )
+        total_approximate=result["approximate"],
+    ))
 
 
 @router.get("/projects", dependencies=[Depends(require_auth)])
 def list_projects(
     page: int = Query(1, ge=1),
+    search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    approximate: bool = Query(False, description="Estimate total from table statistics instead of counting"),
     service: AdminService = Depends(get_admin_service),
 ):
-    result = service.list_projects(page=page)
-    return success_with_message(
+    result = service.list_projects(page=page, search=search, cursor=cursor, approximate=approximate)
+    return json_response(success_with_message(
         "Projects Loaded Successfully",
         projects=result["projects"],
         total=result["total"],
         page=result["page"],
-    )
+        next_cursor=result["next_cursor"],
+        total_approximate=result["approximate"],
+    ))
 
 
 @router.get("/projects/{id}", dependencies=[Depends(require_auth)])
@@ -89,7 +102,19 @@ def delete_editor(email: str, service: AdminService = Depends(get_admin_service)
     return success_with_message("Editor Deleted Successfully")
 
 
+@router.get("/storage/metrics", dependencies=[Depends(require_auth)])
+def storage_metrics(service: AdminService = Depends(get_admin_service)):
+    """Upload deduplication: dedup_ratio (logical / stored bytes) and bytes_saved."""
+    return success_with_message("Storage Metrics Loaded Successfully", storage=service.storage_metrics())
+
+
 @router.post("/users/email", dependencies=[Depends(require_auth)])
 def admin_users_email(service: AdminService = Depends(get_admin_service)):
     return success_with_message("Success")
 
+
+@router.post("/lookups/refresh", dependencies=[Depends(require_auth), Depends(strict_rate_limit)])
+async def admin_refresh_lookups():
+    """Drop this worker's cached lookup collections (others expire after LOOKUP_CACHE_TTL)."""
+    get_lookup_cache().invalidate()
+    return success_with_message("Lookups Refreshed Successfully")
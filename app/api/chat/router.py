@@ -1,99 +1,192 @@
-"""Chat endpoints. Laravel-exact: status, message, chat/conversation/messages. Path {id} = uuid."""
-from typing import Optional
+"""
+Chat endpoints. Laravel-exact: status, message, chat/conversation/messages. Path {id} = uuid.
+Real-time: WebSocket /chat/ws (token in query string) with SSE fallback /chat/stream.
+"""
+import asyncio
+from typing import AsyncIterator, List, Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, WebSocket, status
+from fastapi.responses import StreamingResponse
 
 from app.core.dependencies import get_current_user_id, require_auth
 from app.core.laravel_response import success_with_message
-from app.db.session import get_db
-from app.services.chat_service import ChatService
+from app.core.security import user_id_from_token
+from app.services.async_service import call_service, service_dependency
+from app.services.chat_hub import broadcast_message, conversation_channel, get_chat_hub, user_channel
+from app.services.chat_service import MESSAGE_PAGE_MAX, MESSAGE_PAGE_SIZE, ChatService
 
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# SSE comment line sent when idle so proxies keep the stream open.
+STREAM_HEARTBEAT_SECONDS = 15
 
-def get_chat_service(db: Session = Depends(get_db)) -> ChatService:
-    return ChatService(db=db)
+
+get_chat_service = service_dependency(ChatService)
+
+
+async def _subscription_channels(user_id: int, conversation_uuids: List[str]) -> List[str]:
+    """The user's inbox channel plus the requested conversations they take part in."""
+    allowed = await call_service(ChatService, "participant_conversation_uuids", user_id, conversation_uuids)
+    return [user_channel(user_id)] + [conversation_channel(u) for u in allowed]
 
 
 @router.get("", dependencies=[Depends(require_auth)])
 @router.get("/", dependencies=[Depends(require_auth)], include_in_schema=False)
-def list_chats(
-    service: ChatService = Depends(get_chat_service),
+async def list_chats(
+    service=Depends(get_chat_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    conversations = service.list_conversations(current_user_id)
+    conversations = await service.list_conversations(current_user_id)
     return success_with_message("Chat Loaded Successfully", chats=[], conversations=conversations)
 
 
 @router.get("/received_messages", dependencies=[Depends(require_auth)])
-def get_received_messages(
-    service: ChatService = Depends(get_chat_service),
+async def get_received_messages(
+    before: Optional[str] = Query(None, description="Message uuid; return messages older than it"),
+    service=Depends(get_chat_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    messages = service.get_received_messages(current_user_id)
+    messages = await service.get_received_messages(current_user_id, before=before)
     return success_with_message("Messages Loaded Successfully", messages=messages)
 
 
 @router.post("/init/public", dependencies=[Depends(require_auth)])
-def init_public_chat(
-    service: ChatService = Depends(get_chat_service),
+async def init_public_chat(
+    service=Depends(get_chat_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    conv = service.init_conversation(current_user_id, None)
+    conv = await service.init_conversation(current_user_id, None)
     return success_with_message("Chat initialized", conversation=conv)
 
 
 @router.post("/init", dependencies=[Depends(require_auth)])
-def init_chat(
-    service: ChatService = Depends(get_chat_service),
+async def init_chat(
+    service=Depends(get_chat_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    conv = service.init_conversation(current_user_id, None)
+    conv = await service.init_conversation(current_user_id, None)
     return success_with_message("Chat initialized", conversation=conv)
 
 
+@router.get("/stream", dependencies=[Depends(require_auth)])
+async def chat_stream(
+    request: Request,
+    conversation: List[str] = Query([], description="Conversation uuids to follow"),
+    current_user_id: int = Depends(get_current_user_id),
+):
+    """Server-Sent Events fallback for clients without WebSocket support."""
+    channels = await _subscription_channels(current_user_id, conversation)
+
+    async def events() -> AsyncIterator[str]:
+        async with get_chat_hub().subscribe(channels) as queue:
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if payload is None:
+                    return
+                yield f"data: {payload}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def chat_websocket(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    conversation: List[str] = Query([]),
+):
+    """
+    Push ChatMessageEvent / ChatEvent as JSON text frames. Browsers cannot set
+    headers on WebSocket, so the JWT may come as ?token= or a bearer header.
+    """
+    if not token:
+        auth = websocket.headers.get("authorization") or ""
+        if auth.lower().startswith("bearer "):
+            token = auth[7:]
+    user_id = user_id_from_token(token)
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    channels = await _subscription_channels(user_id, conversation)
+    await websocket.accept()
+
+    async with get_chat_hub().subscribe(channels) as queue:
+        async def send() -> None:
+            while True:
+                payload = await queue.get()
+                if payload is None:
+                    # Hub closed: the worker is shutting down.
+                    await websocket.close(code=status.WS_1001_GOING_AWAY)
+                    return
+                await websocket.send_text(payload)
+
+        async def receive() -> None:
+            # Client frames are ignored; reading detects the disconnect.
+            while True:
+                await websocket.receive_text()
+
+        tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
 @router.get("/{id}", dependencies=[Depends(require_auth)])
-def get_chat(
+async def get_chat(
     id: str,
-    service: ChatService = Depends(get_chat_service),
+    before: Optional[str] = Query(None, description="Message uuid; page towards older messages"),
+    after: Optional[str] = Query(None, description="Message uuid; page towards newer messages"),
+    limit: int = Query(MESSAGE_PAGE_SIZE, ge=1, le=MESSAGE_PAGE_MAX),
+    service=Depends(get_chat_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    conv = service.get_conversation(id, current_user_id)
+    conv = await service.get_conversation(id, current_user_id, before=before, after=after, limit=limit)
     if not conv:
         return {"status": "error", "chat": {}, "conversation": []}
     return success_with_message("Chat Loaded Successfully", chat=conv, conversation=conv.get("messages", []))
 
 
 @router.post("/{id}", dependencies=[Depends(require_auth)])
-def post_chat_message(
+async def post_chat_message(
     id: str,
     body: Optional[dict] = None,
-    service: ChatService = Depends(get_chat_service),
+    service=Depends(get_chat_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     msg_body = body.get("body", "") if isinstance(body, dict) else ""
-    msg = service.add_message(id, current_user_id, msg_body)
+    msg = await service.add_message(id, current_user_id, msg_body)
     if not msg:
         return {"status": "error", "message": {}}
+    recipients = [uid for uid in await service.participant_user_ids(id) if uid != current_user_id]
+    await broadcast_message(id, msg, recipients)
     return success_with_message("Message sent", message=msg)
 
 
 @router.post("/admin/custom", dependencies=[Depends(require_auth)])
-def admin_custom_message(service: ChatService = Depends(get_chat_service)):
+async def admin_custom_message(service=Depends(get_chat_service)):
     return success_with_message("Message sent")
 
 
 @router.patch("/message/{id}", dependencies=[Depends(require_auth)])
-def update_message(
+async def update_message(
     id: str,
     body: Optional[dict] = None,
-    service: ChatService = Depends(get_chat_service),
+    service=Depends(get_chat_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     msg_body = body.get("body", "") if isinstance(body, dict) else ""
-    msg = service.update_message(id, current_user_id, msg_body)
+    msg = await service.update_message(id, current_user_id, msg_body)
     if not msg:
         return {"status": "error", "message": {}}
     return success_with_message("Message updated", message=msg)
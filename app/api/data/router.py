@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import require_auth
+from app.core.json_response import json_response
 from app.core.laravel_response import success_with_message
 from app.db.session import get_db
 from app.services.data_service import DataService
@@ -21,7 +22,7 @@ def data_editor(
     service: DataService = Depends(get_data_service),
 ):
     editors = service.editors(body)
-    return success_with_message("Editors Loaded Successfully", editors=editors)
+    return json_response(success_with_message("Editors Loaded Successfully", editors=editors))
 
 
 @router.post("/country", dependencies=[Depends(require_auth)])
@@ -56,8 +57,7 @@ def data_location(
     body: dict = None,
     service: DataService = Depends(get_data_service),
 ):
-    locations = service.locations(body)
-    return success_with_message("Locations Loaded Successfully", locations=locations)
+    return success_with_message("Locations Loaded Successfully", **service.locations(body))
 
 
 @router.post("/editor/invite", dependencies=[Depends(require_auth)])
@@ -1,4 +1,6 @@
 """Editor. Path {id} = uuid. Laravel-exact: status, message, editor/editors/projects/creators/etc."""
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
@@ -19,15 +21,17 @@ def get_editor_service(db: Session = Depends(get_db)) -> EditorService:
 @router.get("/")
 def editor_list(
     page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     service: EditorService = Depends(get_editor_service),
 ):
-    """GET /editor?page=1 — list editors with pagination. Laravel parity."""
-    result = service.list_editors(page=page)
+    """GET /editor?page=1 (or ?cursor=<next_cursor>) — list editors with pagination. Laravel parity."""
+    result = service.list_editors(page=page, cursor=cursor)
     return success_with_message(
         "Editors Loaded Successfully",
         editors=result["editors"],
         total=result["total"],
         page=result["page"],
+        next_cursor=result["next_cursor"],
     )
 
 
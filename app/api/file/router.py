@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user_id, require_auth
 from app.core.laravel_response import success_with_message
+from app.core.uploads import UploadTooLarge, spool, too_large
 from app.db.session import get_db
 from app.services.file_service import FileService
 
@@ -21,8 +22,11 @@ def file_upload(
     service: FileService = Depends(get_file_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    content = file.file.read()
-    result = service.create(current_user_id, file.filename or "upload", content=content)
+    try:
+        upload = spool(file.file, file.filename)
+    except UploadTooLarge:
+        raise too_large()
+    result = service.create(current_user_id, file.filename or "upload", upload=upload)
     if not result:
         return success_with_message("File uploaded", file={}, url=None)
     return success_with_message("File uploaded", file=result, url=result.get("url"))
@@ -1,55 +1,65 @@
 """Matching endpoints. Laravel-exact: status, message, matching/creators. Path {id} = uuid, token as-is."""
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user_id, require_auth
 from app.core.laravel_response import success_with_message
-from app.db.session import get_db
+from app.services.async_service import service_dependency
 from app.services.matching_service import MatchingService
 
 
 router = APIRouter(prefix="/matching", tags=["matching"])
 
 
-def get_matching_service(db: Session = Depends(get_db)) -> MatchingService:
-    return MatchingService(db=db)
+get_matching_service = service_dependency(MatchingService)
+# Ranking builds/refreshes the numpy creator matrix under a thread lock:
+# keep it in the threadpool even with DB_ASYNC (never on the event loop).
+get_matching_ranker = service_dependency(MatchingService, threadpool=True)
 
 
 @router.get("", dependencies=[Depends(require_auth)])
 @router.get("/", dependencies=[Depends(require_auth)], include_in_schema=False)
-def search_matching(
+async def search_matching(
     page: int = Query(1, ge=1),
-    service: MatchingService = Depends(get_matching_service),
+    cursor: Optional[str] = Query(None),
+    service=Depends(get_matching_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    result = service.list_for_user(current_user_id, page=page)
-    return success_with_message("Matching Loaded Successfully", matching=result["matching"], total=result["total"], page=result["page"])
+    result = await service.list_for_user(current_user_id, page=page, cursor=cursor)
+    return success_with_message(
+        "Matching Loaded Successfully",
+        matching=result["matching"],
+        total=result["total"],
+        page=result["page"],
+        next_cursor=result["next_cursor"],
+    )
 
 
 @router.get("/project/{id}", dependencies=[Depends(require_auth)])
-def get_matching_project(id: str, service: MatchingService = Depends(get_matching_service)):
-    data = service.get_for_project(id)
+async def get_matching_project(id: str, service=Depends(get_matching_service)):
+    data = await service.get_for_project(id)
     if not data:
         return {"status": "error", "matching": {}}
     return success_with_message("Matching Loaded Successfully", matching=data)
 
 
 @router.patch("/editor", dependencies=[Depends(require_auth)])
-def update_matching_editor(service: MatchingService = Depends(get_matching_service)):
+async def update_matching_editor(service=Depends(get_matching_service)):
     return success_with_message("Matching updated", matching={})
 
 
 @router.get("/{id}")
-def get_matching(id: str, service: MatchingService = Depends(get_matching_service)):
-    data = service.get_by_uuid(id)
+async def get_matching(id: str, service=Depends(get_matching_service)):
+    data = await service.get_by_uuid(id)
     if not data:
         return {"status": "error", "matching": {}}
     return success_with_message("Matching Loaded Successfully", matching=data)
 
 
 @router.get("/token/{token}")
-def get_matching_by_token(token: str, service: MatchingService = Depends(get_matching_service)):
-    data = service.get_by_token(token)
+async def get_matching_by_token(token: str, service=Depends(get_matching_service)):
+    data = await service.get_by_token(token)
     if not data:
         return {"status": "error", "matching": {}}
     return success_with_message("Matching Loaded Successfully", matching=data)
@@ -57,32 +67,42 @@ def get_matching_by_token(token: str, service: MatchingService = Depends(get_mat
 
 @router.post("", dependencies=[Depends(require_auth)])
 @router.post("/", dependencies=[Depends(require_auth)], include_in_schema=False)
-def create_matching(
-    service: MatchingService = Depends(get_matching_service),
+async def create_matching(
+    service=Depends(get_matching_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    data = service.create(current_user_id, None, None)
+    data = await service.create(current_user_id, None, None)
     if not data:
         return {"status": "error", "message": "No project found", "matching": {}, "token": None}
     return success_with_message("Matching created", matching=data, token=data.get("token"))
 
 
 @router.post("/creators", dependencies=[Depends(require_auth)])
-def matching_creators(service: MatchingService = Depends(get_matching_service)):
-    return success_with_message("Creators Loaded Successfully", creators=[])
+async def matching_creators(
+    body: dict = None,
+    service=Depends(get_matching_ranker),
+    current_user_id: int = Depends(get_current_user_id),
+):
+    """
+    Ranked creators for {"project": uuid} / {"token": matching token}, or for
+    explicit lookup uuid lists (skills, job_types, content_verticals, platforms,
+    softwares, creative_styles) + utc_offset / country. Optional limit (<= 100).
+    """
+    creators = await service.match_creators(current_user_id, body)
+    return success_with_message("Creators Loaded Successfully", creators=creators)
 
 
 @router.patch("/{id}", dependencies=[Depends(require_auth)])
-def update_matching(id: str, service: MatchingService = Depends(get_matching_service)):
-    data = service.update(id, None)
+async def update_matching(id: str, service=Depends(get_matching_service)):
+    data = await service.update(id, None)
     if not data:
         return {"status": "error", "matching": {}}
     return success_with_message("Matching updated", matching=data)
 
 
 @router.patch("/admin/{id}", dependencies=[Depends(require_auth)])
-def admin_update_matching(id: str, service: MatchingService = Depends(get_matching_service)):
-    data = service.update(id, None)
+async def admin_update_matching(id: str, service=Depends(get_matching_service)):
+    data = await service.update(id, None)
     if not data:
         return {"status": "error", "matching": {}}
     return success_with_message("Matching updated", matching=data)
@@ -3,25 +3,31 @@ Profile endpoints. Laravel-exact: status, message, user (or statistics, etc.).
 All responses use uuid (no integer id) in user resource.
 """
 import json
+import logging
 import os
-import uuid as uuid_lib
 from typing import Any, Dict, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 
 from app.core.dependencies import get_current_user_id, require_auth
 from app.core.image_compression import compress_image
+from app.core.image_pipeline import render_variants_async
 from app.core.laravel_response import success_with_message, user_to_laravel_user_resource
-from app.db.session import get_db
-from app.services.profile_service import ProfileService
+from app.core.uploads import SpooledUpload, UploadTooLarge, discard, save_upload, spool_bytes, too_large
+from app.services.async_service import service_dependency
+from app.services.current_user import get_current_user
+from app.services.profile_service import ProfileService, discard_pending_photo, stage_pending_photo
 
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
 
-def get_profile_service(db: Session = Depends(get_db)) -> ProfileService:
-    return ProfileService(db=db)
+get_profile_service = service_dependency(ProfileService)
+
+logger = logging.getLogger(__name__)
+# Queue the raw photo privately and answer at once; a Celery task renders and publishes it.
+PROFILE_PHOTO_ASYNC = os.getenv("PROFILE_PHOTO_ASYNC", "false").lower() == "true"
 
 
 def _flatten_payload(obj: Any) -> Dict[str, Any]:
@@ -65,7 +71,8 @@ def _flatten_payload(obj: Any) -> Dict[str, Any]:
 async def _parse_profile_update_body(request: Request) -> Tuple[Dict[str, Any], Any]:
     """
     Parse request body as JSON, multipart/form-data, or application/x-www-form-urlencoded.
-    Laravel parity: accepts $request->all() style (form or JSON). Never raises.
+    Laravel parity: accepts $request->all() style (form or JSON). Never raises,
+    except the HTTPException (413) for a body over the upload cap.
     Handles "body" form field containing JSON string (common client pattern).
     Returns (payload_dict, photo_file_or_none). Photo is raw UploadFile for multipart.
     """
@@ -130,8 +137,13 @@ async def _parse_profile_update_body(request: Request) -> Tuple[Dict[str, Any],
                     parsed = json.loads(body)
                     if isinstance(parsed, dict):
                         payload = _flatten_payload(parsed)
+            except HTTPException:
+                raise
             except Exception:
                 pass
+    except HTTPException:
+        # UploadSizeLimitMiddleware aborts an oversized chunked body mid-read.
+        raise
     except Exception:
         pass
     return payload, photo_file
@@ -139,12 +151,8 @@ async def _parse_profile_update_body(request: Request) -> Tuple[Dict[str, Any],
 
 @router.get("", dependencies=[Depends(require_auth)])
 @router.get("/", dependencies=[Depends(require_auth)], include_in_schema=False)
-def get_profile(
-    profile_service: ProfileService = Depends(get_profile_service),
-    current_user_id: int = Depends(get_current_user_id),
-):
+async def get_profile(user=Depends(get_current_user)):
     """GET /profile — status, message, user (UserResource)."""
-    user = profile_service.get_user(current_user_id)
     if not user:
         return {"status": "error", "message": "User not found", "user": {}}
     return success_with_message(
@@ -154,12 +162,12 @@ def get_profile(
 
 
 @router.get("/statistics", dependencies=[Depends(require_auth)])
-def get_profile_statistics(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def get_profile_statistics(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     """GET /profile/statistics — status, message, statistics."""
-    statistics = profile_service.get_statistics(current_user_id)
+    statistics = await profile_service.get_statistics(current_user_id)
     return success_with_message(
         "Statistics Loaded Successfully",
         statistics=statistics,
@@ -167,8 +175,8 @@ def get_profile_statistics(
 
 
 @router.get("/social", dependencies=[Depends(require_auth)])
-def get_profile_social(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def get_profile_social(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     """GET /profile/social — status, message, social (or similar)."""
@@ -178,132 +186,172 @@ def get_profile_social(
     )
 
 
-def _save_profile_photo(content: bytes, filename: str, mime_type: Optional[str] = None) -> Optional[str]:
-    """Save photo to uploads dir (compressed). Return URL. Laravel stores URL on user.photo."""
+def _compress_profile_photo(raw: SpooledUpload, filename: str, mime_type: Optional[str] = None) -> Optional[SpooledUpload]:
+    """
+    Compress a spooled photo upload (dropping the raw file) and spool the
+    result for the content-addressed store. Blocking: run in the threadpool.
+    """
     try:
+        with open(raw.path, "rb") as fp:
+            content = fp.read()
         compressed, ext = compress_image(content, filename, mime_type)
         if ext and not ext.startswith("."):
             ext = f".{ext}"
-        safe_name = f"{uuid_lib.uuid4().hex}{ext}"
-        upload_dir = os.environ.get("UPLOAD_DIR", "uploads")
-        os.makedirs(upload_dir, exist_ok=True)
-        file_path = os.path.join(upload_dir, safe_name)
-        with open(file_path, "wb") as fp:
-            fp.write(compressed)
-        return f"/uploads/{safe_name}"
+        return spool_bytes(compressed, f"photo{ext}")
     except Exception:
         return None
+    finally:
+        discard(raw)
+
+
+def _enqueue_photo_processing(user_id: int, sha256: str) -> bool:
+    """Queue jobs.profile_photos.process. Blocking (broker round trip): run in the threadpool."""
+    from jobs.celery_app import process_profile_photo_task
+
+    try:
+        process_profile_photo_task.delay(user_id, sha256)
+        return True
+    except Exception:
+        # Broker unavailable: drop the queued upload; the current photo stays.
+        logger.exception("Could not queue profile photo %s for user %s", sha256, user_id)
+        discard_pending_photo(user_id, sha256)
+        return False
 
 
 @router.post("/update", dependencies=[Depends(require_auth)])
 @router.post("/update/", dependencies=[Depends(require_auth)], include_in_schema=False)  # Trailing slash (Laravel parity)
 async def update_profile(
     request: Request,
-    profile_service: ProfileService = Depends(get_profile_service),
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     """
     POST /profile/update — status, message, user.
     Accepts JSON, multipart/form-data, or application/x-www-form-urlencoded.
-    Photo: compress then save to uploads/, store URL on user.photo.
+    Photo: render thumb/medium/full variants in the image process pool, store
+    the full JPEG URL on user.photo and all variant URLs on user.photo_variants.
+    With PROFILE_PHOTO_ASYNC the raw upload is queued privately, the current
+    photo stays until the jobs.profile_photos.process Celery task has
+    rendered the variants and swapped them in, and the response carries
+    photo_pending: true.
     Handles "body" form field with JSON string (client pattern).
     """
     payload, photo_file = await _parse_profile_update_body(request)
+    photo_variants = None
+    pending_photo = None
 
     if photo_file:
         try:
-            content = await photo_file.read()
-            mime = getattr(photo_file, "content_type", None) or None
-            url = _save_profile_photo(content, photo_file.filename or "photo", mime)
-            if url:
-                payload["photo"] = url
+            raw = await save_upload(photo_file)
+            if PROFILE_PHOTO_ASYNC:
+                pending_photo = await run_in_threadpool(stage_pending_photo, current_user_id, raw)
+            else:
+                rendered = await render_variants_async(raw.path)
+                if rendered:
+                    discard(raw)
+                    stored = await profile_service.store_photo_variants(rendered)
+                    if stored:
+                        payload["photo"], photo_variants = stored
+                else:
+                    # Not something the pipeline could decode: keep the single-image path.
+                    mime = getattr(photo_file, "content_type", None) or None
+                    photo = await run_in_threadpool(_compress_profile_photo, raw, photo_file.filename or "photo", mime)
+                    url = await profile_service.store_photo(photo) if photo else None
+                    if url:
+                        payload["photo"] = url
+        except UploadTooLarge:
+            raise too_large()
         except Exception:
             pass
 
-    user = profile_service.update(current_user_id, payload if payload else None)
+    user = await profile_service.update(current_user_id, payload if payload else None, photo_variants)
     if not user:
         return {"status": "error", "message": "User not found", "user": {}}
+    extra: Dict[str, Any] = {}
+    if pending_photo and await run_in_threadpool(_enqueue_photo_processing, current_user_id, pending_photo):
+        extra["photo_pending"] = True
     return success_with_message(
         "Profile Updated Successfully",
         user=user_to_laravel_user_resource(user),
+        **extra,
     )
 
 
 @router.post("/pricing", dependencies=[Depends(require_auth)])
-def update_profile_pricing(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def update_profile_pricing(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Pricing Updated Successfully", user=None)
 
 
 @router.post("/pricing/no-delete", dependencies=[Depends(require_auth)])
-def update_profile_pricing_no_delete(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def update_profile_pricing_no_delete(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Pricing Updated Successfully", user=None)
 
 
 @router.post("/skills", dependencies=[Depends(require_auth)])
-def update_profile_skills(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def update_profile_skills(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Skills Updated Successfully", user=None)
 
 
 @router.post("/jobtypes", dependencies=[Depends(require_auth)])
-def update_profile_jobtypes(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def update_profile_jobtypes(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Job Types Updated Successfully", user=None)
 
 
 @router.post("/contentverticals", dependencies=[Depends(require_auth)])
-def update_profile_contentverticals(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def update_profile_contentverticals(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Content Verticals Updated Successfully", user=None)
 
 
 @router.post("/contentverticals/new", dependencies=[Depends(require_auth)])
-def add_profile_contentverticals(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def add_profile_contentverticals(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Content Verticals Updated Successfully", user=None)
 
 
 @router.post("/platforms", dependencies=[Depends(require_auth)])
-def update_profile_platforms(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def update_profile_platforms(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Platforms Updated Successfully", user=None)
 
 
 @router.post("/softwares", dependencies=[Depends(require_auth)])
-def update_profile_softwares(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def update_profile_softwares(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Software Updated Successfully", user=None)
 
 
 @router.post("/equipments", dependencies=[Depends(require_auth)])
-def update_profile_equipments(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def update_profile_equipments(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Equipment Updated Successfully", user=None)
 
 
 @router.post("/creativestyles", dependencies=[Depends(require_auth)])
-def update_profile_creativestyles(
-    profile_service: ProfileService = Depends(get_profile_service),
+async def update_profile_creativestyles(
+    profile_service=Depends(get_profile_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Creative Styles Updated Successfully", user=None)
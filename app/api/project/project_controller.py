@@ -37,9 +37,11 @@ class ProjectController:
         status: Optional[str] = None,
         statuses: Optional[list] = None,
         per_page: int = 15,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         result = self.service.search(
-            user_id=user_id, page=page, search=search, status=status, statuses=statuses, per_page=per_page
+            user_id=user_id, page=page, search=search, status=status, statuses=statuses, per_page=per_page,
+            cursor=cursor,
         )
         return {
             "status": "success",
@@ -48,6 +50,7 @@ class ProjectController:
             "total": result["total"],
             "page": result["page"],
             "metrics": result["metrics"],
+            "next_cursor": result["next_cursor"],
         }
 
     def get(self, project_uuid: str) -> Dict[str, Any]:
@@ -71,8 +74,8 @@ class ProjectController:
     def get_hackathon(self, project_uuid: str) -> Dict[str, Any]:
         return self.get(project_uuid)
 
-    def list_public_no_auth(self, page: int = 1) -> Dict[str, Any]:
-        result = self.service.public_search_no_auth(page=page)
+    def list_public_no_auth(self, page: int = 1, search: Optional[str] = None) -> Dict[str, Any]:
+        result = self.service.public_search_no_auth(page=page, search=search)
         return {
             "status": "success",
             "projects": result["projects"],
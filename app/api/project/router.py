@@ -6,97 +6,100 @@ No integer id in responses — uuid only.
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
 
 from app.api.project.project_controller import ProjectController
 from app.api.project.schemas import ProjectCreateBody, ProjectUpdateBody
 from app.core.dependencies import require_auth, get_current_user_id
 from app.core.laravel_response import success_with_message
-from app.db.session import get_db
+from app.services.async_service import service_dependency
+from app.services.project_search import uses_memory_index
 
 
 router = APIRouter(prefix="/project", tags=["project"])
 
 
-def get_controller(db: Session = Depends(get_db)) -> ProjectController:
-    return ProjectController(db=db)
+# The in-memory search index is CPU work: keep it off the event loop under DB_ASYNC.
+get_controller = service_dependency(ProjectController, threadpool=uses_memory_index())
 
 
 # ——— Public / no-auth (no require_auth) ———
 @router.get("/public/metadata/{id}/no-auth")
-def get_public_metadata_no_auth(id: str, controller: ProjectController = Depends(get_controller)):
+async def get_public_metadata_no_auth(id: str, controller=Depends(get_controller)):
     """id = project uuid."""
-    return controller.get_public_metadata(project_uuid=id)
+    return await controller.get_public_metadata(project_uuid=id)
 
 
 @router.get("/public/{id}/no-auth")
-def get_public_project_no_auth(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.get_public(project_uuid=id)
+async def get_public_project_no_auth(id: str, controller=Depends(get_controller)):
+    return await controller.get_public(project_uuid=id)
 
 
 @router.get("/hackathon/{id}/no-auth")
-def get_hackathon_no_auth(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.get_hackathon(project_uuid=id)
+async def get_hackathon_no_auth(id: str, controller=Depends(get_controller)):
+    return await controller.get_hackathon(project_uuid=id)
 
 
 @router.get("/public/no-auth")
 @router.get("/public/no-auth/", include_in_schema=False)
-def get_public_projects_no_auth(
+async def get_public_projects_no_auth(
     page: int = Query(1, ge=1),
-    controller: ProjectController = Depends(get_controller),
+    search: Optional[str] = Query(None),
+    controller=Depends(get_controller),
 ):
-    return controller.list_public_no_auth(page=page)
+    return await controller.list_public_no_auth(page=page, search=search)
 
 
 # ——— Auth required ———
 @router.get("", include_in_schema=True)
 @router.get("/", include_in_schema=False)  # Accept trailing slash to avoid 307 redirect
-def list_projects(
+async def list_projects(
     page: int = Query(1, ge=1),
     search: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     statuses: Optional[str] = Query(None, description="Comma-separated statuses (e.g. open,closed); overrides status"),
     per_page: int = Query(15, ge=1, le=100),
-    controller: ProjectController = Depends(get_controller),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset paging)"),
+    controller=Depends(get_controller),
     current_user_id: int = Depends(get_current_user_id),
 ):
     # Support both status (single) and statuses (comma-separated); statuses takes precedence
     status_list = [s.strip() for s in statuses.split(",") if s.strip()] if statuses else None
-    return controller.index(
+    return await controller.index(
         user_id=current_user_id,
         page=page,
         search=search,
         status=status if not statuses else None,
         statuses=status_list,
         per_page=per_page,
+        cursor=cursor,
     )
 
 
 @router.get("/hackathon/{id}", dependencies=[Depends(require_auth)])
-def get_hackathon(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.get_hackathon(project_uuid=id)
+async def get_hackathon(id: str, controller=Depends(get_controller)):
+    return await controller.get_hackathon(project_uuid=id)
 
 
 @router.get("/match-score", dependencies=[Depends(require_auth)])
-def project_match_score(
+async def project_match_score(
     user_id: int = Query(...),
     project_id: int = Query(...),
-    controller: ProjectController = Depends(get_controller),
+    controller=Depends(get_controller),
 ):
-    return controller.match_score(user_id=user_id, project_id=project_id)
+    return await controller.match_score(user_id=user_id, project_id=project_id)
 
 
 @router.post("/alert", dependencies=[Depends(require_auth)])
-def project_alert(
-    controller: ProjectController = Depends(get_controller),
+async def project_alert(
+    controller=Depends(get_controller),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Project alert sent", result=None)
 
 
 @router.post("/alerts/2-days", dependencies=[Depends(require_auth)])
-def project_alerts_2_days(
-    controller: ProjectController = Depends(get_controller),
+async def project_alerts_2_days(
+    controller=Depends(get_controller),
     current_user_id: int = Depends(get_current_user_id),
 ):
     return success_with_message("Project alerts sent", result=None)
@@ -104,113 +107,113 @@ def project_alerts_2_days(
 
 @router.get("/public", dependencies=[Depends(require_auth)])
 @router.get("/public/", dependencies=[Depends(require_auth)], include_in_schema=False)
-def get_public_projects(
+async def get_public_projects(
     page: int = Query(1, ge=1),
-    controller: ProjectController = Depends(get_controller),
+    controller=Depends(get_controller),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    return controller.list_public(user_id=current_user_id, page=page)
+    return await controller.list_public(user_id=current_user_id, page=page)
 
 
 @router.post("/add", dependencies=[Depends(require_auth)])
-def project_add(
+async def project_add(
     body: Optional[ProjectCreateBody] = None,
-    controller: ProjectController = Depends(get_controller),
+    controller=Depends(get_controller),
     current_user_id: int = Depends(get_current_user_id),
 ):
     payload = body.model_dump() if body else None
-    return controller.store(user_id=current_user_id, payload=payload)
+    return await controller.store(user_id=current_user_id, payload=payload)
 
 
 @router.post("/public/add", dependencies=[Depends(require_auth)])
-def project_public_add(
+async def project_public_add(
     body: Optional[ProjectCreateBody] = None,
-    controller: ProjectController = Depends(get_controller),
+    controller=Depends(get_controller),
     current_user_id: int = Depends(get_current_user_id),
 ):
     payload = body.model_dump() if body else None
-    return controller.store_public(user_id=current_user_id, payload=payload)
+    return await controller.store_public(user_id=current_user_id, payload=payload)
 
 
 @router.patch("/{id}", dependencies=[Depends(require_auth)])
-def update_project(
+async def update_project(
     id: str,
     body: Optional[ProjectUpdateBody] = None,
-    controller: ProjectController = Depends(get_controller),
+    controller=Depends(get_controller),
 ):
     payload = body.model_dump(exclude_unset=True) if body else None
-    return controller.update(project_uuid=id, payload=payload)
+    return await controller.update(project_uuid=id, payload=payload)
 
 
 @router.patch("/public/{id}", dependencies=[Depends(require_auth)])
-def update_public_project(
+async def update_public_project(
     id: str,
     body: Optional[ProjectUpdateBody] = None,
-    controller: ProjectController = Depends(get_controller),
+    controller=Depends(get_controller),
 ):
     payload = body.model_dump(exclude_unset=True) if body else None
-    return controller.update_public(project_uuid=id, payload=payload)
+    return await controller.update_public(project_uuid=id, payload=payload)
 
 
 @router.get("/{id}", dependencies=[Depends(require_auth)])
-def get_project(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.get(project_uuid=id)
+async def get_project(id: str, controller=Depends(get_controller)):
+    return await controller.get(project_uuid=id)
 
 
 @router.get("/public/{id}", dependencies=[Depends(require_auth)])
-def get_public_project(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.get_public(project_uuid=id)
+async def get_public_project(id: str, controller=Depends(get_controller)):
+    return await controller.get_public(project_uuid=id)
 
 
 @router.post("/hackathon/public/{id}", dependencies=[Depends(require_auth)])
-def update_hackathon_public(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.update_hackathon_public(project_uuid=id, payload=None)
+async def update_hackathon_public(id: str, controller=Depends(get_controller)):
+    return await controller.update_hackathon_public(project_uuid=id, payload=None)
 
 
 @router.post("/{id}/cancel", dependencies=[Depends(require_auth)])
-def project_cancel(
+async def project_cancel(
     id: str,
-    controller: ProjectController = Depends(get_controller),
+    controller=Depends(get_controller),
 ):
-    return controller.cancel(project_uuid=id, payload=None)
+    return await controller.cancel(project_uuid=id, payload=None)
 
 
 @router.post("/{id}/response", dependencies=[Depends(require_auth)])
-def project_response(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.response(project_uuid=id, payload=None)
+async def project_response(id: str, controller=Depends(get_controller)):
+    return await controller.response(project_uuid=id, payload=None)
 
 
 @router.post("/{id}/status", dependencies=[Depends(require_auth)])
-def project_status(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.status(project_uuid=id, payload=None)
+async def project_status(id: str, controller=Depends(get_controller)):
+    return await controller.status(project_uuid=id, payload=None)
 
 
 @router.post("/{id}/milestone", dependencies=[Depends(require_auth)])
-def project_milestone(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.milestone(project_uuid=id, payload=None)
+async def project_milestone(id: str, controller=Depends(get_controller)):
+    return await controller.milestone(project_uuid=id, payload=None)
 
 
 @router.post("/{id}/deposit", dependencies=[Depends(require_auth)])
-def project_deposit(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.deposit(project_uuid=id, payload=None)
+async def project_deposit(id: str, controller=Depends(get_controller)):
+    return await controller.deposit(project_uuid=id, payload=None)
 
 
 @router.post("/{id}/purchase", dependencies=[Depends(require_auth)])
-def project_purchase(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.purchase(project_uuid=id, payload=None)
+async def project_purchase(id: str, controller=Depends(get_controller)):
+    return await controller.purchase(project_uuid=id, payload=None)
 
 
 @router.post("/{id}/review", dependencies=[Depends(require_auth)])
-def project_review(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.review(project_uuid=id, payload=None)
+async def project_review(id: str, controller=Depends(get_controller)):
+    return await controller.review(project_uuid=id, payload=None)
 
 
 @router.post("/{id}/feedback", dependencies=[Depends(require_auth)])
-def project_feedback(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.feedback(project_uuid=id, payload=None)
+async def project_feedback(id: str, controller=Depends(get_controller)):
+    return await controller.feedback(project_uuid=id, payload=None)
 
 
 @router.get("/{id}/conversation", dependencies=[Depends(require_auth)])
-def project_conversation(id: str, controller: ProjectController = Depends(get_controller)):
-    return controller.conversation(project_uuid=id)
+async def project_conversation(id: str, controller=Depends(get_controller)):
+    return await controller.conversation(project_uuid=id)
 
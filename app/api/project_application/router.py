@@ -27,6 +27,7 @@ def get_service(db: Session = Depends(get_db)) -> ProjectApplicationService:
 @router.get("/", dependencies=[Depends(require_auth)], include_in_schema=False)
 def list_project_applications(
     page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     service: ProjectApplicationService = Depends(get_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
@@ -43,13 +44,14 @@ def list_project_applications(
       "total": <int>
     }
     """
-    result = service.list_for_user(current_user_id, page=page)
+    result = service.list_for_user(current_user_id, page=page, cursor=cursor)
     return success_with_message(
         "Project applications loaded successfully",
         project_applications=result["applications"],
         project=None,
         page=result["page"],
         total=result["total"],
+        next_cursor=result["next_cursor"],
     )
 
 
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from app.api.public.schemas import FreeJobPostBody, PdfSendBody
 from app.core.dependencies import unlimited_rate
 from app.core.laravel_response import success_with_message
+from app.core.uploads import UPLOAD_MAX_BYTES, UploadTooLarge, spool, too_large
 from app.db.session import get_db
 from app.db.models.user import User
 from app.db.models.beacons_lp_user import BeaconsLpUser
@@ -51,9 +52,12 @@ def upload_file(
     file: UploadFile = File(...),
     db: Session = Depends(get_db_session),
 ):
-    content = file.file.read()
+    try:
+        upload = spool(file.file, file.filename)
+    except UploadTooLarge:
+        raise too_large()
     service = FileService(db)
-    result = service.create(0, file.filename or "upload", content=content)
+    result = service.create(0, file.filename or "upload", upload=upload)
     if not result:
         return success_with_message("File uploaded", file={}, url=None)
     return success_with_message("File uploaded", file=result, url=result.get("url"))
@@ -64,11 +68,17 @@ def upload_multiple_files(
     files: list[UploadFile] = File(...),
     db: Session = Depends(get_db_session),
 ):
+    # Starlette records each part's size while parsing: reject before storing any.
+    if any((f.size or 0) > UPLOAD_MAX_BYTES for f in files):
+        raise too_large()
     service = FileService(db)
     out = []
     for f in files:
-        content = f.file.read()
-        r = service.create(0, f.filename or "upload", content=content)
+        try:
+            upload = spool(f.file, f.filename)
+        except UploadTooLarge:
+            raise too_large()
+        r = service.create(0, f.filename or "upload", upload=upload)
         if r:
             out.append(r)
     return success_with_message("Files uploaded", files=out)
@@ -186,10 +196,11 @@ def pdfsend(
 @router.get("/public-job-listing")
 def public_job_listing(
     page: int = Query(1, ge=1),
+    search: Optional[str] = Query(None),
     db: Session = Depends(get_db_session),
 ):
     service = ProjectService(db)
-    result = service.public_search_no_auth(page=page)
+    result = service.public_search_no_auth(page=page, search=search)
     return success_with_message("Job listings loaded", jobs=result["projects"], total=result["total"], page=result["page"])
 
 
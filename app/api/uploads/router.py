@@ -0,0 +1,37 @@
+"""
+/uploads/* behind nginx (UPLOAD_ACCEL_REDIRECT).
+
+The app only decides whether a path may be served and answers with an empty
+response carrying X-Accel-Redirect; nginx then sends the file from its
+internal location (see deploy/nginx-py-api.joinroster.co.conf), including
+range requests and cache headers. Without UPLOAD_ACCEL_REDIRECT main.py mounts
+StaticFiles instead (local development).
+"""
+import os
+from urllib.parse import quote
+
+from fastapi import APIRouter, HTTPException, Response, status
+
+# Internal nginx location mapped to UPLOAD_DIR, e.g. "/_uploads/"; empty = off.
+UPLOAD_ACCEL_REDIRECT = os.getenv("UPLOAD_ACCEL_REDIRECT", "")
+
+router = APIRouter(prefix="/uploads", tags=["uploads"], include_in_schema=False)
+
+
+def _servable(name: str) -> bool:
+    """
+    Uploads are public, as under StaticFiles; what is refused is anything
+    outside UPLOAD_DIR and hidden entries such as in-progress temp files.
+    """
+    if not name or "\\" in name or "\x00" in name:
+        return False
+    return all(part and not part.startswith(".") for part in name.split("/"))
+
+
+@router.api_route("/{name:path}", methods=["GET", "HEAD"])
+def serve_upload(name: str) -> Response:
+    """GET /uploads/{name} — empty response; nginx streams the file."""
+    if not _servable(name):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    # No Content-Type: nginx sets it from the file extension.
+    return Response(headers={"X-Accel-Redirect": UPLOAD_ACCEL_REDIRECT.rstrip("/") + "/" + quote(name)})
@@ -68,8 +68,8 @@ def update_user_jobtypes(
     service: UserService = Depends(get_user_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    user = service.get_by_uuid(id)
-    if not user or user.id != current_user_id:
+    user = service.get_owned(id, current_user_id)
+    if not user:
         return {"status": "error", "message": "User not found", "user": {}}
     return success_with_message("Job Types Updated Successfully", user=user_to_laravel_user_resource(user))
 
@@ -81,8 +81,8 @@ def update_user_content_vertical(
     service: UserService = Depends(get_user_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    user = service.get_by_uuid(id)
-    if not user or user.id != current_user_id:
+    user = service.get_owned(id, current_user_id)
+    if not user:
         return {"status": "error", "message": "User not found", "user": {}}
     return success_with_message("Content Verticals Updated Successfully", user=user_to_laravel_user_resource(user))
 
@@ -94,8 +94,8 @@ def update_user_platforms(
     service: UserService = Depends(get_user_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    user = service.get_by_uuid(id)
-    if not user or user.id != current_user_id:
+    user = service.get_owned(id, current_user_id)
+    if not user:
         return {"status": "error", "message": "User not found", "user": {}}
     return success_with_message("Platforms Updated Successfully", user=user_to_laravel_user_resource(user))
 
@@ -106,8 +106,8 @@ def revert_user_update_time(
     service: UserService = Depends(get_user_service),
     current_user_id: int = Depends(get_current_user_id),
 ):
-    user = service.get_by_uuid(id)
-    if not user or user.id != current_user_id:
+    user = service.get_owned(id, current_user_id)
+    if not user:
         return {"status": "error", "message": "User not found", "user": {}}
     return success_with_message("User Updated Successfully", user=user_to_laravel_user_resource(user))
 
@@ -1,12 +1,15 @@
 """UserCreator. Path {id} = uuid. Laravel-exact: status, message, creators/creator/projects/topics."""
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 
-from app.core.dependencies import require_auth
+from app.core.dependencies import get_current_user_id, require_auth
+from app.core.json_response import json_response
 from app.core.laravel_response import success_with_message, user_to_laravel_user_resource
 from app.db.session import get_db
 from app.db.models.user import User
+from app.services.creator_search import CreatorQuery, parse_creator_query
 from app.services.editor_service import EditorService
+from app.services.geo_index import parse_geo_query
 
 
 router = APIRouter(prefix="/usercreator", tags=["usercreator"])
@@ -22,12 +25,11 @@ def list_usercreators(
     page: int = Query(1, ge=1),
     service: EditorService = Depends(get_editor_service),
 ):
-    db = service.db
-    q = db.query(User).filter(User.active.is_(True))
-    total = q.count()
-    items = q.offset((page - 1) * 15).limit(15).all()
-    creators = [user_to_laravel_user_resource(u) for u in items]
-    return success_with_message("Creators Loaded Successfully", creators=creators, total=total, page=page)
+    """Active creators, newest first (served from the creator search index)."""
+    result = service.search_creators(CreatorQuery(), page=page)
+    return json_response(
+        success_with_message("Creators Loaded Successfully", creators=result["creators"], total=result["total"], page=page)
+    )
 
 
 @router.get("/unverified", dependencies=[Depends(require_auth)])
@@ -42,14 +44,46 @@ def usercreator_content_topics():
 
 @router.get("/search", dependencies=[Depends(require_auth)])
 def usercreator_search(
+    request: Request,
+    page: int = Query(1, ge=1),
     service: EditorService = Depends(get_editor_service),
 ):
-    return success_with_message("Creators Loaded Successfully", creators=[])
+    """
+    Proximity search: lat & lng (or location=<location uuid>), radius (km,
+    default 50) or nearest (k). Creators nearest first with distance (km).
+    Otherwise creator search: q, skills, platforms (uuids), country,
+    open_for_work; relevance + recency ranked, with facet counts.
+    """
+    geo = parse_geo_query(request.query_params)
+    if geo is None:
+        return _creator_search(request, page, service)
+    result = service.search_nearby(geo, page=page)
+    return json_response(success_with_message(
+        "Creators Loaded Successfully",
+        creators=result["creators"],
+        total=result["total"],
+        page=result["page"],
+    ))
+
+
+def _creator_search(request: Request, page: int, service: EditorService):
+    result = service.search_creators(parse_creator_query(request.query_params), page=page)
+    return json_response(success_with_message(
+        "Creators Loaded Successfully",
+        creators=result["creators"],
+        total=result["total"],
+        page=result["page"],
+        facets=result["facets"],
+    ))
 
 
 @router.get("/similar", dependencies=[Depends(require_auth)])
-def usercreator_similar(service: EditorService = Depends(get_editor_service)):
-    return success_with_message("Creators Loaded Successfully", creators=[])
+def usercreator_similar(
+    current_user_id: int = Depends(get_current_user_id),
+    service: EditorService = Depends(get_editor_service),
+):
+    """Creators most similar to the current user (precomputed nightly)."""
+    return success_with_message("Creators Loaded Successfully", creators=service.get_similar(current_user_id))
 
 
 @router.post("", dependencies=[Depends(require_auth)])
@@ -100,8 +134,13 @@ def usercreator_public_info():
 
 
 @router.get("/search/public")
-def usercreator_search_public(service: EditorService = Depends(get_editor_service)):
-    return success_with_message("Creators Loaded Successfully", creators=[])
+def usercreator_search_public(
+    request: Request,
+    page: int = Query(1, ge=1),
+    service: EditorService = Depends(get_editor_service),
+):
+    """Creator search without auth (same parameters as /search, no proximity)."""
+    return _creator_search(request, page, service)
 
 
 @router.get("/public/{username}")
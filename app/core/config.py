@@ -46,6 +46,9 @@ class Settings(BaseSettings):
     DB_DATABASE: str = os.getenv("DB_DATABASE", "")
     DB_USERNAME: str = os.getenv("DB_USERNAME", "")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
+    # Serve hot routers through SQLAlchemy AsyncSession (aiomysql / asyncpg)
+    # instead of the threadpool-bound PyMySQL session.
+    DB_ASYNC: bool = os.getenv("DB_ASYNC", "false").lower() == "true"
 
     # JWT configuration (mapping from Laravel Sanctum / app key)
     JWT_SECRET: str = os.getenv("JWT_SECRET") or os.getenv("APP_KEY", "change-me")
@@ -1,35 +1,48 @@
+import math
 from time import time
-from typing import Dict
-
-import jwt
 from fastapi import Depends, HTTPException, Request, status
 
-from app.core.config import get_settings
-from app.core.security import get_current_user_token
-
-# Very simple in-memory rate limiting buckets keyed by client identifier.
-# For production you should back this with Redis to match Laravel's
-# ApiRateLimit and OtpRateLimit middleware behavior.
-_rate_buckets: Dict[str, Dict[str, float]] = {}
+from app.core.rate_limit import get_rate_limit_backend
+from app.core.security import AuthPrincipal, get_current_principal, get_current_user_token
 
 
-def _rate_limit(request: Request, key_prefix: str, max_attempts: int, decay_seconds: int) -> None:
-    client_id = request.client.host or "unknown"
-    key = f"{key_prefix}:{client_id}"
-    now = time()
-    bucket = _rate_buckets.get(key)
+# request.state attribute holding the X-RateLimit-* headers for the response;
+# RateLimitHeadersMiddleware adds them to whatever response the route returns.
+RATE_LIMIT_HEADERS_STATE = "rate_limit_headers"
 
-    if bucket is None or now - bucket["start"] > decay_seconds:
-        _rate_buckets[key] = {"start": now, "count": 1}
-        return
 
-    if bucket["count"] >= max_attempts:
+async def _rate_limit(
+    request: Request,
+    key_prefix: str,
+    max_attempts: int,
+    decay_seconds: int,
+) -> None:
+    """
+    Throttle by client IP through the shared rate limit backend (Redis, with
+    an in-memory fallback). Laravel ThrottleRequests headers:
+    X-RateLimit-Limit / X-RateLimit-Remaining go on request.state for
+    RateLimitHeadersMiddleware; a 429 carries them plus Retry-After and
+    X-RateLimit-Reset.
+    """
+    client_id = (request.client.host if request.client else None) or "unknown"
+    key = f"{key_prefix}:{client_id}"
+    result = await get_rate_limit_backend().hit(key, max_attempts, decay_seconds)
+    headers = {
+        "X-RateLimit-Limit": str(result.limit),
+        "X-RateLimit-Remaining": str(result.remaining),
+    }
+
+    if not result.allowed:
+        retry_after = max(1, math.ceil(result.retry_after))
+        headers["Retry-After"] = str(retry_after)
+        headers["X-RateLimit-Reset"] = str(int(time()) + retry_after)
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail={"status": "error", "message": "Too Many Attempts."},
+            headers=headers,
         )
 
-    bucket["count"] += 1
+    setattr(request.state, RATE_LIMIT_HEADERS_STATE, headers)
 
 
 async def ensure_stateful_request(request: Request) -> None:
@@ -46,18 +59,24 @@ async def ensure_stateful_request(request: Request) -> None:
     return None
 
 
-async def strict_rate_limit(request: Request, _: None = Depends(ensure_stateful_request)) -> None:
+async def strict_rate_limit(
+    request: Request,
+    _: None = Depends(ensure_stateful_request),
+) -> None:
     """
     Match Laravel `api.strict` group: ApiRateLimit 10 requests per minute.
     """
-    _rate_limit(request, key_prefix="strict", max_attempts=10, decay_seconds=60)
+    await _rate_limit(request, key_prefix="strict", max_attempts=10, decay_seconds=60)
 
 
-async def lenient_rate_limit(request: Request, _: None = Depends(ensure_stateful_request)) -> None:
+async def lenient_rate_limit(
+    request: Request,
+    _: None = Depends(ensure_stateful_request),
+) -> None:
     """
     Match Laravel `api.lenient` group: ApiRateLimit 120 requests per minute.
     """
-    _rate_limit(request, key_prefix="lenient", max_attempts=120, decay_seconds=60)
+    await _rate_limit(request, key_prefix="lenient", max_attempts=120, decay_seconds=60)
 
 
 async def unlimited_rate(request: Request, _: None = Depends(ensure_stateful_request)) -> None:  # noqa: ARG001
@@ -67,12 +86,15 @@ async def unlimited_rate(request: Request, _: None = Depends(ensure_stateful_req
     return None
 
 
-async def otp_rate_limit(request: Request, _: None = Depends(ensure_stateful_request)) -> None:
+async def otp_rate_limit(
+    request: Request,
+    _: None = Depends(ensure_stateful_request),
+) -> None:
     """
     Rough analogue of Laravel's OtpRateLimit. We approximate the most
     restrictive bucket and can refine per-path later if needed.
     """
-    _rate_limit(request, key_prefix="otp", max_attempts=5, decay_seconds=15 * 60)
+    await _rate_limit(request, key_prefix="otp", max_attempts=5, decay_seconds=15 * 60)
 
 
 async def require_auth(token: str = Depends(get_current_user_token)) -> str:
@@ -83,31 +105,16 @@ async def require_auth(token: str = Depends(get_current_user_token)) -> str:
     return token
 
 
-async def get_current_user_id(token: str = Depends(get_current_user_token)) -> int:
+async def get_current_user_id(principal: AuthPrincipal = Depends(get_current_principal)) -> int:
     """
-    Decode the validated JWT token and return the numeric user ID from `sub`.
-    This is used by controllers that need the authenticated user ID, while
-    still preserving `require_auth` as a pure-guard dependency.
+    Return the numeric user ID from the request's principal (`sub` claim).
+    The token is decoded once per request by get_current_principal, so
+    combining this with `require_auth` costs no extra signature check.
     """
-    settings = get_settings()
-    try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
-    except jwt.InvalidTokenError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={"status": "error", "message": "Invalid token."},
-        )
-
-    sub = payload.get("sub")
-    try:
-        return int(sub)
-    except (TypeError, ValueError):
+    if principal.user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail={"status": "error", "message": "Invalid token subject."},
         )
+    return principal.user_id
 
@@ -0,0 +1,151 @@
+"""
+Responsive image variants, rendered in a bounded process pool.
+
+render_variants() turns one uploaded image into thumb / medium / full
+variants, each as JPEG and WebP, spooled under UPLOAD_DIR for the
+content-addressed store. Decoding is the expensive part of a large phone
+photo, so JPEGs are decoded with draft() (DCT scaling at 1/2, 1/4 or 1/8
+straight to roughly the largest variant), then each variant is cut from the
+next larger one with reduce() (integer box downscale) and a final LANCZOS
+resize.
+
+render_variants_async() runs it in a ProcessPoolExecutor of IMAGE_WORKERS
+processes (default 2) so CPU work stays off the request path and out of the
+GIL; at most IMAGE_QUEUE_LIMIT renders (default 4 per worker) are in flight
+per app process, later callers wait. Celery workers call render_variants()
+directly.
+"""
+import asyncio
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import List, NamedTuple, Optional
+
+from app.core.uploads import SpooledUpload, discard, spool_bytes
+
+try:
+    from PIL import Image, ImageOps
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+logger = logging.getLogger(__name__)
+
+# Longest side (px) per variant, largest first. "full" matches the 800px
+# profile photo compress_image produced.
+VARIANTS = (("full", 800), ("medium", 400), ("thumb", 128))
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+IMAGE_QUEUE_LIMIT = int(os.getenv("IMAGE_QUEUE_LIMIT", str(IMAGE_WORKERS * 4)))
+
+
+class RenderedImage(NamedTuple):
+    variant: str
+    format: str
+    width: int
+    height: int
+    upload: SpooledUpload
+
+
+def _fit(size, side: int):
+    w, h = size
+    scale = min(1.0, side / max(w, h))
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def _downscale(img, target):
+    factor = int(min(img.width / target[0], img.height / target[1]) // 2)
+    if factor >= 2:
+        # Cheap integer box reduction first; LANCZOS only covers the last <=2x.
+        img = img.reduce(factor)
+    if img.size != target:
+        img = img.resize(target, Image.Resampling.LANCZOS)
+    return img
+
+
+def _encode(img, fmt: str) -> bytes:
+    buf = io.BytesIO()
+    if fmt == "jpeg":
+        img.save(buf, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        img.save(buf, format="WEBP", quality=WEBP_QUALITY, method=4)
+    return buf.getvalue()
+
+
+def render_variants(path: str) -> List[RenderedImage]:
+    """
+    Every variant of the image at `path` as spooled JPEG and WebP uploads.
+    Raises if the file is not a readable image.
+    """
+    if not HAS_PIL:
+        raise RuntimeError("Pillow is not installed")
+    rendered: List[RenderedImage] = []
+    try:
+        with Image.open(path) as src:
+            largest = VARIANTS[0][1]
+            if src.format == "JPEG":
+                src.draft("RGB", (largest, largest))
+            img = ImageOps.exif_transpose(src)
+            img = img.convert("RGB")
+        for variant, side in VARIANTS:
+            img = _downscale(img, _fit(img.size, side))
+            for fmt in ("jpeg", "webp"):
+                upload = spool_bytes(_encode(img, fmt), f"{variant}.{'jpg' if fmt == 'jpeg' else fmt}")
+                rendered.append(RenderedImage(variant, fmt, img.width, img.height, upload))
+    except BaseException:
+        for r in rendered:
+            discard(r.upload)
+        raise
+    return rendered
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: never fork a process that is running threads.
+            _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS, mp_context=get_context("spawn"))
+        return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+async def render_variants_async(path: str) -> Optional[List[RenderedImage]]:
+    """render_variants in the process pool; None if the image could not be processed."""
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(IMAGE_QUEUE_LIMIT)
+    async with _slots:
+        pool = get_image_pool()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, render_variants, path)
+        except BrokenProcessPool:
+            logger.exception("Image worker died; restarting the pool")
+            _reset_pool(pool)
+        except Exception as exc:
+            logger.warning("Could not render image variants for %s: %s", path, exc)
+        return None
+
+
+def shutdown_image_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
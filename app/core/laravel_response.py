@@ -5,59 +5,120 @@ Laravel's api() helper is response()->json($data, $code) — no wrapper.
 All keys, casing, and structure must match Laravel 1:1.
 """
 
-from typing import Any, Dict, Optional
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional
 
 
-def to_absolute_url(path: Any) -> str:
-    """Return absolute URL for relative paths so frontend (different domain) can load images."""
-    if not path or not isinstance(path, str) or not path.strip():
+def _absolute(path: Any, base: str) -> str:
+    if not path or not isinstance(path, str):
+        return ""
+    s = path.strip()
+    if not s:
         return ""
-    s = str(path).strip()
     if s.startswith("http://") or s.startswith("https://"):
         return s
-    from app.core.config import get_settings
-    base = get_settings().APP_URL
     return f"{base}{s}" if s.startswith("/") else f"{base}/{s}"
 
 
+def _absolute_variants(variants: Any, base: str) -> Optional[Dict[str, Any]]:
+    """photo_variants with absolute jpeg / webp URLs; None when the photo has none."""
+    if not variants or not isinstance(variants, dict):
+        return None
+    return {
+        name: {k: _absolute(u, base) if k in ("jpeg", "webp") else u for k, u in variant.items()}
+        for name, variant in variants.items()
+    }
+
+
+def to_absolute_url(path: Any) -> str:
+    """Return absolute URL for relative paths so frontend (different domain) can load images."""
+    from app.core.config import get_settings
+    return _absolute(path, get_settings().APP_URL)
+
+
+# Attributes UserResource reads. Per model class, the ones it defines are
+# read in one pass (see _user_reader); the rest are None.
+_USER_RESOURCE_ATTRS = (
+    "uuid", "photo", "photo_variants", "name", "first_name", "last_name", "dob", "gender", "email",
+    "email_verified_at", "phone", "phone_verified_at", "address", "city", "country",
+    "company", "job_title", "username", "fun_fact", "created_at", "updated_at",
+    "activated_at", "verified_at", "open_for_work", "active", "completion",
+    "account_type", "reference", "utc_offset", "timezone", "referral_code", "resume",
+    "resume_updated_at", "worked_with_creators", "new_onboarding", "via_affiliate",
+    "email_unsubscriptions", "import_via_linkedin", "import_via_resume",
+    "policy_accepted", "policy_accepted_at",
+)
+_user_readers: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def _user_reader(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """attr -> value reader for instances of cls, built once per class."""
+    reader = _user_readers.get(cls)
+    if reader is not None:
+        return reader
+    if hasattr(cls, "__mapper__"):
+        # ORM models: class attributes are the whole story. Loaded column
+        # values live in the instance __dict__, which can be read as is;
+        # expired or unloaded instances go through the instrumented getters.
+        present = tuple(a for a in _USER_RESOURCE_ATTRS if hasattr(cls, a))
+        required = frozenset(present)
+        get = attrgetter(*present)
+
+        def reader(user: Any) -> Dict[str, Any]:
+            loaded = user.__dict__
+            if loaded.keys() >= required:
+                return loaded
+            return dict(zip(present, get(user)))
+    else:
+        # Plain objects / namespaces may carry instance-only attributes.
+        def reader(user: Any) -> Dict[str, Any]:
+            return {a: getattr(user, a, None) for a in _USER_RESOURCE_ATTRS if hasattr(user, a)}
+    _user_readers[cls] = reader
+    return reader
+
+
 def user_to_laravel_user_resource(user: Any) -> Dict[str, Any]:
     """
     Build a dict matching Laravel's UserResource::toArray() keys exactly.
     Uses None for missing fields so JSON outputs null. Key order matches Laravel.
     """
+    from app.core.config import get_settings
+    base = get_settings().APP_URL
+    v = _user_reader(type(user))(user).get
     return {
-        "uuid": getattr(user, "uuid", None),
-        "photo": to_absolute_url(getattr(user, "photo", None) or ""),
-        "name": getattr(user, "name", None),
-        "first_name": getattr(user, "first_name", None),
-        "last_name": getattr(user, "last_name", None),
-        "dob": getattr(user, "dob", None),
-        "gender": getattr(user, "gender", None),
-        "email": getattr(user, "email", None),
-        "email_verified_at": getattr(user, "email_verified_at", None),
-        "phone": getattr(user, "phone", None),
-        "phone_verified_at": getattr(user, "phone_verified_at", None),
-        "address": getattr(user, "address", None),
-        "city": getattr(user, "city", None),
-        "country": getattr(user, "country", None),
-        "company": getattr(user, "company", None),
-        "job_title": getattr(user, "job_title", None),
-        "username": getattr(user, "username", None),
-        "fun_fact": getattr(user, "fun_fact", None),
-        "created_at": getattr(user, "created_at", None),
-        "updated_at": getattr(user, "updated_at", None),
-        "activated_at": getattr(user, "activated_at", None),
-        "is_activated": getattr(user, "activated_at", None) is not None,
-        "verified_at": getattr(user, "verified_at", None),
-        "is_verified": getattr(user, "verified_at", None) is not None,
-        "open_for_work": getattr(user, "open_for_work", None),
-        "active": getattr(user, "active", True),
-        "completion": getattr(user, "completion", None),
-        "account_type": getattr(user, "account_type", None),
-        "reference": getattr(user, "reference", None),
-        "utc_offset": getattr(user, "utc_offset", None),
-        "timezone": getattr(user, "timezone", None),
-        "referral_code": getattr(user, "referral_code", None),
+        "uuid": v("uuid"),
+        "photo": _absolute(v("photo"), base),
+        "photo_variants": _absolute_variants(v("photo_variants"), base),
+        "name": v("name"),
+        "first_name": v("first_name"),
+        "last_name": v("last_name"),
+        "dob": v("dob"),
+        "gender": v("gender"),
+        "email": v("email"),
+        "email_verified_at": v("email_verified_at"),
+        "phone": v("phone"),
+        "phone_verified_at": v("phone_verified_at"),
+        "address": v("address"),
+        "city": v("city"),
+        "country": v("country"),
+        "company": v("company"),
+        "job_title": v("job_title"),
+        "username": v("username"),
+        "fun_fact": v("fun_fact"),
+        "created_at": v("created_at"),
+        "updated_at": v("updated_at"),
+        "activated_at": v("activated_at"),
+        "is_activated": v("activated_at") is not None,
+        "verified_at": v("verified_at"),
+        "is_verified": v("verified_at") is not None,
+        "open_for_work": v("open_for_work"),
+        "active": v("active", True),
+        "completion": v("completion"),
+        "account_type": v("account_type"),
+        "reference": v("reference"),
+        "utc_offset": v("utc_offset"),
+        "timezone": v("timezone"),
+        "referral_code": v("referral_code"),
         "pricing": None,
         "skills": [],
         "job_types": [],
@@ -75,18 +136,18 @@ def user_to_laravel_user_resource(user: Any) -> Dict[str, Any]:
         "has_creators_with_projects": None,
         "has_creative_styles": False,
         "has_creator_with_details": False,
-        "resume": to_absolute_url(getattr(user, "resume", None) or "") or None,
-        "resume_updated_at": getattr(user, "resume_updated_at", None),
-        "worked_with_creators": getattr(user, "worked_with_creators", None),
-        "new_onboarding": getattr(user, "new_onboarding", None),
+        "resume": _absolute(v("resume"), base) or None,
+        "resume_updated_at": v("resume_updated_at"),
+        "worked_with_creators": v("worked_with_creators"),
+        "new_onboarding": v("new_onboarding"),
         "count_non_youtube_projects": 0,
-        "via_affiliate": getattr(user, "via_affiliate", None),
-        "email_unsubscriptions": getattr(user, "email_unsubscriptions", None),
-        "import_via_linkedin": getattr(user, "import_via_linkedin", None),
-        "import_via_resume": getattr(user, "import_via_resume", None),
+        "via_affiliate": v("via_affiliate"),
+        "email_unsubscriptions": v("email_unsubscriptions"),
+        "import_via_linkedin": v("import_via_linkedin"),
+        "import_via_resume": v("import_via_resume"),
         "languages": [],
-        "policy_accepted": getattr(user, "policy_accepted", None),
-        "policy_accepted_at": getattr(user, "policy_accepted_at", None),
+        "policy_accepted": v("policy_accepted"),
+        "policy_accepted_at": v("policy_accepted_at"),
         "referral_count": 0,
     }
 
@@ -128,7 +189,7 @@ def validation_error_body(message: str, errors: Dict[str, list]) -> Dict[str, An
     return {"status": "error", "message": message, "fields": errors}
 
 
-def success_with_message(message: str, **extra: Any) -> Dict[str, Any]:
+def success_with_message(message: str, /, **extra: Any) -> Dict[str, Any]:
     """Laravel pattern: status, message, then any extra keys (e.g. user, project, matching)."""
     out: Dict[str, Any] = {"status": "success", "message": message}
     out.update(extra)
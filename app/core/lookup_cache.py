@@ -0,0 +1,115 @@
+"""
+In-process cache for near-static lookup collections (skills, platforms, ...).
+
+Each entry keeps the Laravel-shaped payload plus its serialized JSON bytes and
+a strong ETag (content hash, so every worker computes the same tag). A warm
+hit never touches the database or re-serializes; a miss is single-flighted
+per key. Entries expire after LOOKUP_CACHE_TTL seconds (default 300) or on
+invalidate().
+"""
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+from fastapi import Request, Response
+
+from app.core.json_response import dump_json
+
+LOOKUP_CACHE_TTL = float(os.getenv("LOOKUP_CACHE_TTL", "300"))
+LOOKUP_CACHE_MAX_ENTRIES = 256
+# Browsers/CDNs may reuse a response for a minute, then revalidate with If-None-Match.
+LOOKUP_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
+
+class LookupEntry(NamedTuple):
+    payload: Dict[str, Any]
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def render_json(payload: Any) -> bytes:
+    """Serialize like the app's default response class (compact UTF-8 JSON)."""
+    return dump_json(payload)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored, '*' matches anything."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def cached_json_response(request: Request, entry: LookupEntry) -> Response:
+    """200 with the precomputed body, or 304 when the client already has it."""
+    headers = {"ETag": entry.etag, "Cache-Control": LOOKUP_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+class LookupCache:
+    def __init__(self, ttl: float = LOOKUP_CACHE_TTL, max_entries: int = LOOKUP_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, LookupEntry]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def peek(self, key: str) -> Optional[LookupEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, payload: Dict[str, Any]) -> LookupEntry:
+        body = render_json(payload)
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        entry = LookupEntry(payload, body, etag, time.monotonic() + self.ttl)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    async def get(self, key: str, build: Callable[[], Awaitable[Dict[str, Any]]]) -> LookupEntry:
+        """Return the cached entry for key, building it with build() on a miss."""
+        entry = self.peek(key)
+        if entry is not None:
+            return entry
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self.peek(key)
+            if entry is None:
+                entry = self.put(key, await build())
+        self._locks.pop(key, None)
+        return entry
+
+    def invalidate(self, *names: str) -> None:
+        """Drop the given collections (and their keyed variants, e.g. 'reasons:<tag>'); all if none given."""
+        if not names:
+            self._entries.clear()
+            return
+        for key in list(self._entries):
+            if any(key == name or key.startswith(name + ":") for name in names):
+                self._entries.pop(key, None)
+
+
+@lru_cache()
+def get_lookup_cache() -> LookupCache:
+    return LookupCache()
@@ -0,0 +1,245 @@
+"""
+Newest-first pagination over (created_at, id) with opaque keyset cursors.
+
+List endpoints keep Laravel's `page` / `total` and add `next_cursor`. A client
+that sends `cursor=<next_cursor>` gets the rows after that one by keyset
+instead of OFFSET: `ORDER BY created_at DESC, id DESC` with
+`(created_at, id) < (:c, :i)` (MySQL: `created_at <= :c AND (created_at < :c
+OR id < :i)`), which walks the `<table>_created_at_id_index` that
+scripts/create_pagination_indexes.py creates, so deep pages cost the same as
+the first. Rows with NULL created_at sort last on every backend (PostgreSQL
+needs NULLS LAST; MySQL and SQLite do it natively) and are reached by a
+second `created_at IS NULL` range once the dated rows run out.
+
+paginate_counted() also returns the total without a separate COUNT(*):
+`COUNT(*) OVER()` rides along with the page rows (MySQL 8+/MariaDB 10.2+,
+PostgreSQL, SQLite 3.25+; older servers fall back to count()). Callers can
+opt in to a per-process cache of exact totals keyed by the filter
+(TOTAL_CACHE_TTL seconds, default 30), or to an approximate total from the
+planner's row estimate (EXPLAIN; exact count on other databases).
+"""
+import base64
+import binascii
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import func, or_, tuple_
+from sqlalchemy.orm import Query
+
+TOTAL_CACHE_TTL = float(os.getenv("TOTAL_CACHE_TTL", "30"))
+TOTAL_CACHE_SIZE = 1024
+
+Cursor = Tuple[Optional[datetime], int]
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    raw = f"{created_at.isoformat() if created_at else ''}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """(created_at, id) from a cursor; None if missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created, row_id = raw.rsplit("|", 1)
+        return (datetime.fromisoformat(created) if created else None), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def pagination_index_name(table: str) -> str:
+    """Name of the (created_at, id) index newest-first pages of `table` walk."""
+    return f"{table}_created_at_id_index"
+
+
+def _dialect_name(query: Query) -> str:
+    return query.session.get_bind().dialect.name
+
+
+def newest_first_order(model: Any, dialect_name: str = "") -> Tuple[Any, ...]:
+    created_at = model.created_at.desc()
+    if dialect_name == "postgresql":
+        # PostgreSQL puts NULLs first in DESC order; MySQL and SQLite already put them last.
+        created_at = created_at.nulls_last()
+    return created_at, model.id.desc()
+
+
+def newest_first(query: Query, model: Any) -> Query:
+    return query.order_by(*newest_first_order(model, _dialect_name(query)))
+
+
+def after_cursor(query: Query, model: Any, cursor: Cursor) -> Query:
+    """
+    Dated rows after `cursor` in newest_first order, or the NULL created_at
+    rows after it when the cursor itself is undated. Both are single index
+    ranges; paginate() moves on to the NULL rows when the dated ones end.
+    """
+    created_at, row_id = cursor
+    if created_at is None:
+        return query.filter(model.created_at.is_(None), model.id < row_id)
+    if _dialect_name(query) == "mysql":
+        # MySQL does not range-scan row-value comparisons; bound on created_at instead.
+        return query.filter(
+            model.created_at <= created_at,
+            or_(model.created_at < created_at, model.id < row_id),
+        )
+    return query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+
+
+def paginate(
+    query: Query, model: Any, page: int = 1, per_page: int = 15, cursor: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    One newest-first page of `query` (entities of `model`) and the cursor of
+    its last row, or None when nothing follows. With a valid `cursor` the
+    page starts after it (keyset); otherwise at OFFSET (page - 1) * per_page.
+    """
+    position = decode_cursor(cursor)
+    if position is None:
+        rows = newest_first(query, model).offset((page - 1) * per_page).limit(per_page + 1).all()
+    else:
+        rows = newest_first(after_cursor(query, model, position), model).limit(per_page + 1).all()
+        if len(rows) <= per_page and position[0] is not None:
+            # Dated rows ran out inside this page; continue with the undated ones.
+            undated = newest_first(query.filter(model.created_at.is_(None)), model)
+            rows += undated.limit(per_page + 1 - len(rows)).all()
+    if len(rows) <= per_page:
+        return rows, None
+    rows = rows[:per_page]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    total: int
+    next_cursor: Optional[str]
+    approximate: bool = False
+
+
+_totals: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+_totals_lock = threading.Lock()
+
+
+def _count_key(query: Query) -> str:
+    compiled = query.order_by(None).statement.compile()
+    return f"{compiled}|{sorted((k, repr(v)) for k, v in compiled.params.items())}"
+
+
+def _cached_total(key: str) -> Optional[int]:
+    with _totals_lock:
+        hit = _totals.get(key)
+        if hit is None or hit[1] <= time.monotonic():
+            return None
+        _totals.move_to_end(key)
+        return hit[0]
+
+
+def _store_total(key: str, total: int) -> None:
+    with _totals_lock:
+        _totals[key] = (total, time.monotonic() + TOTAL_CACHE_TTL)
+        _totals.move_to_end(key)
+        while len(_totals) > TOTAL_CACHE_SIZE:
+            _totals.popitem(last=False)
+
+
+def clear_total_cache() -> None:
+    with _totals_lock:
+        _totals.clear()
+
+
+def supports_window_count(query: Query) -> bool:
+    """Whether the database can evaluate COUNT(*) OVER()."""
+    dialect = query.session.get_bind().dialect
+    if dialect.name == "mysql":
+        version = dialect.server_version_info
+        if not version:
+            return False
+        return version >= ((10, 2) if getattr(dialect, "is_mariadb", False) else (8, 0))
+    if dialect.name == "sqlite":
+        return sqlite3.sqlite_version_info >= (3, 25)
+    return True
+
+
+def estimate_count(query: Query) -> Optional[int]:
+    """Planner's row estimate for `query` (PostgreSQL / MySQL EXPLAIN); None elsewhere."""
+    conn = query.session.connection()
+    dialect = conn.dialect
+    if dialect.name not in ("postgresql", "mysql"):
+        return None
+    compiled = query.order_by(None).limit(None).offset(None).statement.compile(dialect=dialect)
+    if dialect.name == "postgresql":
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return int(plan[0]["Plan"]["Plan Rows"])
+    row = conn.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).mappings().first()
+    if row is None or row.get("rows") is None:
+        return None
+    return int(row["rows"] * float(row.get("filtered") or 100) / 100)
+
+
+def page_with_total(query: Query, order_by: Sequence[Any], page: int = 1, per_page: int = 15) -> Tuple[List[Any], int]:
+    """
+    One OFFSET page of `query` in `order_by` order and the total row count,
+    read together via COUNT(*) OVER() when the database supports it.
+    """
+    if supports_window_count(query):
+        rows = (
+            query.add_columns(func.count().over().label("total_count"))
+            .order_by(*order_by)
+            .offset((page - 1) * per_page)
+            .limit(per_page)
+            .all()
+        )
+        if rows:
+            return [r[0] for r in rows], rows[0][1]
+        if page == 1:
+            return [], 0
+        # Past the last page: no row carries the count.
+    items = query.order_by(*order_by).offset((page - 1) * per_page).limit(per_page).all()
+    return items, query.order_by(None).count()
+
+
+def paginate_counted(
+    query: Query,
+    model: Any,
+    page: int = 1,
+    per_page: int = 15,
+    cursor: Optional[str] = None,
+    cache_total: bool = False,
+    approximate: bool = False,
+) -> Page:
+    """
+    paginate() plus the total matching `query` (ignoring the cursor), in one
+    round trip where possible. `cache_total` reuses an exact total computed
+    in the last TOTAL_CACHE_TTL seconds for the same filter; `approximate`
+    takes the planner's estimate instead of counting.
+    """
+    if approximate:
+        estimate = estimate_count(query)
+        if estimate is not None:
+            items, next_cursor = paginate(query, model, page=page, per_page=per_page, cursor=cursor)
+            return Page(items, estimate, next_cursor, approximate=True)
+
+    key = _count_key(query) if cache_total else None
+    total = _cached_total(key) if key else None
+    if total is None and decode_cursor(cursor) is None:
+        items, total = page_with_total(query, newest_first_order(model, _dialect_name(query)), page=page, per_page=per_page)
+        if key:
+            _store_total(key, total)
+        more = bool(items) and page * per_page < total
+        return Page(items, total, encode_cursor(items[-1].created_at, items[-1].id) if more else None)
+    if total is None:
+        total = query.order_by(None).count()
+        if key:
+            _store_total(key, total)
+    items, next_cursor = paginate(query, model, page=page, per_page=per_page, cursor=cursor)
+    return Page(items, total, next_cursor)
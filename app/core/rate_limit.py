@@ -0,0 +1,130 @@
+"""
+Rate limiting backends for the Laravel `api.*` / `otp` throttles.
+
+Both backends implement GCRA (generic cell rate algorithm): `limit` requests
+may burst, then one more every `window / limit` seconds. State per key is a
+single timestamp (the theoretical arrival time), so memory is O(keys).
+
+- RedisRateLimitBackend: one atomic Lua round trip per check, shared by all
+  workers. Falls back to the in-memory backend for a short cool-down when
+  Redis is unreachable.
+- MemoryRateLimitBackend: per-process, LRU-bounded; least recently used
+  keys are dropped once their bucket has fully replenished.
+
+Select with RATE_LIMIT_BACKEND=redis|memory (default redis).
+"""
+import logging
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple
+
+from app.core.redis import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "roster:ratelimit:"
+# Seconds to stay on the in-memory fallback after a Redis failure.
+REDIS_RETRY_AFTER_FAILURE = 30.0
+MEMORY_MAX_KEYS = 10_000
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # seconds until the bucket is fully replenished
+    retry_after: float  # seconds until the next request is allowed (0 if allowed)
+
+
+def _gcra(tat: float, now: float, limit: int, window: float):
+    """Return (allowed, new_tat, remaining, reset_after, retry_after) for one hit."""
+    interval = window / limit
+    tat = max(tat, now)
+    new_tat = tat + interval
+    allow_at = new_tat - window
+    if allow_at > now:
+        return False, tat, 0, tat - now, allow_at - now
+    remaining = int(math.floor((window - (new_tat - now)) / interval + 1e-9))
+    return True, new_tat, remaining, new_tat - now, 0.0
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        """Count one request against `key`: at most `limit` per `window` seconds."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_keys: int = MEMORY_MAX_KEYS):
+        self.max_keys = max_keys
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        now = time.monotonic()
+        allowed, tat, remaining, reset_after, retry_after = _gcra(self._tats.get(key, now), now, limit, window)
+        self._tats[key] = tat
+        self._tats.move_to_end(key)
+        # Oldest first: drop keys whose bucket has fully replenished (TAT in
+        # the past, same as never seen), then any over the size bound.
+        while self._tats:
+            oldest, oldest_tat = next(iter(self._tats.items()))
+            if oldest_tat > now and len(self._tats) <= self.max_keys:
+                break
+            del self._tats[oldest]
+        return RateLimitResult(allowed, limit, remaining, reset_after, retry_after)
+
+
+# KEYS[1] = bucket key; ARGV = limit, window (seconds). Uses the Redis clock so
+# workers with skewed clocks agree. Returns {allowed, remaining, reset_after, retry_after}.
+_GCRA_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local interval = window / limit
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if allow_at > now then
+  return {0, 0, tostring(tat - now), tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+local remaining = math.floor((window - (new_tat - now)) / interval + 1e-9)
+return {1, remaining, tostring(new_tat - now), '0'}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    def __init__(self, fallback: RateLimitBackend, prefix: str = REDIS_KEY_PREFIX):
+        self.fallback = fallback
+        self.prefix = prefix
+        self._script = None
+        self._down_until = 0.0
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        if time.monotonic() < self._down_until:
+            return await self.fallback.hit(key, limit, window)
+        try:
+            if self._script is None:
+                self._script = get_async_redis().register_script(_GCRA_LUA)
+            allowed, remaining, reset_after, retry_after = await self._script(
+                keys=[self.prefix + key], args=[limit, window]
+            )
+            return RateLimitResult(bool(int(allowed)), limit, int(remaining), float(reset_after), float(retry_after))
+        except Exception:
+            logger.exception("Redis rate limiter unavailable; using in-memory fallback")
+            self._down_until = time.monotonic() + REDIS_RETRY_AFTER_FAILURE
+            return await self.fallback.hit(key, limit, window)
+
+
+@lru_cache()
+def get_rate_limit_backend() -> RateLimitBackend:
+    memory = MemoryRateLimitBackend()
+    if os.getenv("RATE_LIMIT_BACKEND", "redis").lower() == "memory":
+        return memory
+    return RedisRateLimitBackend(fallback=memory)
@@ -0,0 +1,29 @@
+"""
+Shared Redis connection settings and clients.
+
+Uses REDIS_URL when set, otherwise builds the URL from Laravel's
+REDIS_HOST / REDIS_PORT / REDIS_PASSWORD / REDIS_DB keys.
+"""
+import os
+from functools import lru_cache
+from urllib.parse import quote_plus
+
+import redis.asyncio as aioredis
+
+
+def redis_url() -> str:
+    url = os.getenv("REDIS_URL")
+    if url:
+        return url
+    host = os.getenv("REDIS_HOST", "127.0.0.1")
+    port = os.getenv("REDIS_PORT", "6379")
+    db = os.getenv("REDIS_DB", "0")
+    password = os.getenv("REDIS_PASSWORD")
+    auth = f":{quote_plus(password)}@" if password and password != "null" else ""
+    return f"redis://{auth}{host}:{port}/{db}"
+
+
+@lru_cache()
+def get_async_redis() -> aioredis.Redis:
+    """Process-wide asyncio Redis client (connections are opened lazily)."""
+    return aioredis.Redis.from_url(redis_url(), decode_responses=True)
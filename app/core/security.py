@@ -1,8 +1,12 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.core.config import get_settings
@@ -28,15 +32,72 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
     return encoded_jwt
 
 
-async def get_current_user_token(
+class AuthPrincipal(NamedTuple):
+    """Authenticated caller for one request: raw token, verified claims, user ID from `sub`."""
+
+    token: str
+    claims: Dict[str, Any]
+    user_id: Optional[int]
+
+
+# Recently verified tokens keyed by SHA-256 of the token, so repeat calls from
+# the same client skip the HMAC check. Entries are only served until their `exp`.
+VERIFIED_TOKEN_CACHE_SIZE = 4096
+_verified_tokens: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a JWT and return its claims, consulting the verified-token LRU first.
+    Raises jwt.InvalidTokenError (incl. ExpiredSignatureError) like jwt.decode.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    now = time.time()
+    with _verified_tokens_lock:
+        hit = _verified_tokens.get(key)
+        if hit is not None:
+            if hit[1] > now:
+                _verified_tokens.move_to_end(key)
+                return hit[0]
+            del _verified_tokens[key]
+
+    settings = get_settings()
+    claims = jwt.decode(
+        token,
+        settings.JWT_SECRET,
+        algorithms=[settings.JWT_ALGORITHM],
+    )
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        with _verified_tokens_lock:
+            _verified_tokens[key] = (claims, float(exp))
+            _verified_tokens.move_to_end(key)
+            while len(_verified_tokens) > VERIFIED_TOKEN_CACHE_SIZE:
+                _verified_tokens.popitem(last=False)
+    return claims
+
+
+def _user_id_from_claims(claims: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int(claims.get("sub"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def get_current_principal(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme),
-) -> str:
+) -> AuthPrincipal:
     """
     Minimal JWT bearer token validation used to emulate Laravel Sanctum's
-    `auth:sanctum` middleware. Routes that require authentication should
-    depend on this (usually via higher-level dependencies).
+    `auth:sanctum` middleware. The token is decoded once per request and the
+    principal is kept on `request.state.principal`; `require_auth`,
+    `get_current_user_token` and `get_current_user_id` all build on it.
     """
-    settings = get_settings()
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
 
     if credentials is None or not credentials.scheme.lower() == "bearer":
         raise HTTPException(
@@ -46,11 +107,7 @@ async def get_current_user_token(
 
     token = credentials.credentials
     try:
-        jwt.decode(
-            token,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
+        claims = decode_access_token(token)
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,5 +119,24 @@ async def get_current_user_token(
             detail={"status": "error", "message": "Invalid token."},
         )
 
-    return token
+    principal = AuthPrincipal(token=token, claims=claims, user_id=_user_id_from_claims(claims))
+    request.state.principal = principal
+    return principal
+
 
+async def get_current_user_token(principal: AuthPrincipal = Depends(get_current_principal)) -> str:
+    """Validated JWT bearer token (see get_current_principal)."""
+    return principal.token
+
+
+def user_id_from_token(token: Optional[str]) -> Optional[int]:
+    """
+    Validate a raw JWT (e.g. from a WebSocket query string, where no bearer
+    header is available) and return the user ID from `sub`, or None.
+    """
+    if not token:
+        return None
+    try:
+        return _user_id_from_claims(decode_access_token(token))
+    except jwt.InvalidTokenError:
+        return None
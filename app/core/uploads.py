@@ -0,0 +1,171 @@
+"""
+Streaming upload spooling under UPLOAD_DIR.
+
+An upload is copied in UPLOAD_CHUNK_SIZE chunks to a temp file inside the
+upload directory while its SHA-256 is computed, so memory stays O(chunk)
+whatever the upload size, and the caller can then rename it into place
+(os.replace, atomic on one filesystem): readers never see a partial file.
+app/services/blob_store.py files spooled uploads by content hash. Uploads
+over UPLOAD_MAX_BYTES (default 256 MiB) are rejected with 413 and leave
+nothing behind. Copies run in the threadpool, never on the event loop; sync
+route handlers already run there and may call spool() directly.
+
+Starlette parses (and spools) a whole multipart body before any dependency
+or handler runs, so the request-level cap is UploadSizeLimitMiddleware: a
+request body over UPLOAD_REQUEST_MAX_BYTES (default UPLOAD_MAX_BYTES plus
+multipart overhead) is refused by Content-Length before it is read, or, for
+chunked bodies, as soon as the bytes received pass the cap.
+"""
+import hashlib
+import io
+import os
+import tempfile
+from typing import BinaryIO, NamedTuple, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(256 * 1024 * 1024)))
+# Multipart framing and form fields on top of the file bytes.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+UPLOAD_REQUEST_MAX_BYTES = int(
+    os.getenv("UPLOAD_REQUEST_MAX_BYTES", str(UPLOAD_MAX_BYTES + MULTIPART_OVERHEAD_BYTES))
+)
+TEMP_PREFIX = ".upload-"
+TEMP_SUFFIX = ".part"
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class SpooledUpload(NamedTuple):
+    """A complete upload in a temp file under UPLOAD_DIR, not yet filed."""
+    path: str
+    filename: Optional[str]
+    size: int
+    sha256: str
+
+
+def upload_dir() -> str:
+    directory = os.environ.get("UPLOAD_DIR", "uploads")
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def upload_url(name: str) -> str:
+    return f"/uploads/{name}"
+
+
+def extension(filename: Optional[str], default: str = ".bin") -> str:
+    return os.path.splitext(filename or "")[1].lower() or default
+
+
+def too_large(max_bytes: int = UPLOAD_MAX_BYTES) -> HTTPException:
+    """Laravel's `max:` validation message, as a 413."""
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail={"status": "error", "message": f"The file may not be greater than {max_bytes // 1024} kilobytes."},
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Refuse request bodies over max_bytes with too_large(): up front when
+    Content-Length says so, otherwise from receive() once the http.request
+    bytes pass it, which aborts form parsing mid-body.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int = UPLOAD_REQUEST_MAX_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > self.max_bytes:
+            await self._refuse(scope, receive, send)
+            return
+
+        received = 0
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise too_large()
+            return message
+
+        async def tracked_send(message: Message) -> None:
+            nonlocal started
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except HTTPException as exc:
+            # Raised outside a route's exception handling (e.g. while another middleware read the body).
+            if started or exc.status_code != status.HTTP_413_REQUEST_ENTITY_TOO_LARGE:
+                raise
+            await self._refuse(scope, receive, send)
+
+    async def _refuse(self, scope: Scope, receive: Receive, send: Send) -> None:
+        exc = too_large()
+        response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers={"Connection": "close"})
+        await response(scope, receive, send)
+
+
+def spool(src: BinaryIO, filename: Optional[str], max_bytes: int = UPLOAD_MAX_BYTES) -> SpooledUpload:
+    """
+    Copy src to a temp file in UPLOAD_DIR, hashing as it goes. Raises
+    UploadTooLarge past max_bytes; the temp file is removed on any failure.
+    """
+    fd, tmp = tempfile.mkstemp(dir=upload_dir(), prefix=TEMP_PREFIX, suffix=TEMP_SUFFIX)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = src.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(filename)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        _unlink(tmp)
+        raise
+    return SpooledUpload(tmp, filename, size, digest.hexdigest())
+
+
+def spool_bytes(content: bytes, filename: Optional[str]) -> SpooledUpload:
+    """spool() for content already in memory (e.g. a compressed image)."""
+    return spool(io.BytesIO(content), filename, max_bytes=len(content))
+
+
+async def save_upload(file: UploadFile, max_bytes: int = UPLOAD_MAX_BYTES) -> SpooledUpload:
+    """spool() an UploadFile from an async handler, in the threadpool."""
+    return await run_in_threadpool(spool, file.file, file.filename, max_bytes)
+
+
+def discard(upload: Optional[SpooledUpload]) -> None:
+    """Remove an upload's temp file if it was not filed."""
+    if upload is not None:
+        _unlink(upload.path)
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -4,6 +4,7 @@ SQLAlchemy ORM models mapped from the Laravel Eloquent models.
 
 from app.db.models.user import User  # noqa: F401
 from app.db.models.project import Project  # noqa: F401
+from app.db.models.project_status_count import ProjectStatusCount  # noqa: F401
 from app.db.models.project_application import ProjectApplication  # noqa: F401
 from app.db.models.skill import Skill  # noqa: F401
 from app.db.models.content_vertical import ContentVertical  # noqa: F401
@@ -19,11 +20,11 @@ from app.db.models.referral import Referral  # noqa: F401
 from app.db.models.referral_record import ReferralRecord  # noqa: F401
 from app.db.models.location import Location  # noqa: F401
 from app.db.models.matching import Matching  # noqa: F401
-from app.db.models.conversation import Conversation, Message  # noqa: F401
+from app.db.models.conversation import Conversation, ConversationParticipant, Message  # noqa: F401
 from app.db.models.user_todo import UserTodo  # noqa: F401
 from app.db.models.shortlist import Shortlist  # noqa: F401
 from app.db.models.favourite import Favourite  # noqa: F401
-from app.db.models.file import File  # noqa: F401
+from app.db.models.file import File, FileBlob  # noqa: F401
 from app.db.models.profile_visit import ProfileVisit  # noqa: F401
 from app.db.models.social_profile import SocialProfile  # noqa: F401
 from app.db.models.payment import Payment  # noqa: F401
@@ -31,4 +32,4 @@ from app.db.models.user_verification import UserVerification  # noqa: F401
 from app.db.models.customer import Customer  # noqa: F401
 from app.db.models.project_screening_question import ProjectScreeningQuestion  # noqa: F401
 from app.db.models.questionnaire import Questionnaire, QuestionnaireResponse  # noqa: F401
-
+from app.db.models import pivots  # noqa: F401
@@ -1,5 +1,5 @@
 """Chat conversation and message."""
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from app.db.base import Base
 
 
@@ -14,6 +14,10 @@ class Conversation(Base):
 
 class Message(Base):
     __tablename__ = "messages"
+    # Backs keyset paging of a conversation on (created_at, id).
+    __table_args__ = (
+        Index("messages_conversation_id_created_at_id_index", "conversation_id", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     uuid = Column(String(36), unique=True, index=True, nullable=True)
     conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False)
@@ -21,3 +25,23 @@ class Message(Base):
     body = Column(Text, nullable=True)
     created_at = Column(DateTime, nullable=True)
     updated_at = Column(DateTime, nullable=True)
+
+
+class ConversationParticipant(Base):
+    """
+    Who takes part in a conversation, with their read cursor.
+    Drives the inbox (conversations per user) and unread counts
+    (messages from others with id > last_read_message_id).
+    """
+    __tablename__ = "conversation_participants"
+    __table_args__ = (
+        UniqueConstraint("conversation_id", "user_id", name="conversation_participants_conversation_id_user_id_unique"),
+        Index("conversation_participants_user_id_index", "user_id"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    last_read_message_id = Column(Integer, nullable=True)
+    last_read_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
@@ -1,5 +1,5 @@
-"""Uploaded file record."""
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+"""Uploaded file record, and the content-addressed blob it points at."""
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String
 from app.db.base import Base
 
 
@@ -11,5 +11,19 @@ class File(Base):
     path = Column(String(512), nullable=True)
     filename = Column(String(255), nullable=True)
     url = Column(String(512), nullable=True)
+    # Content hash of the stored bytes (FileBlob key); NULL for pre-dedup uploads.
+    sha256 = Column(String(64), index=True, nullable=True)
+    size = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+
+
+class FileBlob(Base):
+    """One stored copy of some bytes; ref_count counts File rows / photos using it."""
+    __tablename__ = "file_blobs"
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String(512), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, nullable=True)
     updated_at = Column(DateTime, nullable=True)
@@ -1,5 +1,7 @@
 """Matching: project–editor match. Laravel matchings or similar."""
 from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+
 from app.db.base import Base
 
 
@@ -13,3 +15,6 @@ class Matching(Base):
     status = Column(String(50), nullable=True)
     created_at = Column(DateTime, nullable=True)
     updated_at = Column(DateTime, nullable=True)
+
+    project = relationship("Project", foreign_keys=[project_id])
+    editor = relationship("User", foreign_keys=[editor_id])
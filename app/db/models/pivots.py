@@ -0,0 +1,33 @@
+"""
+Laravel belongsToMany pivot tables for user/project lookups (skills, job types,
+content verticals, platforms, software, creative styles). Column names follow
+Laravel's convention: <owner>_id + <singular lookup>_id.
+"""
+from sqlalchemy import Column, ForeignKey, Integer, Table
+
+from app.db.base import Base
+
+
+def _pivot(name: str, owner: str, lookup_fk: str, lookup_table: str) -> Table:
+    return Table(
+        name,
+        Base.metadata,
+        Column("id", Integer, primary_key=True),
+        Column(f"{owner}_id", Integer, ForeignKey(f"{owner}s.id"), nullable=False, index=True),
+        Column(lookup_fk, Integer, ForeignKey(f"{lookup_table}.id"), nullable=False, index=True),
+    )
+
+
+user_skills = _pivot("user_skills", "user", "skill_id", "skills")
+user_job_types = _pivot("user_job_types", "user", "job_type_id", "job_types")
+user_content_verticals = _pivot("user_content_verticals", "user", "content_vertical_id", "content_verticals")
+user_platforms = _pivot("user_platforms", "user", "platform_id", "platforms")
+user_software = _pivot("user_software", "user", "software_id", "softwares")
+user_creative_styles = _pivot("user_creative_styles", "user", "creative_style_id", "creative_styles")
+
+project_skills = _pivot("project_skills", "project", "skill_id", "skills")
+project_job_types = _pivot("project_job_types", "project", "job_type_id", "job_types")
+project_content_verticals = _pivot("project_content_verticals", "project", "content_vertical_id", "content_verticals")
+project_platforms = _pivot("project_platforms", "project", "platform_id", "platforms")
+project_software = _pivot("project_software", "project", "software_id", "softwares")
+project_creative_styles = _pivot("project_creative_styles", "project", "creative_style_id", "creative_styles")
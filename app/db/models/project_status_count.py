@@ -0,0 +1,12 @@
+"""Per-user project counts by status (owner or editor); see app/services/project_status_counts.py."""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from app.db.base import Base
+
+
+class ProjectStatusCount(Base):
+    __tablename__ = "project_status_counts"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    # "" stands for a NULL project status.
+    status = Column(String(50), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import JSON, Boolean, Column, DateTime, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -18,6 +18,8 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     uuid = Column(String(36), unique=True, index=True, nullable=True)
     photo = Column(String(500), nullable=True)
+    # {"thumb"|"medium"|"full": {"width", "height", "jpeg", "webp"}}, see app/core/image_pipeline.py
+    photo_variants = Column(JSON, nullable=True)
     first_name = Column(String(255), nullable=True)
     last_name = Column(String(255), nullable=True)
     name = Column(String(255), nullable=True)
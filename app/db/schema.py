@@ -0,0 +1,49 @@
+"""
+Schema this code maps that Laravel's migrations do not create.
+
+Each entry is added by a script in scripts/, which must run before a release
+that maps it is deployed: a mapped column the table lacks fails every query
+on that model (every users query, for users.photo_variants). check_schema()
+runs at startup and refuses to start while anything is missing, so a rolling
+deploy keeps the previous release serving instead.
+"""
+import logging
+from typing import List, Sequence, Tuple
+
+import sqlalchemy.exc
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# (table, columns the models map on it (none: the table itself), script that adds them)
+REQUIRED_SCHEMA: Sequence[Tuple[str, Tuple[str, ...], str]] = (
+    ("users", ("photo_variants",), "scripts/add_user_photo_variants.py"),
+    ("files", ("sha256", "size"), "scripts/create_file_blobs.py"),
+    ("file_blobs", (), "scripts/create_file_blobs.py"),
+)
+
+
+def missing_schema(bind: Engine) -> List[str]:
+    """Each required table or table.column the database lacks, with the script that adds it."""
+    inspector = inspect(bind)
+    missing: List[str] = []
+    for table, columns, script in REQUIRED_SCHEMA:
+        if not inspector.has_table(table):
+            missing.append(f"{table} ({script})")
+            continue
+        present = {c["name"] for c in inspector.get_columns(table)}
+        missing.extend(f"{table}.{c} ({script})" for c in columns if c not in present)
+    return missing
+
+
+def check_schema(bind: Engine) -> None:
+    """Raise RuntimeError naming the scripts to run if the schema is behind; warn if it cannot be read."""
+    try:
+        missing = missing_schema(bind)
+    except (sqlalchemy.exc.OperationalError, sqlalchemy.exc.InterfaceError) as exc:
+        # Database unreachable: requests will get the 503 handler; nothing to verify yet.
+        logger.warning("Could not check the database schema: %s", exc)
+        return
+    if missing:
+        raise RuntimeError("Database schema is missing " + ", ".join(missing) + "; run those scripts first")
@@ -1,3 +1,4 @@
+from typing import TYPE_CHECKING, AsyncIterator
 from urllib.parse import quote_plus
 
 from sqlalchemy import create_engine
@@ -5,26 +6,32 @@ from sqlalchemy.orm import sessionmaker, Session
 
 from app.core.config import get_settings
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
-def _build_database_url() -> str:
+
+def _build_database_url(async_driver: bool = False) -> str:
     """
     Build a SQLAlchemy connection URL from Laravel-style DB_* settings.
     Defaults to MySQL-compatible URL since the original app is Laravel.
     Username and password are URL-encoded so special chars (@, :, etc.) work.
+    With async_driver=True the asyncio drivers (aiomysql / asyncpg) are used.
     """
     settings = get_settings()
     user = quote_plus(settings.DB_USERNAME)
     password = quote_plus(settings.DB_PASSWORD)
 
     if settings.DB_CONNECTION == "mysql":
+        driver = "mysql+aiomysql" if async_driver else "mysql+pymysql"
         return (
-            f"mysql+pymysql://{user}:{password}"
+            f"{driver}://{user}:{password}"
             f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_DATABASE}"
         )
 
     if settings.DB_CONNECTION == "pgsql":
+        driver = "postgresql+asyncpg" if async_driver else "postgresql+psycopg2"
         return (
-            f"postgresql+psycopg2://{user}:{password}"
+            f"{driver}://{user}:{password}"
             f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_DATABASE}"
         )
 
@@ -56,3 +63,41 @@ def get_db() -> Session:
     finally:
         db.close()
 
+
+# Async engine is only built when DB_ASYNC is enabled so deployments on the
+# sync path do not need aiomysql/asyncpg installed.
+async_engine = None
+AsyncSessionLocal = None
+
+
+def _build_async_engine():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    settings = get_settings()
+    url = _build_database_url(async_driver=True)
+    if settings.DB_CONNECTION == "pgsql":
+        connect_args = {"timeout": 30}
+    else:
+        connect_args = {"connect_timeout": 30}
+    eng = create_async_engine(
+        url,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+        pool_recycle=280,
+    )
+    return eng, async_sessionmaker(eng, autoflush=False, expire_on_commit=False)
+
+
+if get_settings().DB_ASYNC:
+    async_engine, AsyncSessionLocal = _build_async_engine()
+
+
+async def get_async_db() -> AsyncIterator["AsyncSession"]:
+    """AsyncSession dependency; requires DB_ASYNC=true."""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database path is disabled; set DB_ASYNC=true.")
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
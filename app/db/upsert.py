@@ -0,0 +1,60 @@
+"""Dialect-aware INSERT ... ON CONFLICT / ON DUPLICATE KEY upserts."""
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Table, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+
+def upsert_increment(
+    db: Session, table: Table, key: Dict[str, Any], column: str, delta: int, values: Dict[str, Any]
+) -> None:
+    """
+    Add delta to table.<column> for the row at primary key `key`, inserting
+    key + values with column = delta if the row does not exist. On an
+    existing row only `column` and `updated_at` (if in values) change. Runs
+    on the caller's transaction.
+    """
+    bumped: Dict[str, Any] = {column: table.c[column] + delta}
+    if "updated_at" in values:
+        bumped["updated_at"] = values["updated_at"]
+    row = {**values, **key, column: delta}
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        db.execute(mysql_insert(table).values(**row).on_duplicate_key_update(**bumped))
+    elif dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(table).values(**row)
+        db.execute(stmt.on_conflict_do_update(index_elements=[table.c[k] for k in key], set_=bumped))
+    else:
+        match = [table.c[k] == v for k, v in key.items()]
+        if not db.execute(update(table).where(*match).values(**bumped)).rowcount:
+            db.execute(table.insert().values(**row))
+
+
+def insert_ignore(db: Session, table: Table, rows: List[Dict[str, Any]], unique: Sequence[str]) -> None:
+    """
+    Insert rows, skipping any that collide with an existing row on the
+    unique columns `unique` (a concurrent insert included). Runs on the
+    caller's transaction.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(table).values(rows)
+        # No-op update: MySQL's way to say DO NOTHING without INSERT IGNORE's
+        # swallowing of unrelated errors.
+        db.execute(stmt.on_duplicate_key_update({unique[0]: stmt.inserted[unique[0]]}))
+    elif dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        db.execute(insert(table).values(rows).on_conflict_do_nothing(index_elements=[table.c[k] for k in unique]))
+    else:
+        for row in rows:
+            exists = db.execute(
+                table.select().where(*(table.c[k] == row[k] for k in unique)).limit(1)
+            ).first()
+            if exists is None:
+                db.execute(table.insert().values(**row))
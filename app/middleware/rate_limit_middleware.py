@@ -1,8 +1,38 @@
 from fastapi import Request
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.dependencies import strict_rate_limit, lenient_rate_limit, unlimited_rate
+from app.core.dependencies import RATE_LIMIT_HEADERS_STATE, strict_rate_limit, lenient_rate_limit, unlimited_rate
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Add the X-RateLimit-* headers a rate limit dependency (or one of the
+    middlewares below) left on request.state to the response, whichever
+    Response class the route returned. Headers the response already has win.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                extra = scope.get("state", {}).get(RATE_LIMIT_HEADERS_STATE)
+                if extra:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in extra.items():
+                        if name not in headers:
+                            headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 class ApiStrictRateLimitMiddleware(BaseHTTPMiddleware):
@@ -1,11 +1,14 @@
 """Admin: list editors, creators, projects; get by uuid; delete editor."""
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 
 from app.core.laravel_response import user_to_laravel_user_resource
+from app.core.pagination import Page, paginate_counted
 from app.db.models.project import Project
 from app.db.models.user import User
+from app.services.blob_store import storage_metrics
+from app.services.project_search import search_projects
 
 
 def _project_resource(p: Project) -> Dict[str, Any]:
@@ -16,15 +19,14 @@ class AdminService:
     def __init__(self, db: Session):
         self.db = db
 
-    def list_editors(self, page: int = 1, per_page: int = 15) -> Dict[str, Any]:
+    def list_editors(self, page: int = 1, per_page: int = 15, approximate: bool = False) -> Dict[str, Any]:
         try:
-            q = self.db.query(User).filter(User.active.is_(True))
-            total = q.count()
-            items = q.offset((page - 1) * per_page).limit(per_page).all()
-            editors = [user_to_laravel_user_resource(u) for u in items]
-            return {"editors": editors, "total": total, "page": page}
+            q = self.db.query(User).options(lazyload(User.projects)).filter(User.active.is_(True))
+            result = paginate_counted(q, User, page=page, per_page=per_page, cache_total=True, approximate=approximate)
+            editors = [user_to_laravel_user_resource(u) for u in result.items]
+            return {"editors": editors, "total": result.total, "page": page, "approximate": result.approximate}
         except Exception:
-            return {"editors": [], "total": 0, "page": page}
+            return {"editors": [], "total": 0, "page": page, "approximate": False}
 
     def get_editor(self, uuid: str) -> Optional[Dict[str, Any]]:
         user = self.db.query(User).filter(User.uuid == uuid).first()
@@ -32,15 +34,14 @@ class AdminService:
             return None
         return user_to_laravel_user_resource(user)
 
-    def list_creators(self, page: int = 1, per_page: int = 15) -> Dict[str, Any]:
+    def list_creators(self, page: int = 1, per_page: int = 15, approximate: bool = False) -> Dict[str, Any]:
         try:
-            q = self.db.query(User).filter(User.active.is_(True))
-            total = q.count()
-            items = q.offset((page - 1) * per_page).limit(per_page).all()
-            creators = [user_to_laravel_user_resource(u) for u in items]
-            return {"creators": creators, "total": total, "page": page}
+            q = self.db.query(User).options(lazyload(User.projects)).filter(User.active.is_(True))
+            result = paginate_counted(q, User, page=page, per_page=per_page, cache_total=True, approximate=approximate)
+            creators = [user_to_laravel_user_resource(u) for u in result.items]
+            return {"creators": creators, "total": result.total, "page": page, "approximate": result.approximate}
         except Exception:
-            return {"creators": [], "total": 0, "page": page}
+            return {"creators": [], "total": 0, "page": page, "approximate": False}
 
     def get_creator(self, uuid: str) -> Optional[Dict[str, Any]]:
         user = self.db.query(User).filter(User.uuid == uuid).first()
@@ -48,15 +49,38 @@ class AdminService:
             return None
         return user_to_laravel_user_resource(user)
 
-    def list_projects(self, page: int = 1, per_page: int = 15) -> Dict[str, Any]:
+    def list_projects(
+        self,
+        page: int = 1,
+        per_page: int = 15,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        approximate: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Newest first (or by relevance with `search`). Exact totals are cached
+        per filter for TOTAL_CACHE_TTL seconds; `approximate` uses the
+        planner's estimate instead.
+        """
         try:
             q = self.db.query(Project).filter(Project.deleted_at.is_(None))
-            total = q.count()
-            items = q.order_by(Project.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
-            projects = [_project_resource(p) for p in items]
-            return {"projects": projects, "total": total, "page": page}
+            if search:
+                items, total = search_projects(self.db, q, search, page=page, per_page=per_page)
+                result = Page(items, total, None)
+            else:
+                result = paginate_counted(
+                    q, Project, page=page, per_page=per_page, cursor=cursor, cache_total=True, approximate=approximate
+                )
+            projects = [_project_resource(p) for p in result.items]
+            return {
+                "projects": projects,
+                "total": result.total,
+                "page": page,
+                "next_cursor": result.next_cursor,
+                "approximate": result.approximate,
+            }
         except Exception:
-            return {"projects": [], "total": 0, "page": page}
+            return {"projects": [], "total": 0, "page": page, "next_cursor": None, "approximate": False}
 
     def get_project(self, uuid: str) -> Optional[Dict[str, Any]]:
         p = self.db.query(Project).filter(Project.uuid == uuid, Project.deleted_at.is_(None)).first()
@@ -71,3 +95,10 @@ class AdminService:
         user.active = False
         self.db.commit()
         return True
+
+    def storage_metrics(self) -> Dict[str, Any]:
+        """Upload deduplication: blobs, references, stored vs logical bytes, ratio."""
+        try:
+            return storage_metrics(self.db)
+        except Exception:
+            return {"blobs": 0, "references": 0, "stored_bytes": 0, "logical_bytes": 0, "bytes_saved": 0, "dedup_ratio": 1.0}
@@ -0,0 +1,99 @@
+"""
+Awaitable facades over the sync services, selected per deployment by DB_ASYNC.
+
+Service query code is written once against a sync `Session`. Routers await
+the facade returned by `service_dependency`:
+- DB_ASYNC=false: methods run in the Starlette threadpool on a PyMySQL session.
+- DB_ASYNC=true: methods run via `AsyncSession.run_sync` on the aiomysql/asyncpg
+  connection. No threadpool slot is held, and the driver I/O yields to the
+  loop, but everything else in the method (Python/numpy work, thread locks)
+  runs on the event-loop thread and blocks it.
+
+Services that do CPU-heavy work or take thread locks (the creator matrix,
+the in-process search indexes) are built with `threadpool=True`: they always
+run in the threadpool on their own sync session, whatever DB_ASYNC says.
+"""
+from typing import Any, Callable
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.db import session as db_session
+from app.db.session import get_async_db, get_db
+
+
+class ThreadpoolService:
+    """Run sync service methods in the threadpool (sync DB path)."""
+
+    def __init__(self, factory: Callable[[Session], Any], db: Session):
+        self.db = db
+        self._service = factory(db)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._service, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await run_in_threadpool(attr, *args, **kwargs)
+
+        return call
+
+
+class AsyncSessionService:
+    """Run sync service methods on an AsyncSession connection (async DB path)."""
+
+    def __init__(self, factory: Callable[[Session], Any], db: Any):
+        self.db = db
+        self._service = factory(db.sync_session)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._service, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.db.run_sync(lambda _session: attr(*args, **kwargs))
+
+        return call
+
+
+def service_dependency(factory: Callable[[Session], Any], threadpool: bool = False) -> Callable[..., Any]:
+    """
+    Build a FastAPI dependency yielding an awaitable facade for `factory(db)`.
+    The sync/async path is fixed at import time from settings.DB_ASYNC;
+    `threadpool` pins the service to the sync threadpool path.
+    """
+    if get_settings().DB_ASYNC and not threadpool:
+        async def _async_dependency(db: Any = Depends(get_async_db)) -> AsyncSessionService:
+            return AsyncSessionService(factory, db)
+
+        return _async_dependency
+
+    def _sync_dependency(db: Session = Depends(get_db)) -> ThreadpoolService:
+        return ThreadpoolService(factory, db)
+
+    return _sync_dependency
+
+
+async def call_service(
+    factory: Callable[[Session], Any], method: str, *args: Any, threadpool: bool = False, **kwargs: Any
+) -> Any:
+    """
+    One service call on a short-lived session. For long-lived endpoints
+    (WebSocket, SSE) that must not pin a pooled connection while they stream.
+    `threadpool` as in service_dependency.
+    """
+    if get_settings().DB_ASYNC and not threadpool:
+        db = db_session.AsyncSessionLocal()
+        try:
+            return await getattr(AsyncSessionService(factory, db), method)(*args, **kwargs)
+        finally:
+            await db.close()
+    db = db_session.SessionLocal()
+    try:
+        return await getattr(ThreadpoolService(factory, db), method)(*args, **kwargs)
+    finally:
+        db.close()
@@ -0,0 +1,178 @@
+"""
+Content-addressed upload storage with deduplication.
+
+Uploaded bytes are stored once, at UPLOAD_DIR/cas/<sha[:2]>/<sha256><ext>
+(served as /uploads/cas/...), and tracked by a FileBlob row whose ref_count
+counts the File rows and profile photos using them. A repeat upload costs a
+hash and a metadata row: its temp file is dropped and the count bumped.
+
+put_blob / retain_blob / release_blob change counts on the caller's
+transaction. Blobs that stay unreferenced for BLOB_GC_GRACE_SECONDS (default
+1 day) are deleted by sweep_unreferenced_blobs(), run by Celery beat; the
+grace period keeps a blob that is released and then re-uploaded from being
+removed underneath the new reference. put_blob writes its row before it looks
+at the file and the sweep unlinks a file before committing its DELETE, so the
+row lock orders the two: either the sweep sees the row freshly touched and
+keeps it, or put_blob finds the file gone and writes it again.
+"""
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, NamedTuple, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.uploads import TEMP_PREFIX, TEMP_SUFFIX, SpooledUpload, discard, extension, upload_dir, upload_url
+from app.db.models.file import FileBlob
+from app.db.upsert import upsert_increment
+
+CAS_DIR = "cas"
+BLOB_GC_GRACE_SECONDS = float(os.getenv("BLOB_GC_GRACE_SECONDS", "86400"))
+
+_CAS_URL_RE = re.compile(r"/uploads/cas/[0-9a-f]{2}/([0-9a-f]{64})")
+_table = FileBlob.__table__
+
+
+class Blob(NamedTuple):
+    sha256: str
+    path: str
+    url: str
+    size: int
+    deduplicated: bool
+
+
+def _relative_name(sha256: str, ext: str) -> str:
+    return f"{CAS_DIR}/{sha256[:2]}/{sha256}{ext}"
+
+
+def put_blob(db: Session, upload: SpooledUpload, reference: bool = True) -> Blob:
+    """
+    File a spooled upload under its content hash and, with `reference`, take
+    a reference to it (otherwise the caller does so later with retain_blob,
+    within BLOB_GC_GRACE_SECONDS). The temp file is consumed either way. The
+    caller commits.
+    """
+    now = datetime.utcnow()
+    try:
+        # Reference first: the upsert locks the row (and refreshes updated_at)
+        # until the caller commits, so a sweep cannot delete it in between.
+        new_path = os.path.join(upload_dir(), _relative_name(upload.sha256, extension(upload.filename)))
+        upsert_increment(
+            db, _table, {"sha256": upload.sha256}, "ref_count", 1 if reference else 0,
+            {"path": new_path, "size": upload.size, "created_at": now, "updated_at": now},
+        )
+        path = db.execute(select(_table.c.path).where(_table.c.sha256 == upload.sha256)).scalar_one()
+        if os.path.exists(path):
+            discard(upload)
+            deduplicated = True
+        else:
+            # New content, or a row whose file was lost or swept: (re)write it.
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(upload.path, path)
+            deduplicated = False
+    except BaseException:
+        discard(upload)
+        raise
+    name = os.path.relpath(path, upload_dir()).replace(os.sep, "/")
+    return Blob(upload.sha256, path, upload_url(name), upload.size, deduplicated)
+
+
+def discard_blob(blob: Optional[Blob]) -> None:
+    """
+    Undo put_blob's file write when the caller rolls back instead of
+    committing; call it before the rollback, while the row is still locked.
+    A deduplicated blob belongs to earlier references and is left alone.
+    """
+    if blob is None or blob.deduplicated:
+        return
+    try:
+        os.unlink(blob.path)
+    except FileNotFoundError:
+        pass
+
+
+def retain_blob(db: Session, sha256: Optional[str]) -> None:
+    """Take one more reference to a stored blob. The caller commits."""
+    if not sha256:
+        return
+    db.execute(
+        update(_table)
+        .where(_table.c.sha256 == sha256)
+        .values(ref_count=_table.c.ref_count + 1, updated_at=datetime.utcnow())
+    )
+
+
+def release_blob(db: Session, sha256: Optional[str]) -> None:
+    """Drop one reference; the file goes once sweep_unreferenced_blobs finds it unused. The caller commits."""
+    if not sha256:
+        return
+    db.execute(
+        update(_table)
+        .where(_table.c.sha256 == sha256, _table.c.ref_count > 0)
+        .values(ref_count=_table.c.ref_count - 1, updated_at=datetime.utcnow())
+    )
+
+
+def blob_sha_for_url(url: Optional[str]) -> Optional[str]:
+    """Content hash of a /uploads/cas/... URL (absolute or relative); None for other URLs."""
+    match = _CAS_URL_RE.search(url or "")
+    return match.group(1) if match else None
+
+
+def sweep_unreferenced_blobs(db: Session, grace: float = BLOB_GC_GRACE_SECONDS) -> int:
+    """
+    Delete blobs unreferenced for `grace` seconds (row, then file) and stale
+    upload temp files; commits and returns the number of blobs removed.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=grace)
+    removed = 0
+    candidates = db.query(FileBlob.sha256, FileBlob.path).filter(
+        FileBlob.ref_count <= 0, FileBlob.updated_at < cutoff
+    ).all()
+    for sha256, path in candidates:
+        # Re-check in the DELETE: a new upload may have taken a reference or
+        # touched the row since. The DELETE holds the row until the commit,
+        # so the file goes while a concurrent put_blob is still waiting.
+        result = db.execute(
+            delete(_table).where(
+                _table.c.sha256 == sha256, _table.c.ref_count <= 0, _table.c.updated_at < cutoff
+            )
+        )
+        if result.rowcount:
+            removed += 1
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        db.commit()
+    directory = upload_dir()
+    stale_before = time.time() - grace
+    for entry in os.scandir(directory):
+        if entry.name.startswith(TEMP_PREFIX) and entry.name.endswith(TEMP_SUFFIX):
+            try:
+                if entry.stat().st_mtime < stale_before:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def storage_metrics(db: Session) -> Dict[str, Any]:
+    """Deduplication figures over referenced blobs: logical vs stored bytes."""
+    blobs, references, stored, logical = db.query(
+        func.count(),
+        func.coalesce(func.sum(FileBlob.ref_count), 0),
+        func.coalesce(func.sum(FileBlob.size), 0),
+        func.coalesce(func.sum(FileBlob.size * FileBlob.ref_count), 0),
+    ).filter(FileBlob.ref_count > 0).one()
+    stored, logical = int(stored), int(logical)
+    return {
+        "blobs": blobs,
+        "references": int(references),
+        "stored_bytes": stored,
+        "logical_bytes": logical,
+        "bytes_saved": logical - stored,
+        "dedup_ratio": round(logical / stored, 3) if stored else 1.0,
+    }
@@ -0,0 +1,194 @@
+"""
+Real-time chat fan-out (Laravel ChatEvent / ChatMessageEvent broadcasts).
+
+ChatHub keeps the WebSocket/SSE subscribers of this worker, keyed by channel.
+Events are published through a ChatBroker so every worker sees them:
+- RedisChatBroker (default): Redis pub/sub; one listener task per worker.
+- InMemoryChatBroker: delivers within the process (tests, single worker).
+Select with CHAT_BROKER=redis|memory.
+"""
+import asyncio
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.redis import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+# Per-subscriber buffer; a slow client loses its oldest events, never blocks publishers.
+SUBSCRIBER_QUEUE_SIZE = 100
+REDIS_CHANNEL_PREFIX = "roster:chat:"
+
+
+def conversation_channel(conversation_uuid: str) -> str:
+    return f"chat.{conversation_uuid}"
+
+
+def user_channel(user_id: int) -> str:
+    """Internal per-user channel (inbox notifications); never sent to clients."""
+    return f"user.{user_id}"
+
+
+class ChatBroker(ABC):
+    """Cross-worker transport. Delivers published payloads to hub.dispatch on every worker."""
+
+    def __init__(self) -> None:
+        self.hub: Optional["ChatHub"] = None
+
+    def attach(self, hub: "ChatHub") -> None:
+        self.hub = hub
+
+    async def start(self) -> None:
+        return None
+
+    @abstractmethod
+    async def publish(self, channel: str, payload: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        return None
+
+
+class InMemoryChatBroker(ChatBroker):
+    async def publish(self, channel: str, payload: str) -> None:
+        if self.hub is not None:
+            self.hub.dispatch(channel, payload)
+
+
+class RedisChatBroker(ChatBroker):
+    def __init__(self, prefix: str = REDIS_CHANNEL_PREFIX) -> None:
+        super().__init__()
+        self.prefix = prefix
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def publish(self, channel: str, payload: str) -> None:
+        try:
+            await get_async_redis().publish(self.prefix + channel, payload)
+        except Exception:
+            # Redis down: still reach subscribers on this worker.
+            logger.exception("Chat broadcast via Redis failed channel=%s", channel)
+            if self.hub is not None:
+                self.hub.dispatch(channel, payload)
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = get_async_redis().pubsub()
+            try:
+                await pubsub.psubscribe(self.prefix + "*")
+                backoff = 1.0
+                async for msg in pubsub.listen():
+                    if msg.get("type") != "pmessage" or self.hub is None:
+                        continue
+                    self.hub.dispatch(msg["channel"][len(self.prefix):], msg["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Chat Redis listener failed; reconnecting in %.0fs", backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+
+class ChatHub:
+    def __init__(self, broker: ChatBroker) -> None:
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self.broker = broker
+        broker.attach(self)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, item: Optional[str]) -> None:
+        if queue.full():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(item)
+
+    def dispatch(self, channel: str, payload: str) -> None:
+        """Hand a serialized event to every local subscriber of channel."""
+        for queue in list(self._subscribers.get(channel, ())):
+            self._offer(queue, payload)
+
+    async def publish(self, channel: str, event: str, data: Dict[str, Any]) -> None:
+        payload = json.dumps({"event": event, "data": jsonable_encoder(data)})
+        await self.broker.publish(channel, payload)
+
+    @asynccontextmanager
+    async def subscribe(self, channels: Iterable[str]) -> AsyncIterator[asyncio.Queue]:
+        """
+        Yield a queue receiving serialized events for channels until the
+        block exits. None on the queue means the hub closed: stop reading.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        channels = set(channels)
+        for channel in channels:
+            self._subscribers[channel].add(queue)
+        try:
+            await self.broker.start()
+            yield queue
+        finally:
+            for channel in channels:
+                subs = self._subscribers.get(channel)
+                if subs is not None:
+                    subs.discard(queue)
+                    if not subs:
+                        del self._subscribers[channel]
+
+    async def close(self) -> None:
+        """Stop the broker and end every subscription (each queue gets None)."""
+        await self.broker.close()
+        queues = {queue for subs in self._subscribers.values() for queue in subs}
+        self._subscribers.clear()
+        for queue in queues:
+            self._offer(queue, None)
+
+
+def _build_broker() -> ChatBroker:
+    if os.getenv("CHAT_BROKER", "redis").lower() == "memory":
+        return InMemoryChatBroker()
+    return RedisChatBroker()
+
+
+@lru_cache()
+def get_chat_hub() -> ChatHub:
+    return ChatHub(_build_broker())
+
+
+async def broadcast_message(conversation_uuid: str, message: Dict[str, Any], recipient_ids: Iterable[int]) -> None:
+    """
+    Laravel parity: ChatMessageEvent(message, channel) on the conversation channel,
+    ChatEvent(senderId, chat, channel) on each recipient's inbox channel.
+    """
+    hub = get_chat_hub()
+    channel = conversation_channel(conversation_uuid)
+    await hub.publish(channel, "ChatMessageEvent", {"message": message, "channel": channel})
+    sender = message.get("user") or {}
+    chat_event = {"senderId": sender.get("uuid"), "chat": conversation_uuid, "channel": channel}
+    for uid in recipient_ids:
+        await hub.publish(user_channel(uid), "ChatEvent", chat_event)
@@ -1,13 +1,24 @@
 """Chat: conversations and messages."""
+import logging
 import uuid as uuid_lib
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.orm import Query, Session, aliased, lazyload
 
-from app.db.models.conversation import Conversation, Message
+from app.db.models.conversation import Conversation, ConversationParticipant, Message
 from app.db.models.project import Project
 from app.db.models.user import User
+from app.db.upsert import insert_ignore
+
+logger = logging.getLogger(__name__)
+
+# Default and maximum number of messages returned per conversation page.
+MESSAGE_PAGE_SIZE = 50
+MESSAGE_PAGE_MAX = 200
+# Conversations returned by the inbox.
+INBOX_SIZE = 50
 
 
 def _message_resource(msg: Message, user: Optional[User] = None) -> Dict[str, Any]:
@@ -28,50 +39,223 @@ def _conversation_resource(conv: Conversation, project: Optional[Project] = None
     }
 
 
+def _inbox_resource(
+    conv: Conversation,
+    project: Optional[Project],
+    last_message: Optional[Message],
+    sender: Optional[User],
+    unread_count: Optional[int],
+) -> Dict[str, Any]:
+    out = _conversation_resource(conv, project, [])
+    out["last_message"] = _message_resource(last_message, sender) if last_message else None
+    out["unread_count"] = int(unread_count or 0)
+    return out
+
+
 class ChatService:
     def __init__(self, db: Session):
         self.db = db
 
-    def list_conversations(self, user_id: int) -> List[Dict[str, Any]]:
+    def _users_by_id(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Load each distinct sender once (one IN query) instead of per message."""
+        ids = {i for i in user_ids if i}
+        if not ids:
+            return {}
+        users = self.db.query(User).options(lazyload(User.projects)).filter(User.id.in_(ids)).all()
+        return {u.id: u for u in users}
+
+    def _message_resources(self, msgs: List[Message]) -> List[Dict[str, Any]]:
+        users = self._users_by_id(m.user_id for m in msgs)
+        return [_message_resource(m, users.get(m.user_id)) for m in msgs]
+
+    def _apply_cursor(
+        self, q: Query, before: Optional[str], after: Optional[str], conversation_id: Optional[int] = None
+    ) -> Query:
+        """
+        Keyset paging on (created_at, id) anchored at a message uuid.
+        Unknown cursor uuids, and with `conversation_id` uuids of messages in
+        other conversations, are ignored (first page semantics).
+        """
+        for cursor_uuid, older in ((before, True), (after, False)):
+            if not cursor_uuid:
+                continue
+            anchor_q = self.db.query(Message.created_at, Message.id).filter(Message.uuid == cursor_uuid)
+            if conversation_id is not None:
+                anchor_q = anchor_q.filter(Message.conversation_id == conversation_id)
+            anchor = anchor_q.first()
+            if not anchor:
+                continue
+            created_at, msg_id = anchor
+            if older:
+                q = q.filter(or_(Message.created_at < created_at, and_(Message.created_at == created_at, Message.id < msg_id)))
+            else:
+                q = q.filter(or_(Message.created_at > created_at, and_(Message.created_at == created_at, Message.id > msg_id)))
+        return q
+
+    def _add_participants(self, conversation_id: int, user_ids: Iterable[int]) -> None:
+        """Insert missing participant rows; concurrent inserts of the same row are fine (caller commits)."""
+        ids = {i for i in user_ids if i}
+        if not ids:
+            return
+        now = datetime.utcnow()
+        insert_ignore(
+            self.db,
+            ConversationParticipant.__table__,
+            [{"conversation_id": conversation_id, "user_id": uid, "created_at": now, "updated_at": now} for uid in sorted(ids)],
+            ("conversation_id", "user_id"),
+        )
+
+    def _mark_read(self, conversation_id: int, user_id: int, message_id: int) -> None:
+        """Advance the participant's read cursor (never moves it backwards; caller commits)."""
+        now = datetime.utcnow()
+        self.db.execute(
+            update(ConversationParticipant)
+            .where(
+                ConversationParticipant.conversation_id == conversation_id,
+                ConversationParticipant.user_id == user_id,
+                or_(
+                    ConversationParticipant.last_read_message_id.is_(None),
+                    ConversationParticipant.last_read_message_id < message_id,
+                ),
+            )
+            .values(last_read_message_id=message_id, last_read_at=now, updated_at=now)
+        )
+
+    def _mark_read_best_effort(self, conversation_id: int, user_id: int, message_id: int) -> None:
+        """_mark_read in its own transaction from a read path; a failure never fails the read."""
         try:
-            convs = self.db.query(Conversation).limit(50).all()
-            out = []
-            for c in convs:
-                proj = self.db.query(Project).filter(Project.id == c.project_id).first() if c.project_id else None
-                out.append(_conversation_resource(c, proj, []))
-            return out
+            self._mark_read(conversation_id, user_id, message_id)
+            self.db.commit()
         except Exception:
+            self.db.rollback()
+            logger.warning("Could not advance read cursor of user %s in conversation %s", user_id, conversation_id)
+
+    def participant_user_ids(self, conversation_uuid: str) -> List[int]:
+        rows = (
+            self.db.query(ConversationParticipant.user_id)
+            .join(Conversation, Conversation.id == ConversationParticipant.conversation_id)
+            .filter(Conversation.uuid == conversation_uuid)
+            .all()
+        )
+        return [r[0] for r in rows]
+
+    def participant_conversation_uuids(self, user_id: int, conversation_uuids: Iterable[str]) -> List[str]:
+        """Subset of conversation_uuids the user takes part in."""
+        uuids = {u for u in conversation_uuids if u}
+        if not uuids:
             return []
+        rows = (
+            self.db.query(Conversation.uuid)
+            .join(ConversationParticipant, ConversationParticipant.conversation_id == Conversation.id)
+            .filter(ConversationParticipant.user_id == user_id, Conversation.uuid.in_(uuids))
+            .all()
+        )
+        return [r[0] for r in rows]
 
-    def get_conversation(self, uuid: str, user_id: int) -> Optional[Dict[str, Any]]:
+    def list_conversations(self, user_id: int, limit: int = INBOX_SIZE) -> List[Dict[str, Any]]:
+        """
+        Inbox: the user's conversations, newest activity first, each with its
+        latest message and unread count. One statement: a window pass over the
+        messages of the user's conversations ranks the latest message and sums
+        unread messages per conversation, joined back to conversation, project
+        and sender.
+        """
+        try:
+            me = aliased(ConversationParticipant)
+            ranked = (
+                select(
+                    Message,
+                    func.row_number()
+                    .over(partition_by=Message.conversation_id, order_by=(Message.created_at.desc(), Message.id.desc()))
+                    .label("rn"),
+                    func.sum(
+                        case(
+                            (and_(Message.user_id != user_id, Message.id > func.coalesce(me.last_read_message_id, 0)), 1),
+                            else_=0,
+                        )
+                    )
+                    .over(partition_by=Message.conversation_id)
+                    .label("unread_count"),
+                )
+                .join(me, and_(me.conversation_id == Message.conversation_id, me.user_id == user_id))
+                .subquery()
+            )
+            last_message = aliased(Message, ranked)
+            sender = aliased(User)
+            rows = (
+                self.db.query(Conversation, Project, last_message, sender, ranked.c.unread_count)
+                .join(
+                    ConversationParticipant,
+                    and_(ConversationParticipant.conversation_id == Conversation.id, ConversationParticipant.user_id == user_id),
+                )
+                .outerjoin(ranked, and_(ranked.c.conversation_id == Conversation.id, ranked.c.rn == 1))
+                .outerjoin(Project, Project.id == Conversation.project_id)
+                .outerjoin(sender, sender.id == ranked.c.user_id)
+                .options(lazyload(sender.projects))
+                .order_by(func.coalesce(ranked.c.created_at, Conversation.created_at).desc(), Conversation.id.desc())
+                .limit(limit)
+                .all()
+            )
+            return [_inbox_resource(*row) for row in rows]
+        except Exception:
+            return []
+
+    def get_conversation(
+        self,
+        uuid: str,
+        user_id: int,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = MESSAGE_PAGE_SIZE,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Conversation with one page of messages in chronological order.
+        Default page is the latest `limit` messages; `before`/`after` take a
+        message uuid and page towards older/newer messages respectively.
+        """
         try:
             conv = self.db.query(Conversation).filter(Conversation.uuid == uuid).first()
             if not conv:
                 return None
             proj = self.db.query(Project).filter(Project.id == conv.project_id).first() if conv.project_id else None
-            msgs = self.db.query(Message).filter(Message.conversation_id == conv.id).order_by(Message.created_at).all()
-            msg_list = []
-            for m in msgs:
-                u = self.db.query(User).filter(User.id == m.user_id).first()
-                msg_list.append(_message_resource(m, u))
-            return _conversation_resource(conv, proj, msg_list)
+            limit = max(1, min(limit, MESSAGE_PAGE_MAX))
+            q = self._apply_cursor(
+                self.db.query(Message).filter(Message.conversation_id == conv.id), before, after, conv.id
+            )
+            if after and not before:
+                msgs = q.order_by(Message.created_at.asc(), Message.id.asc()).limit(limit + 1).all()
+                has_more = len(msgs) > limit
+                msgs = msgs[:limit]
+            else:
+                msgs = q.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit + 1).all()
+                has_more = len(msgs) > limit
+                msgs = list(reversed(msgs[:limit]))
+            out = _conversation_resource(conv, proj, self._message_resources(msgs))
+            out["has_more"] = has_more
+            if msgs and not before and not (after and has_more):
+                # Newest message is on this page: the user has now read the thread.
+                self._mark_read_best_effort(conv.id, user_id, msgs[-1].id)
+            return out
         except Exception:
             return None
 
-    def get_received_messages(self, user_id: int) -> List[Dict[str, Any]]:
+    def get_received_messages(self, user_id: int, before: Optional[str] = None) -> List[Dict[str, Any]]:
         try:
-            msgs = self.db.query(Message).filter(Message.user_id != user_id).order_by(Message.created_at.desc()).limit(50).all()
-            return [_message_resource(m, self.db.query(User).filter(User.id == m.user_id).first()) for m in msgs]
+            q = self._apply_cursor(self.db.query(Message).filter(Message.user_id != user_id), before, None)
+            msgs = q.order_by(Message.created_at.desc(), Message.id.desc()).limit(MESSAGE_PAGE_SIZE).all()
+            return self._message_resources(msgs)
         except Exception:
             return []
 
     def init_conversation(self, user_id: int, project_uuid: Optional[str] = None) -> Optional[Dict[str, Any]]:
         try:
             project_id = None
+            participant_ids = [user_id]
             if project_uuid:
                 p = self.db.query(Project).filter(Project.uuid == project_uuid).first()
                 if p:
                     project_id = p.id
+                    participant_ids += [p.user_id, p.editor_id]
             conv = Conversation(
                 uuid=str(uuid_lib.uuid4()),
                 project_id=project_id,
@@ -79,6 +263,8 @@ class ChatService:
                 updated_at=datetime.utcnow(),
             )
             self.db.add(conv)
+            self.db.flush()
+            self._add_participants(conv.id, participant_ids)
             self.db.commit()
             self.db.refresh(conv)
             proj = self.db.query(Project).filter(Project.id == conv.project_id).first() if conv.project_id else None
@@ -100,6 +286,10 @@ class ChatService:
                 updated_at=datetime.utcnow(),
             )
             self.db.add(msg)
+            conv.updated_at = msg.created_at
+            self._add_participants(conv.id, [user_id])
+            self.db.flush()
+            self._mark_read(conv.id, user_id, msg.id)
             self.db.commit()
             self.db.refresh(msg)
             u = self.db.query(User).filter(User.id == user_id).first()
@@ -0,0 +1,338 @@
+"""
+Creator search for /usercreator/search and /usercreator/search/public.
+
+A per-process index of active creators, stored column-wise by row number
+(row numbers are stable; a user keeps the row it was given):
+
+- text: a TextIndex over name / username (x3), job_title (x2) and fun_fact,
+  keyed by row number
+- skills / platforms: pivot pairs as (rows, vocab positions) arrays
+- country (normalized code), open_for_work, created_at (epoch)
+
+A query ANDs its filters (values within one facet are ORed). Facet counts
+are disjunctive: each facet is counted with every filter except its own
+applied, via np.bincount over the pair arrays. With text, rank =
+BM25 / best BM25 + RECENCY_WEIGHT * recency; without text, recency alone,
+where recency = 0.5 ** (age / RECENCY_HALF_LIFE_DAYS) on users.created_at.
+
+Built on first use, rebuilt every CREATOR_SEARCH_INDEX_TTL seconds and topped
+up from users.updated_at every CREATOR_SEARCH_REFRESH_SECONDS; a refresh in
+progress never blocks other requests, which keep the current index.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.db.models.user import User
+from app.services.location_index import normalize
+from app.services.matching_engine import FACETS
+from app.services.text_index import TextIndex, tokenize
+
+logger = logging.getLogger(__name__)
+
+CREATOR_SEARCH_INDEX_TTL = float(os.getenv("CREATOR_SEARCH_INDEX_TTL", "3600"))
+CREATOR_SEARCH_REFRESH_SECONDS = float(os.getenv("CREATOR_SEARCH_REFRESH_SECONDS", "5"))
+RECENCY_WEIGHT = 0.25
+RECENCY_HALF_LIFE_DAYS = 90.0
+MAX_FACET_VALUES = 20
+SEARCH_FACETS = tuple(f for f in FACETS if f.name in ("skills", "platforms"))
+
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("0", "false", "no", "off")
+
+
+class CreatorQuery(NamedTuple):
+    text: Optional[str] = None
+    facets: Dict[str, Tuple[str, ...]] = {}  # facet name -> lookup uuids
+    countries: Tuple[str, ...] = ()
+    open_for_work: Optional[bool] = None
+
+
+def _values(params: Mapping[str, Any], key: str) -> Tuple[str, ...]:
+    """Repeated (?skills=a&skills=b), bracketed (skills[]=a) or comma-separated values."""
+    raw: List[Any] = []
+    for name in (key, f"{key}[]"):
+        if hasattr(params, "getlist"):
+            raw.extend(params.getlist(name))
+        elif params.get(name) is not None:
+            value = params.get(name)
+            raw.extend(value if isinstance(value, (list, tuple)) else [value])
+    return tuple(dict.fromkeys(v.strip() for item in raw for v in str(item).split(",") if v.strip()))
+
+
+def parse_creator_query(params: Optional[Mapping[str, Any]]) -> CreatorQuery:
+    """Read q (or search), skills, platforms, country and open_for_work."""
+    params = params or {}
+    flag = str(params.get("open_for_work", "")).strip().lower()
+    facets = {f.name: _values(params, f.name) for f in SEARCH_FACETS}
+    return CreatorQuery(
+        text=(params.get("q") or params.get("search") or None),
+        facets={name: uuids for name, uuids in facets.items() if uuids},
+        countries=_values(params, "country"),
+        open_for_work=True if flag in _TRUE else False if flag in _FALSE else None,
+    )
+
+
+def _epoch(value: Optional[datetime]) -> float:
+    return value.timestamp() if value is not None else 0.0
+
+
+class CreatorSearchIndex:
+    def __init__(self, lookups: Dict[str, List[Tuple[int, str, str]]]):
+        # Per facet: vocab (lookup ids ascending) and (uuid, name) per position.
+        self.vocab = {name: np.array([r[0] for r in rows], dtype=np.int64) for name, rows in lookups.items()}
+        self.labels = {name: [(r[1], r[2]) for r in rows] for name, rows in lookups.items()}
+        self._uuid_pos = {name: {r[1]: i for i, r in enumerate(rows) if r[1]} for name, rows in lookups.items()}
+        self.size = 0
+        self.row_of: Dict[int, int] = {}
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self.active = np.empty(0, dtype=bool)
+        self.open_for_work = np.empty(0, dtype=bool)
+        self.country = np.empty(0, dtype=np.int32)
+        self.created = np.empty(0, dtype=np.float64)
+        self.pairs = {name: (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)) for name in lookups}
+        self.country_codes: Dict[str, int] = {}
+        self.country_names: List[str] = []
+        self.text = TextIndex()
+        self._lock = threading.Lock()
+
+    def _country_code(self, country: Optional[str], create: bool = False) -> int:
+        key = normalize(country)
+        if not key:
+            return -1
+        code = self.country_codes.get(key)
+        if code is None and create:
+            code = self.country_codes[key] = len(self.country_names)
+            self.country_names.append(country.strip())
+        return -1 if code is None else code
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows <= len(self.user_ids):
+            return
+        cap = max(rows, 2 * len(self.user_ids), 64)
+
+        def grow(arr: np.ndarray, fill: Any) -> np.ndarray:
+            out = np.full(cap, fill, dtype=arr.dtype)
+            out[: len(arr)] = arr
+            return out
+
+        self.user_ids = grow(self.user_ids, 0)
+        self.active = grow(self.active, False)
+        self.open_for_work = grow(self.open_for_work, False)
+        self.country = grow(self.country, -1)
+        self.created = grow(self.created, 0.0)
+
+    def load(self, users: List[Any], pairs: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> None:
+        """
+        Write user rows (id, active, open_for_work, country, created_at and the
+        text columns) and their pivot pairs {facet: (user_ids, lookup_ids)};
+        existing rows are replaced in place.
+        """
+        with self._lock:
+            for u in users:
+                if u.id not in self.row_of:
+                    self._ensure_capacity(self.size + 1)
+                    self.row_of[u.id] = self.size
+                    self.user_ids[self.size] = u.id
+                    self.size += 1
+            rows = np.array([self.row_of[u.id] for u in users], dtype=np.int64)
+            for u, row in zip(users, rows.tolist()):
+                self.active[row] = bool(u.active)
+                self.open_for_work[row] = bool(u.open_for_work)
+                self.country[row] = self._country_code(u.country, create=True)
+                self.created[row] = _epoch(u.created_at)
+                if u.active:
+                    name = u.name or " ".join(p for p in (u.first_name, u.last_name) if p)
+                    self.text.add(row, ((name, 3), (u.username, 3), (u.job_title, 2), (u.fun_fact, 1)))
+                else:
+                    self.text.remove(row)
+            for facet, (old_rows, old_cols) in self.pairs.items():
+                keep = ~np.isin(old_rows, rows)
+                user_ids, lookup_ids = pairs.get(facet, (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)))
+                vocab = self.vocab[facet]
+                new_rows = np.array([self.row_of.get(int(u), -1) for u in user_ids], dtype=np.int64)
+                pos = np.clip(np.searchsorted(vocab, lookup_ids), 0, max(len(vocab) - 1, 0))
+                known = (new_rows >= 0) & ((vocab[pos] == lookup_ids) if len(vocab) else False)
+                self.pairs[facet] = (
+                    np.concatenate([old_rows[keep], new_rows[known]]),
+                    np.concatenate([old_cols[keep], pos[known]]),
+                )
+
+    def _facet_mask(self, facet: str, uuids: Tuple[str, ...], n: int) -> np.ndarray:
+        rows, cols = self.pairs[facet]
+        wanted = [self._uuid_pos[facet][u] for u in uuids if u in self._uuid_pos[facet]]
+        mask = np.zeros(n, dtype=bool)
+        if wanted:
+            hit = np.isin(cols, wanted) & (rows < n)
+            mask[rows[hit]] = True
+        return mask
+
+    def search(self, query: CreatorQuery, page: int = 1, per_page: int = 15) -> Tuple[List[int], int, Dict[str, Any]]:
+        """(user ids for the page, total, facet counts)."""
+        n = self.size
+        core = self.active[:n].copy()
+        relevance = None
+        if tokenize(query.text):
+            rows, scores = self.text.search_arrays(query.text)
+            inside = rows < n
+            rows, scores = rows[inside], scores[inside]
+            text_mask = np.zeros(n, dtype=bool)
+            text_mask[rows] = True
+            core &= text_mask
+            relevance = np.zeros(n, dtype=np.float64)
+            if len(scores):
+                relevance[rows] = scores / scores.max()
+
+        filters: Dict[str, np.ndarray] = {}
+        for facet, uuids in query.facets.items():
+            if facet in self.pairs and uuids:
+                filters[facet] = self._facet_mask(facet, uuids, n)
+        if query.countries:
+            codes = [c for c in (self._country_code(name) for name in query.countries) if c >= 0]
+            filters["country"] = np.isin(self.country[:n], codes)
+        if query.open_for_work is not None:
+            filters["open_for_work"] = self.open_for_work[:n] == query.open_for_work
+
+        def without(name: Optional[str]) -> np.ndarray:
+            mask = core.copy()
+            for key, f in filters.items():
+                if key != name:
+                    mask &= f
+            return mask
+
+        matched = without(None)
+        facets = self._facet_counts(without, n)
+
+        candidates = np.flatnonzero(matched)
+        total = len(candidates)
+        start = (page - 1) * per_page
+        if start >= total:
+            return [], total, facets
+        age_days = np.maximum(time.time() - self.created[candidates], 0) / 86400.0
+        score = np.power(0.5, age_days / RECENCY_HALF_LIFE_DAYS)
+        if relevance is not None:
+            score = relevance[candidates] + RECENCY_WEIGHT * score
+        k = min(start + per_page, total)
+        if k < total:
+            # Keep every candidate tied with the k-th score so the id tiebreak decides the page edge.
+            kth = -np.partition(-score, k - 1)[k - 1]
+            top = np.flatnonzero(score >= kth)
+        else:
+            top = np.arange(total)
+        ids = self.user_ids[candidates[top]]
+        top = top[np.lexsort((-ids, -score[top]))]
+        return [int(u) for u in self.user_ids[candidates[top]][start:start + per_page]], total, facets
+
+    def _facet_counts(self, without, n: int) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for facet in self.pairs:
+            rows, cols = self.pairs[facet]
+            inside = rows < n
+            rows, cols = rows[inside], cols[inside]
+            counts = np.bincount(cols[without(facet)[rows]], minlength=len(self.vocab[facet]))
+            out[facet] = [
+                {"uuid": self.labels[facet][i][0], "name": self.labels[facet][i][1], "count": int(counts[i])}
+                for i in np.argsort(-counts, kind="stable")[:MAX_FACET_VALUES]
+                if counts[i] > 0
+            ]
+        codes = self.country[:n][without("country")]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.country_names))
+        out["country"] = [
+            {"name": self.country_names[i], "count": int(counts[i])}
+            for i in np.argsort(-counts, kind="stable")[:MAX_FACET_VALUES]
+            if counts[i] > 0
+        ]
+        open_rows = self.open_for_work[:n][without("open_for_work")]
+        out["open_for_work"] = {"1": int(open_rows.sum()), "0": int(len(open_rows) - open_rows.sum())}
+        return out
+
+
+_USER_COLUMNS = (
+    User.id, User.active, User.open_for_work, User.country, User.created_at,
+    User.name, User.first_name, User.last_name, User.username, User.job_title, User.fun_fact,
+)
+
+
+def _load_lookups(db: Session) -> Dict[str, List[Tuple[int, str, str]]]:
+    return {
+        f.name: [tuple(r) for r in db.query(f.lookup.id, f.lookup.uuid, f.lookup.name).order_by(f.lookup.id).all()]
+        for f in SEARCH_FACETS
+    }
+
+
+def _load_users(db: Session, user_ids: Optional[List[int]] = None):
+    q = db.query(*_USER_COLUMNS)
+    q = q.filter(User.active.is_(True)) if user_ids is None else q.filter(User.id.in_(user_ids))
+    users = q.all()
+    pairs: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    for f in SEARCH_FACETS:
+        owner, fk = f.user_pivot.c.user_id, f.user_pivot.c[f.fk]
+        pq = db.query(owner, fk)
+        if user_ids is not None:
+            pq = pq.filter(owner.in_(user_ids))
+        rows = pq.all()
+        pairs[f.name] = (
+            np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows)),
+            np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows)),
+        )
+    return users, pairs
+
+
+_index: Optional[CreatorSearchIndex] = None
+_built_at = 0.0
+_checked_at = 0.0
+_synced_until: Optional[datetime] = None
+_lock = threading.Lock()
+
+
+def _build(db: Session) -> None:
+    global _index, _built_at, _checked_at, _synced_until
+    index = CreatorSearchIndex(_load_lookups(db))
+    index.load(*_load_users(db))
+    _synced_until = db.query(User.updated_at).order_by(User.updated_at.desc()).limit(1).scalar()
+    _index = index
+    _built_at = _checked_at = time.monotonic()
+
+
+def _refresh(db: Session) -> None:
+    global _checked_at, _synced_until
+    q = db.query(User.id, User.updated_at)
+    q = q.filter(User.updated_at >= _synced_until) if _synced_until is not None else q.filter(User.updated_at.isnot(None))
+    changed = q.all()
+    if changed:
+        _index.load(*_load_users(db, sorted({r[0] for r in changed})))
+    newest = max((r[1] for r in changed if r[1] is not None), default=None)
+    if newest is not None and (_synced_until is None or newest > _synced_until):
+        _synced_until = newest
+    _checked_at = time.monotonic()
+
+
+def get_creator_search_index(db: Session) -> CreatorSearchIndex:
+    """Shared index: built on first use, topped up incrementally, rebuilt after the TTL."""
+    global _checked_at
+    index = _index
+    now = time.monotonic()
+    if index is not None and now - _built_at < CREATOR_SEARCH_INDEX_TTL and now - _checked_at < CREATOR_SEARCH_REFRESH_SECONDS:
+        return index
+    if not _lock.acquire(blocking=index is None):
+        return index
+    try:
+        try:
+            if _index is None or time.monotonic() - _built_at >= CREATOR_SEARCH_INDEX_TTL:
+                _build(db)
+            else:
+                _refresh(db)
+        except Exception:
+            if _index is None:
+                raise
+            logger.exception("Creator search index refresh failed; serving the previous one")
+            _checked_at = time.monotonic()
+        return _index
+    finally:
+        _lock.release()
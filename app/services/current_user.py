@@ -0,0 +1,110 @@
+"""
+Request-scoped loading of the authenticated User.
+
+The row is loaded into the request's session once (Session.get, so later
+`db.get(User, id)` calls in services hit the identity map instead of the DB).
+Optionally (CURRENT_USER_CACHE_TTL seconds, default 0 = off) a column snapshot
+is kept per user id and merged into the session without a query; entries
+carry the row's updated_at, writes through the profile/user services drop
+them, and the TTL bounds staleness across workers.
+
+get_current_user is the FastAPI dependency. Routes that only want the user
+preloaded into the session for their service (not the object itself) add
+PRELOAD_CURRENT_USER, which is empty while the snapshot cache is off: then
+preloading would just move the same SELECT earlier.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Depends, Request
+from sqlalchemy.orm import Session, lazyload, make_transient_to_detached
+
+from app.core.dependencies import get_current_user_id
+from app.db.models.user import User
+from app.services.async_service import service_dependency
+
+CURRENT_USER_CACHE_TTL = float(os.getenv("CURRENT_USER_CACHE_TTL", "0"))
+CURRENT_USER_CACHE_SIZE = 2048
+
+_cache: "OrderedDict[int, Tuple[Dict[str, Any], float]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_COLUMNS = tuple(c.key for c in User.__table__.columns)
+
+
+def forget_current_user(user_id: Optional[int]) -> None:
+    """Drop the cached snapshot after the user row changes."""
+    if user_id is None:
+        return
+    with _cache_lock:
+        _cache.pop(user_id, None)
+
+
+def _cached_snapshot(user_id: int) -> Optional[Dict[str, Any]]:
+    if CURRENT_USER_CACHE_TTL <= 0:
+        return None
+    with _cache_lock:
+        hit = _cache.get(user_id)
+        if hit is None:
+            return None
+        if hit[1] <= time.monotonic():
+            del _cache[user_id]
+            return None
+        _cache.move_to_end(user_id)
+        return hit[0]
+
+
+def _store_snapshot(user: User) -> None:
+    if CURRENT_USER_CACHE_TTL <= 0:
+        return
+    snapshot = {key: getattr(user, key) for key in _COLUMNS}
+    with _cache_lock:
+        current = _cache.get(user.id)
+        if current is not None and current[0].get("updated_at") == snapshot["updated_at"]:
+            return
+        _cache[user.id] = (snapshot, time.monotonic() + CURRENT_USER_CACHE_TTL)
+        _cache.move_to_end(user.id)
+        while len(_cache) > CURRENT_USER_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+class CurrentUserLoader:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load(self, user_id: int) -> Optional[User]:
+        snapshot = _cached_snapshot(user_id)
+        if snapshot is not None:
+            existing = self.db.identity_map.get(self.db.identity_key(User, user_id))
+            if existing is not None:
+                return existing
+            user = User(**snapshot)
+            make_transient_to_detached(user)
+            return self.db.merge(user, load=False)
+        user = self.db.get(User, user_id, options=[lazyload(User.projects)])
+        if user is not None:
+            _store_snapshot(user)
+        return user
+
+
+_get_current_user_loader = service_dependency(CurrentUserLoader)
+
+
+async def get_current_user(
+    request: Request,
+    current_user_id: int = Depends(get_current_user_id),
+    loader=Depends(_get_current_user_loader),
+):
+    """
+    The authenticated User, loaded once per request into the request's session
+    (the same one service_dependency services get), so `db.get(User, id)` in
+    those services is an identity-map hit. None if the row no longer exists.
+    """
+    if not hasattr(request.state, "current_user"):
+        request.state.current_user = await loader.load(current_user_id)
+    return request.state.current_user
+
+
+PRELOAD_CURRENT_USER: List[Any] = [Depends(get_current_user)] if CURRENT_USER_CACHE_TTL > 0 else []
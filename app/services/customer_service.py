@@ -3,7 +3,7 @@ import uuid as uuid_lib
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 
 from app.core.laravel_response import user_to_laravel_user_resource
 from app.db.models.customer import Customer
@@ -21,13 +21,16 @@ class CustomerService:
     def __init__(self, db: Session):
         self.db = db
 
+    def _user(self, user_id: int) -> Optional[User]:
+        # By primary key: reuses the instance get_current_user put in the session.
+        return self.db.get(User, user_id, options=[lazyload(User.projects)])
+
     def get_by_user(self, user_id: int) -> Optional[Dict[str, Any]]:
         try:
             c = self.db.query(Customer).filter(Customer.user_id == user_id).first()
             if not c:
                 return None
-            user = self.db.query(User).filter(User.id == c.user_id).first()
-            return _customer_resource(c, user)
+            return _customer_resource(c, self._user(c.user_id))
         except Exception:
             return None
 
@@ -35,15 +38,13 @@ class CustomerService:
         try:
             c = self.db.query(Customer).filter(Customer.user_id == user_id).first()
             if c:
-                user = self.db.query(User).filter(User.id == c.user_id).first()
-                return _customer_resource(c, user)
+                return _customer_resource(c, self._user(c.user_id))
             stripe_id = payload.get("stripe_id", "") if isinstance(payload, dict) else getattr(payload, "stripe_id", "")
             c = Customer(uuid=str(uuid_lib.uuid4()), user_id=user_id, stripe_id=stripe_id, created_at=datetime.utcnow(), updated_at=datetime.utcnow())
             self.db.add(c)
             self.db.commit()
             self.db.refresh(c)
-            user = self.db.query(User).filter(User.id == user_id).first()
-            return _customer_resource(c, user)
+            return _customer_resource(c, self._user(user_id))
         except Exception:
             return None
 
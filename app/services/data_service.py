@@ -1,11 +1,19 @@
-"""Data: editors, countries, states, cities, locations from DB."""
-from typing import Any, Dict, List
+"""
+Data: editors, countries, states, cities, locations. Countries/states/cities
+come from the cached location hierarchy (app.services.location_index).
+"""
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
 from app.core.laravel_response import user_to_laravel_user_resource
 from app.db.models.location import Location
 from app.db.models.user import User
+from app.services.geo_index import parse_geo_query, run_geo_query
+from app.services.location_index import get_location_index
+
+# Without a parent filter, /data/state and /data/city return this many names (as before).
+UNFILTERED_LIMIT = 200
 
 
 class DataService:
@@ -19,30 +27,82 @@ class DataService:
         except Exception:
             return []
 
+    def _param(self, payload: Any, *keys: str) -> Optional[str]:
+        if not isinstance(payload, dict):
+            return None
+        for key in keys:
+            value = payload.get(key)
+            if value not in (None, ""):
+                return str(value)
+        return None
+
     def countries(self, payload: Any = None) -> List[str]:
+        """All distinct countries, sorted."""
         try:
-            rows = self.db.query(Location.country).filter(Location.country.isnot(None)).distinct().limit(200).all()
-            return [r[0] for r in rows if r[0]]
+            return list(get_location_index(self.db).hierarchy.countries)
         except Exception:
             return []
 
     def states(self, payload: Any = None) -> List[str]:
+        """States (admin_name) of payload country (name, iso2 or iso3); first 200 overall without one."""
         try:
-            rows = self.db.query(Location.admin_name).filter(Location.admin_name.isnot(None)).distinct().limit(200).all()
-            return [r[0] for r in rows if r[0]]
+            hierarchy = get_location_index(self.db).hierarchy
+            country = self._param(payload, "country", "country_code")
+            if country is None:
+                return hierarchy.all_states[:UNFILTERED_LIMIT]
+            canonical = hierarchy.country(country)
+            return hierarchy.states(canonical) if canonical else []
         except Exception:
             return []
 
     def cities(self, payload: Any = None) -> List[str]:
+        """Cities of payload country and/or state (admin_name); first 200 overall without either."""
         try:
-            rows = self.db.query(Location.city).filter(Location.city.isnot(None)).distinct().limit(200).all()
-            return [r[0] for r in rows if r[0]]
+            hierarchy = get_location_index(self.db).hierarchy
+            country = self._param(payload, "country", "country_code")
+            state = self._param(payload, "state", "admin_name")
+            if country is None and state is None:
+                return hierarchy.all_cities[:UNFILTERED_LIMIT]
+            canonical = hierarchy.country(country) if country is not None else None
+            if country is not None and canonical is None:
+                return []
+            return hierarchy.cities(canonical, state)
         except Exception:
             return []
 
-    def locations(self, payload: Any = None) -> List[Dict]:
+    def locations(self, payload: Any = None) -> Dict[str, Any]:
+        """
+        First 100 locations, or with lat/lng (or location uuid) + radius/nearest in
+        the payload, locations nearest first with `distance` (km), total and page.
+        """
+        geo = parse_geo_query(payload if isinstance(payload, dict) else None)
+        if geo is None:
+            try:
+                items = self.db.query(Location).limit(100).all()
+                return {"locations": [{"uuid": loc.uuid, "city": loc.city, "city_ascii": loc.city_ascii, "country": loc.country} for loc in items]}
+            except Exception:
+                return {"locations": []}
         try:
-            items = self.db.query(Location).limit(100).all()
-            return [{"uuid": loc.uuid, "city": loc.city, "city_ascii": loc.city_ascii, "country": loc.country} for loc in items]
+            page = max(int(payload.get("page") or 1), 1)
+        except (TypeError, ValueError):
+            page = 1
+        per_page = 15
+        try:
+            index = get_location_index(self.db)
+            centre = (geo.lat, geo.lng)
+            if geo.lat is None or geo.lng is None:
+                centre = index.coordinates(geo.location)
+                if centre is None:
+                    return {"locations": [], "total": 0, "page": page}
+            rows, dist = run_geo_query(index.geo, geo, *centre)
+            start = (page - 1) * per_page
+            items = []
+            for i, d in zip(rows[start:start + per_page], dist[start:start + per_page]):
+                loc = index.row(int(i))
+                items.append({
+                    "uuid": loc.uuid, "city": loc.city, "city_ascii": loc.city_ascii, "country": loc.country,
+                    "distance": round(float(d), 2),
+                })
+            return {"locations": items, "total": int(len(rows)), "page": page}
         except Exception:
-            return []
+            return {"locations": [], "total": 0, "page": page}
@@ -1,11 +1,18 @@
 """Editor: get by uuid, projects, creators, jobtypes, reviews, related. Editor = User."""
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 
 from app.core.laravel_response import user_to_laravel_user_resource
+from app.core.pagination import paginate_counted
 from app.db.models.project import Project
 from app.db.models.user import User
+from app.services.creator_search import CreatorQuery, get_creator_search_index
+from app.services.geo_index import GeoQuery, get_creator_geo_index, run_geo_query
+from app.services.location_index import get_location_index
+from app.services.similar_creators import get_neighbour_table
+
+RELATED_LIMIT = 10
 
 
 def _project_resource(p: Project) -> Dict[str, Any]:
@@ -16,16 +23,50 @@ class EditorService:
     def __init__(self, db: Session):
         self.db = db
 
-    def list_editors(self, page: int = 1, per_page: int = 15) -> Dict[str, Any]:
-        """List editors (creators) with pagination. Laravel parity."""
+    def list_editors(self, page: int = 1, per_page: int = 15, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """List editors (creators) with pagination. Laravel parity, plus next_cursor."""
         try:
-            q = self.db.query(User).filter(User.active.is_(True))
-            total = q.count()
-            items = q.order_by(User.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
-            editors = [user_to_laravel_user_resource(u) for u in items]
-            return {"editors": editors, "total": total, "page": page}
+            q = self.db.query(User).options(lazyload(User.projects)).filter(User.active.is_(True))
+            result = paginate_counted(q, User, page=page, per_page=per_page, cursor=cursor)
+            editors = [user_to_laravel_user_resource(u) for u in result.items]
+            return {"editors": editors, "total": result.total, "page": page, "next_cursor": result.next_cursor}
         except Exception:
-            return {"editors": [], "total": 0, "page": page}
+            return {"editors": [], "total": 0, "page": page, "next_cursor": None}
+
+    def search_creators(self, query: CreatorQuery, page: int = 1, per_page: int = 15) -> Dict[str, Any]:
+        """Free text + facet filters over active creators, with facet counts (see creator_search)."""
+        ids, total, facets = get_creator_search_index(self.db).search(query, page=page, per_page=per_page)
+        users = {
+            u.id: u
+            for u in self.db.query(User).options(lazyload(User.projects)).filter(User.id.in_(ids)).all()
+        } if ids else {}
+        creators = [user_to_laravel_user_resource(users[i]) for i in ids if i in users]
+        return {"creators": creators, "total": total, "page": page, "facets": facets}
+
+    def search_nearby(self, query: GeoQuery, page: int = 1, per_page: int = 15) -> Dict[str, Any]:
+        """
+        Active creators around a point or a location (uuid), nearest first, each
+        with `distance` in km. Radius (default 50 km) or nearest-k, paged.
+        """
+        centre = (query.lat, query.lng)
+        if query.lat is None or query.lng is None:
+            centre = get_location_index(self.db).coordinates(query.location)
+            if centre is None:
+                return {"creators": [], "total": 0, "page": page}
+        ids, dist = run_geo_query(get_creator_geo_index(self.db), query, *centre)
+        start = (page - 1) * per_page
+        page_ids = [int(i) for i in ids[start:start + per_page]]
+        distances = dict(zip(page_ids, (round(float(d), 2) for d in dist[start:start + per_page])))
+        users = {
+            u.id: u
+            for u in self.db.query(User).options(lazyload(User.projects)).filter(User.id.in_(page_ids)).all()
+        } if page_ids else {}
+        creators = [
+            {**user_to_laravel_user_resource(users[i]), "distance": distances[i]}
+            for i in page_ids
+            if i in users
+        ]
+        return {"creators": creators, "total": int(len(ids)), "page": page}
 
     def get_editor(self, uuid: str) -> Optional[Dict[str, Any]]:
         user = self.db.query(User).filter(User.uuid == uuid).first()
@@ -64,10 +105,35 @@ class EditorService:
 
     def get_related(self, editor_uuid: str) -> List[Dict[str, Any]]:
         try:
-            user = self.db.query(User).filter(User.uuid == editor_uuid).first()
-            if not user:
-                return []
-            q = self.db.query(User).filter(User.id != user.id, User.active.is_(True)).limit(10)
-            return [user_to_laravel_user_resource(u) for u in q.all()]
+            user_id = self.db.query(User.id).filter(User.uuid == editor_uuid).scalar()
+            return self.get_similar(user_id) if user_id else []
+        except Exception:
+            return []
+
+    def get_similar(self, user_id: int, limit: int = RELATED_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Precomputed most-similar creators (see similar_creators), most similar
+        first. Until this host can read a table that has the user, falls back
+        to other active creators, as before the table existed.
+        """
+        try:
+            table = get_neighbour_table()
+            ids = table.get(user_id, limit) if table else []
+            if not ids:
+                q = (
+                    self.db.query(User)
+                    .options(lazyload(User.projects))
+                    .filter(User.id != user_id, User.active.is_(True))
+                    .limit(limit)
+                )
+                return [user_to_laravel_user_resource(u) for u in q.all()]
+            users = {
+                u.id: u
+                for u in self.db.query(User)
+                .options(lazyload(User.projects))
+                .filter(User.id.in_(ids), User.active.is_(True))
+                .all()
+            }
+            return [user_to_laravel_user_resource(users[i]) for i in ids if i in users]
         except Exception:
             return []
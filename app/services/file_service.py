@@ -7,7 +7,9 @@ from typing import Any, Dict, Optional
 from sqlalchemy.orm import Session
 
 from app.core.laravel_response import to_absolute_url
+from app.core.uploads import SpooledUpload, discard, extension, spool_bytes, upload_dir, upload_url
 from app.db.models.file import File
+from app.services.blob_store import discard_blob, put_blob
 
 
 def _file_resource(f: File) -> Dict[str, Any]:
@@ -18,21 +20,37 @@ class FileService:
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, user_id: int, filename: str, content: bytes = b"", path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    def create(
+        self,
+        user_id: int,
+        filename: str,
+        content: bytes = b"",
+        path: Optional[str] = None,
+        upload: Optional[SpooledUpload] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Record an upload, stored once per content hash (app.services.blob_store).
+        `upload` is a file already spooled to disk; `content` is spooled the
+        same way.
+        """
+        blob = None
         try:
-            upload_dir = os.environ.get("UPLOAD_DIR", "uploads")
-            os.makedirs(upload_dir, exist_ok=True)
-            ext = os.path.splitext(filename)[1] or ".bin"
-            safe_name = f"{uuid_lib.uuid4().hex}{ext}"
-            file_path = os.path.join(upload_dir, safe_name)
-            if content:
-                with open(file_path, "wb") as fp:
-                    fp.write(content)
-            url = path or f"/uploads/{safe_name}"
-            f = File(uuid=str(uuid_lib.uuid4()), user_id=user_id, path=file_path, filename=filename, url=url, created_at=datetime.utcnow(), updated_at=datetime.utcnow())
+            if upload is None and content:
+                upload = spool_bytes(content, filename)
+            sha256 = size = None
+            if upload is not None:
+                blob = put_blob(self.db, upload)
+                file_path, url, sha256, size = blob.path, path or blob.url, blob.sha256, blob.size
+            else:
+                safe_name = f"{uuid_lib.uuid4().hex}{extension(filename)}"
+                file_path, url = os.path.join(upload_dir(), safe_name), path or upload_url(safe_name)
+            f = File(uuid=str(uuid_lib.uuid4()), user_id=user_id, path=file_path, filename=filename, url=url, sha256=sha256, size=size, created_at=datetime.utcnow(), updated_at=datetime.utcnow())
             self.db.add(f)
             self.db.commit()
             self.db.refresh(f)
             return _file_resource(f)
         except Exception:
+            discard_blob(blob)
+            self.db.rollback()
+            discard(upload)
             return None
@@ -0,0 +1,289 @@
+"""
+Geo-proximity index (radius and nearest-k) over lat/lng points.
+
+Points live in NumPy arrays sorted by 1° grid cell, so a query only touches
+the cells overlapping its bounding box (a couple of np.searchsorted calls per
+latitude row); distances are one vectorized haversine over those candidates.
+Changes since the build are kept in a small overlay (upsert/remove) that is
+swapped atomically, so readers never see a half-applied update.
+
+Used for creators (users.latitude/longitude, refreshed incrementally from
+users.updated_at) and for locations (the LocationIndex snapshot).
+"""
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.db.models.user import User
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+HALF_CIRCUMFERENCE_KM = math.pi * EARTH_RADIUS_KM
+CELL_DEG = 1.0
+_LNG_CELLS = int(360 / CELL_DEG) + 1
+
+DEFAULT_RADIUS_KM = 50.0
+MAX_NEAREST = 500
+# Creators: full rebuild every GEO_INDEX_TTL seconds, changed rows pulled every GEO_REFRESH_SECONDS.
+GEO_INDEX_TTL = float(os.getenv("GEO_INDEX_TTL", "3600"))
+GEO_REFRESH_SECONDS = float(os.getenv("GEO_REFRESH_SECONDS", "30"))
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from (lat, lng) to each point."""
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _cell_rows(lats: np.ndarray) -> np.ndarray:
+    return np.clip(np.floor((lats + 90.0) / CELL_DEG), 0, 180 / CELL_DEG).astype(np.int64)
+
+
+def _cell_cols(lngs: np.ndarray) -> np.ndarray:
+    return np.clip(np.floor((lngs + 180.0) / CELL_DEG), 0, 360 / CELL_DEG).astype(np.int64)
+
+
+def _coerce(lats: Any, lngs: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    valid = np.isfinite(lats) & np.isfinite(lngs) & (np.abs(lats) <= 90) & (np.abs(lngs) <= 180)
+    return lats, lngs, valid
+
+
+def parse_coordinate(value: Any) -> Optional[float]:
+    """users.latitude/longitude are strings; None for blanks and junk."""
+    try:
+        out = float(value)
+    except (TypeError, ValueError):
+        return None
+    return out if math.isfinite(out) else None
+
+
+class GeoIndex:
+    def __init__(self, ids: Any, lats: Any, lngs: Any):
+        ids = np.asarray(ids, dtype=np.int64)
+        lats, lngs, valid = _coerce(lats, lngs)
+        ids, lats, lngs = ids[valid], lats[valid], lngs[valid]
+        keys = _cell_rows(lats) * _LNG_CELLS + _cell_cols(lngs)
+        order = np.argsort(keys, kind="stable")
+        self.ids, self.lats, self.lngs, self._keys = ids[order], lats[order], lngs[order], keys[order]
+        empty = np.empty(0, dtype=np.int64)
+        # (ids shadowed in the base arrays, overlay ids, overlay lats, overlay lngs)
+        self._overlay: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] = (
+            empty, empty, np.empty(0), np.empty(0),
+        )
+        self._changes: Dict[int, Optional[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        shadowed, d_ids, _, _ = self._overlay
+        hidden = int(np.isin(self.ids, shadowed).sum()) if len(shadowed) else 0
+        return len(self.ids) - hidden + len(d_ids)
+
+    def update(self, changes: Mapping[int, Optional[Tuple[float, float]]]) -> None:
+        """Apply {id: (lat, lng)} upserts and {id: None} removals on top of the base arrays."""
+        if not changes:
+            return
+        with self._lock:
+            merged = {**self._changes, **changes}
+            points = [(i, p[0], p[1]) for i, p in merged.items() if p is not None]
+            d_ids = np.array([p[0] for p in points], dtype=np.int64)
+            d_lats, d_lngs, valid = _coerce([p[1] for p in points], [p[2] for p in points])
+            self._changes = merged
+            self._overlay = (
+                np.fromiter(merged.keys(), dtype=np.int64, count=len(merged)),
+                d_ids[valid], d_lats[valid], d_lngs[valid],
+            )
+
+    def _candidates(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Base-array positions in the grid cells overlapping the query's bounding box."""
+        if radius_km >= HALF_CIRCUMFERENCE_KM / 2:
+            return np.arange(len(self.ids))
+        dlat = radius_km / KM_PER_DEGREE
+        lat_lo, lat_hi = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+        widest = max(abs(lat_lo), abs(lat_hi))
+        cos_lat = math.cos(math.radians(widest)) if widest < 90.0 else 0.0
+        dlng = 180.0 if cos_lat < 1e-9 else radius_km / (KM_PER_DEGREE * cos_lat)
+        if dlng >= 180.0:
+            col_ranges = [(0, _LNG_CELLS - 1)]
+        else:
+            lo, hi = lng - dlng, lng + dlng
+            col_ranges = []
+            if lo < -180.0:
+                col_ranges.append((int(_cell_cols(np.array(lo + 360.0))), _LNG_CELLS - 1))
+                lo = -180.0
+            if hi > 180.0:
+                col_ranges.append((0, int(_cell_cols(np.array(hi - 360.0)))))
+                hi = 180.0
+            col_ranges.append((int(_cell_cols(np.array(lo))), int(_cell_cols(np.array(hi)))))
+        rows = range(int(_cell_rows(np.array(lat_lo))), int(_cell_rows(np.array(lat_hi))) + 1)
+        bounds = np.array(
+            [(r * _LNG_CELLS + c0, r * _LNG_CELLS + c1 + 1) for r in rows for c0, c1 in col_ranges],
+            dtype=np.int64,
+        )
+        starts = np.searchsorted(self._keys, bounds[:, 0], side="left")
+        stops = np.searchsorted(self._keys, bounds[:, 1], side="left")
+        spans = [np.arange(a, b) for a, b in zip(starts, stops) if b > a]
+        return np.concatenate(spans) if spans else np.empty(0, dtype=np.int64)
+
+    def within(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, distances_km) of points within radius_km, nearest first (ties by id)."""
+        shadowed, d_ids, d_lats, d_lngs = self._overlay
+        pos = self._candidates(lat, lng, radius_km)
+        ids = self.ids[pos]
+        lats, lngs = self.lats[pos], self.lngs[pos]
+        if len(shadowed):
+            keep = ~np.isin(ids, shadowed)
+            ids, lats, lngs = ids[keep], lats[keep], lngs[keep]
+        if len(d_ids):
+            ids = np.concatenate([ids, d_ids])
+            lats = np.concatenate([lats, d_lats])
+            lngs = np.concatenate([lngs, d_lngs])
+        dist = haversine_km(lat, lng, lats, lngs)
+        hit = dist <= radius_km
+        ids, dist = ids[hit], dist[hit]
+        order = np.lexsort((ids, dist))
+        return ids[order], dist[order]
+
+    def nearest(
+        self, lat: float, lng: float, k: int, max_radius_km: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """The k nearest points (optionally within max_radius_km), nearest first."""
+        limit = HALF_CIRCUMFERENCE_KM if max_radius_km is None else min(max(max_radius_km, 0.0), HALF_CIRCUMFERENCE_KM)
+        radius = min(25.0, limit)
+        while True:
+            ids, dist = self.within(lat, lng, radius)
+            # Every point within `radius` is found, so once k are in hand they are the k nearest.
+            if len(ids) >= k or radius >= limit:
+                return ids[:k], dist[:k]
+            radius = min(radius * 4, limit)
+
+
+class GeoQuery(NamedTuple):
+    lat: Optional[float]
+    lng: Optional[float]
+    location: Optional[str]  # locations.uuid to search around
+    radius_km: Optional[float]
+    nearest: Optional[int]
+
+
+def parse_geo_query(params: Optional[Mapping[str, Any]]) -> Optional[GeoQuery]:
+    """
+    Read lat/lng (or latitude/longitude) or location (uuid), radius (km) and
+    nearest (k) from query params or a JSON body. None if no centre was given.
+    """
+    if not params:
+        return None
+    lat = parse_coordinate(params.get("lat", params.get("latitude")))
+    lng = parse_coordinate(params.get("lng", params.get("longitude")))
+    location = params.get("location") or None
+    if (lat is None or lng is None) and not location:
+        return None
+    radius = parse_coordinate(params.get("radius"))
+    if radius is not None:
+        radius = min(max(radius, 0.0), HALF_CIRCUMFERENCE_KM)
+    nearest = None
+    if params.get("nearest") not in (None, ""):
+        try:
+            nearest = min(max(int(params.get("nearest")), 1), MAX_NEAREST)
+        except (TypeError, ValueError):
+            nearest = None
+    return GeoQuery(lat, lng, str(location) if location else None, radius, nearest)
+
+
+def run_geo_query(index: GeoIndex, query: GeoQuery, lat: float, lng: float) -> Tuple[np.ndarray, np.ndarray]:
+    """nearest-k (capped by radius if one was given), else everything within radius (default 50 km)."""
+    if query.nearest:
+        return index.nearest(lat, lng, query.nearest, max_radius_km=query.radius_km)
+    return index.within(lat, lng, DEFAULT_RADIUS_KM if query.radius_km is None else query.radius_km)
+
+
+# --- Creators (active users with coordinates) ---
+
+_creators: Optional[GeoIndex] = None
+_built_at = 0.0
+_checked_at = 0.0
+_synced_until: Optional[datetime] = None
+_creators_lock = threading.Lock()
+
+
+def _creator_point(active: Any, latitude: Any, longitude: Any) -> Optional[Tuple[float, float]]:
+    lat, lng = parse_coordinate(latitude), parse_coordinate(longitude)
+    if not active or lat is None or lng is None:
+        return None
+    return lat, lng
+
+
+def _build_creators(db: Session) -> None:
+    global _creators, _built_at, _checked_at, _synced_until
+    rows = (
+        db.query(User.id, User.latitude, User.longitude, User.updated_at)
+        .filter(User.active.is_(True), User.latitude.isnot(None), User.longitude.isnot(None))
+        .all()
+    )
+    ids, lats, lngs = [], [], []
+    for uid, latitude, longitude, _ in rows:
+        point = _creator_point(True, latitude, longitude)
+        if point is not None:
+            ids.append(uid)
+            lats.append(point[0])
+            lngs.append(point[1])
+    _synced_until = db.query(User.updated_at).order_by(User.updated_at.desc()).limit(1).scalar()
+    _creators = GeoIndex(ids, lats, lngs)
+    _built_at = _checked_at = time.monotonic()
+
+
+def _refresh_creators(db: Session) -> None:
+    global _checked_at, _synced_until
+    q = db.query(User.id, User.active, User.latitude, User.longitude, User.updated_at)
+    if _synced_until is not None:
+        # >= : rows written in the same second as the last sync are re-read, not missed.
+        q = q.filter(User.updated_at >= _synced_until)
+    else:
+        q = q.filter(User.updated_at.isnot(None))
+    changes: Dict[int, Optional[Tuple[float, float]]] = {}
+    newest = _synced_until
+    for uid, active, latitude, longitude, updated_at in q.all():
+        changes[uid] = _creator_point(active, latitude, longitude)
+        if updated_at is not None and (newest is None or updated_at > newest):
+            newest = updated_at
+    _creators.update(changes)
+    _synced_until = newest
+    _checked_at = time.monotonic()
+
+
+def get_creator_geo_index(db: Session) -> GeoIndex:
+    """Creator index: rebuilt after GEO_INDEX_TTL, topped up from users.updated_at every GEO_REFRESH_SECONDS."""
+    global _checked_at
+    index = _creators
+    now = time.monotonic()
+    if index is not None and now - _checked_at < GEO_REFRESH_SECONDS and now - _built_at < GEO_INDEX_TTL:
+        return index
+    if not _creators_lock.acquire(blocking=index is None):
+        return index
+    try:
+        now = time.monotonic()
+        try:
+            if _creators is None or now - _built_at >= GEO_INDEX_TTL:
+                _build_creators(db)
+            elif now - _checked_at >= GEO_REFRESH_SECONDS:
+                _refresh_creators(db)
+        except Exception:
+            if _creators is None:
+                raise
+            logger.exception("Creator geo index refresh failed; serving the previous snapshot")
+            _checked_at = time.monotonic()
+        return _creators
+    finally:
+        _creators_lock.release()
@@ -0,0 +1,296 @@
+"""
+In-memory search index over `locations` for the /location autocomplete.
+
+A snapshot of the live rows is stored column-wise (array('i'/'q'/'d') for
+numbers, plain lists for strings) in population order, so row number == rank
+and every result list sorted by row number is already ranked by population.
+
+- Prefix: bisect over the sorted, normalized city_ascii keys (and, for
+  needles too short for a trigram, the country and admin_name keys).
+- Infix: trigram postings (ascending row numbers) over city_ascii and country,
+  intersected smallest-first and verified with a substring check, matching
+  the old `city_ascii ILIKE '%x%' OR country ILIKE '%x%'` filter.
+- Proximity: `geo`, a GeoIndex over the lat/lng columns.
+
+Built lazily on first use and rebuilt after LOCATION_INDEX_TTL seconds
+(default 3600); while a rebuild runs other requests keep using the old one.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.db.models.location import Location
+from app.services.geo_index import GeoIndex
+
+logger = logging.getLogger(__name__)
+
+LOCATION_INDEX_TTL = float(os.getenv("LOCATION_INDEX_TTL", "3600"))
+NGRAM = 3
+
+
+class LocationRow(NamedTuple):
+    uuid: Optional[str]
+    city: Optional[str]
+    city_ascii: Optional[str]
+    country: Optional[str]
+    admin_name: Optional[str]
+    iso2: Optional[str]
+    iso3: Optional[str]
+    population: int
+    lat: Optional[float]
+    lng: Optional[float]
+
+
+def normalize(text: Any) -> str:
+    """Casefold, strip accents and collapse whitespace."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.casefold().split())
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def _population(value: Any) -> int:
+    # Laravel stores population as a string ("1234", "1234.0", "").
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _coord(value: Any) -> float:
+    return float(value) if value is not None else float("nan")
+
+
+def _text(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+def _prefix_table(keys: List[str]) -> Tuple[List[str], array]:
+    """Non-empty keys sorted, and the row number of each."""
+    keyed = sorted((key, i) for i, key in enumerate(keys) if key)
+    return [key for key, _ in keyed], array("i", (i for _, i in keyed))
+
+
+class LocationIndex:
+    def __init__(self, rows: Iterable[Any]):
+        rows = sorted(rows, key=lambda r: (-_population(r.population), r.id))
+        self.size = len(rows)
+        self.version = time.time()
+        self.ids = array("i", (r.id for r in rows))
+        self.uuids: List[Optional[str]] = [r.uuid for r in rows]
+        self.cities: List[Optional[str]] = [r.city for r in rows]
+        self.city_ascii: List[Optional[str]] = [r.city_ascii for r in rows]
+        # Countries/regions repeat heavily; interning keeps one copy of each.
+        self.countries: List[Optional[str]] = [_text(r.country) for r in rows]
+        self.admin_names: List[Optional[str]] = [_text(r.admin_name) for r in rows]
+        self.iso2: List[Optional[str]] = [_text(r.iso2) for r in rows]
+        self.iso3: List[Optional[str]] = [_text(r.iso3) for r in rows]
+        self.population = array("q", (_population(r.population) for r in rows))
+        self.lat = array("d", (_coord(r.lat) for r in rows))
+        self.lng = array("d", (_coord(r.lng) for r in rows))
+
+        self._city_norm = [normalize(c) for c in self.city_ascii]
+        country_norm: Dict[Optional[str], str] = {c: sys.intern(normalize(c)) for c in set(self.countries)}
+        self._country_norm = [country_norm[c] for c in self.countries]
+        state_norm: Dict[Optional[str], str] = {s: sys.intern(normalize(s)) for s in set(self.admin_names)}
+
+        self._city_prefix = _prefix_table(self._city_norm)
+        self._country_prefix = _prefix_table(self._country_norm)
+        self._state_prefix = _prefix_table([state_norm[s] for s in self.admin_names])
+
+        country_grams = {key: _ngrams(key) for key in set(self._country_norm)}
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for i, key in enumerate(self._city_norm):
+            for gram in _ngrams(key) | country_grams[self._country_norm[i]]:
+                postings[gram].append(i)
+        self._postings = {gram: array("i", ids) for gram, ids in postings.items()}
+
+    @cached_property
+    def hierarchy(self) -> "LocationHierarchy":
+        """Country -> admin_name -> city lists for this snapshot (built on first use)."""
+        return LocationHierarchy(self)
+
+    @cached_property
+    def geo(self) -> GeoIndex:
+        """Proximity index over this snapshot (built on first use); ids are row numbers."""
+        return GeoIndex(np.arange(self.size), np.frombuffer(self.lat), np.frombuffer(self.lng))
+
+    @cached_property
+    def _positions(self) -> Dict[str, int]:
+        return {u: i for i, u in enumerate(self.uuids) if u}
+
+    def position(self, uuid: Optional[str]) -> Optional[int]:
+        """Row number of the location with this uuid."""
+        return self._positions.get(uuid) if uuid else None
+
+    def coordinates(self, uuid: Optional[str]) -> Optional[Tuple[float, float]]:
+        """(lat, lng) of the location with this uuid, if it has them."""
+        pos = self.position(uuid)
+        if pos is None:
+            return None
+        lat, lng = self.lat[pos], self.lng[pos]
+        return None if lat != lat or lng != lng else (lat, lng)
+
+    def row(self, i: int) -> LocationRow:
+        lat, lng = self.lat[i], self.lng[i]
+        return LocationRow(
+            self.uuids[i], self.cities[i], self.city_ascii[i], self.countries[i], self.admin_names[i],
+            self.iso2[i], self.iso3[i], self.population[i], None if lat != lat else lat, None if lng != lng else lng,
+        )
+
+    @staticmethod
+    def _prefix(table: Tuple[List[str], array], needle: str) -> List[int]:
+        keys, rows = table
+        lo = bisect_left(keys, needle)
+        hi = bisect_left(keys, needle + "\U0010ffff", lo)
+        return sorted(rows[lo:hi])
+
+    def _infix(self, needle: str) -> List[int]:
+        lists = [self._postings.get(gram) for gram in _ngrams(needle)]
+        if not lists or any(p is None for p in lists):
+            return []
+        lists.sort(key=len)
+        candidates: Iterable[int] = lists[0]
+        if len(lists) > 1:
+            second = set(lists[1])
+            candidates = (i for i in candidates if i in second)
+        city, country = self._city_norm, self._country_norm
+        return [i for i in candidates if needle in city[i] or needle in country[i]]
+
+    def search(self, query: Optional[str], offset: int = 0, limit: int = 15) -> Tuple[List[int], int]:
+        """
+        Return (row numbers for the page, total matches). City-name prefix matches
+        come first, then the other matches; each group is ordered by population.
+        Needles of 3+ characters also match anywhere in the city or country name;
+        shorter ones also match the start of the country or state name.
+        An empty query lists every row.
+        """
+        needle = normalize(query)
+        if not needle:
+            return list(range(offset, min(offset + limit, self.size))), self.size
+        ranked = self._prefix(self._city_prefix, needle)
+        seen = set(ranked)
+        if len(needle) >= NGRAM:
+            others: Iterable[int] = self._infix(needle)
+        else:
+            # No trigram to look up; prefixes of the region names stand in for the infix match.
+            others = sorted(set(self._prefix(self._country_prefix, needle)) | set(self._prefix(self._state_prefix, needle)))
+        ranked.extend(i for i in others if i not in seen)
+        return ranked[offset:offset + limit], len(ranked)
+
+
+class LocationHierarchy:
+    """
+    Distinct countries, states (admin_name) per country and cities per state,
+    each pre-sorted, so a lookup by parent is a dict hit plus a list copy.
+    A country can be named by its name, iso2 or iso3 (any case, accents ignored).
+    `version` is the snapshot's build stamp; a new snapshot gets a new hierarchy.
+    """
+
+    def __init__(self, index: LocationIndex):
+        self.version = index.version
+        states: Dict[str, Set[str]] = defaultdict(set)
+        cities: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        country_cities: Dict[str, Set[str]] = defaultdict(set)
+        self._country_keys: Dict[str, str] = {}
+        state_countries: Dict[str, Set[str]] = defaultdict(set)
+        for i in range(index.size):
+            country, state, city = index.countries[i], index.admin_names[i], index.cities[i]
+            if not country:
+                continue
+            for alias in (country, index.iso2[i], index.iso3[i]):
+                if alias:
+                    self._country_keys.setdefault(normalize(alias), country)
+            if state:
+                states[country].add(state)
+                state_countries[normalize(state)].add(country)
+            if city:
+                country_cities[country].add(city)
+                if state:
+                    cities[(country, state)].add(city)
+        self.countries: List[str] = sorted({c for c in self._country_keys.values()})
+        self._states = {c: sorted(v) for c, v in states.items()}
+        self._cities = {(c, normalize(st)): sorted(v) for (c, st), v in cities.items()}
+        self._country_cities = {c: sorted(v) for c, v in country_cities.items()}
+        self._state_countries = {st: sorted(v) for st, v in state_countries.items()}
+        self.all_states: List[str] = sorted({s for v in states.values() for s in v})
+        self.all_cities: List[str] = sorted({c for v in country_cities.values() for c in v})
+
+    def country(self, name: Optional[str]) -> Optional[str]:
+        """Canonical country name for a name / iso2 / iso3."""
+        return self._country_keys.get(normalize(name)) if name else None
+
+    def states(self, country: str) -> List[str]:
+        return list(self._states.get(country, ()))
+
+    def cities(self, country: Optional[str] = None, state: Optional[str] = None) -> List[str]:
+        if state:
+            key = normalize(state)
+            countries = [country] if country else self._state_countries.get(key, [])
+            if len(countries) == 1:
+                return list(self._cities.get((countries[0], key), ()))
+            return sorted({c for co in countries for c in self._cities.get((co, key), ())})
+        return list(self._country_cities.get(country, ())) if country else list(self.all_cities)
+
+
+def build_location_index(db: Session) -> LocationIndex:
+    rows = (
+        db.query(
+            Location.id, Location.uuid, Location.city, Location.city_ascii, Location.country,
+            Location.admin_name, Location.iso2, Location.iso3, Location.population, Location.lat, Location.lng,
+        )
+        .filter(Location.deleted_at.is_(None))
+        .all()
+    )
+    return LocationIndex(rows)
+
+
+_index: Optional[LocationIndex] = None
+_built_at = 0.0
+_lock = threading.Lock()
+
+
+def get_location_index(db: Session) -> LocationIndex:
+    """Current index, building (first call) or refreshing (after the TTL) it with db."""
+    global _index, _built_at
+    index = _index
+    if index is not None and time.monotonic() - _built_at < LOCATION_INDEX_TTL:
+        return index
+    # With an index in hand, don't queue behind a rebuild another request is doing.
+    if not _lock.acquire(blocking=index is None):
+        return index
+    try:
+        if _index is None or time.monotonic() - _built_at >= LOCATION_INDEX_TTL:
+            try:
+                _index = build_location_index(db)
+                _built_at = time.monotonic()
+            except Exception:
+                if _index is None:
+                    raise
+                logger.exception("Location index rebuild failed; serving the previous snapshot")
+                _built_at = time.monotonic()
+        return _index
+    finally:
+        _lock.release()
+
+
+def invalidate_location_index() -> None:
+    """Force a rebuild on next use (the current snapshot is served until then)."""
+    global _built_at
+    _built_at = 0.0
@@ -0,0 +1,179 @@
+"""
+Lookup collections (skills, platforms, softwares, ...). Each method returns the
+Laravel payload: status, message, and the collection key (same keys/casing as
+Laravel). Served through app.core.lookup_cache by the lookups router.
+"""
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.laravel_response import (
+    lookup_to_laravel_resource,
+    project_type_to_laravel_resource,
+    reason_to_laravel_resource,
+    referral_to_laravel_resource,
+    skill_to_laravel_skill_resource,
+)
+from app.db.models.content_form import ContentForm
+from app.db.models.content_vertical import ContentVertical
+from app.db.models.creative_style import CreativeStyle
+from app.db.models.equipment import Equipment
+from app.db.models.job_type import JobType
+from app.db.models.platform import Platform
+from app.db.models.project_type import ProjectType
+from app.db.models.reason import Reason
+from app.db.models.referral import Referral
+from app.db.models.skill import Skill
+from app.db.models.software import Software
+
+
+def _success_with_collection(message: str, key: str, items: list) -> Dict[str, Any]:
+    """Laravel shape: status, message, <key>: [...]"""
+    return {"status": "success", "message": message, key: items}
+
+
+class LookupService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def skills(self) -> Dict[str, Any]:
+        rows = (
+            self.db.query(Skill)
+            .filter(Skill.active == 1, Skill.hide_from_customers == 0)
+            .order_by(Skill.name.asc())
+            .all()
+        )
+        return _success_with_collection(
+            "Skills Loaded Successfully",
+            "skills",
+            [skill_to_laravel_skill_resource(s) for s in rows],
+        )
+
+    def content_verticals(self) -> Dict[str, Any]:
+        rows = (
+            self.db.query(ContentVertical)
+            .filter(ContentVertical.active == 1)
+            .order_by(ContentVertical.name.asc())
+            .all()
+        )
+        return _success_with_collection(
+            "Content Verticals Loaded Successfully",
+            "content_verticals",
+            [lookup_to_laravel_resource(r) for r in rows],
+        )
+
+    def platforms(self) -> Dict[str, Any]:
+        rows = (
+            self.db.query(Platform)
+            .filter(Platform.active == 1, Platform.hide_from_customers == 0)
+            .order_by(Platform.name.asc())
+            .all()
+        )
+        return _success_with_collection(
+            "Platforms Loaded Successfully",
+            "platforms",
+            [lookup_to_laravel_resource(r) for r in rows],
+        )
+
+    def softwares(self) -> Dict[str, Any]:
+        rows = self.db.query(Software).filter(Software.active == 1).order_by(Software.name.asc()).all()
+        return _success_with_collection(
+            "Software Loaded Successfully",
+            "softwares",
+            [lookup_to_laravel_resource(r) for r in rows],
+        )
+
+    def equipments(self) -> Dict[str, Any]:
+        rows = (
+            self.db.query(Equipment)
+            .filter(Equipment.active == 1)
+            .order_by(Equipment.name.asc())
+            .all()
+        )
+        return _success_with_collection(
+            "Equipment Loaded Successfully",
+            "equipments",
+            [lookup_to_laravel_resource(r) for r in rows],
+        )
+
+    def creative_styles(self) -> Dict[str, Any]:
+        rows = (
+            self.db.query(CreativeStyle)
+            .filter(CreativeStyle.active == 1, CreativeStyle.hide_from_customers == 0)
+            .order_by(CreativeStyle.name.asc())
+            .all()
+        )
+        return _success_with_collection(
+            "Creative Styles Loaded Successfully",
+            "creative_styles",
+            [lookup_to_laravel_resource(r) for r in rows],
+        )
+
+    def content_forms(self) -> Dict[str, Any]:
+        rows = (
+            self.db.query(ContentForm)
+            .filter(ContentForm.active == 1)
+            .order_by(ContentForm.name.asc())
+            .all()
+        )
+        return _success_with_collection(
+            "Content Forms Loaded Successfully",
+            "content_forms",
+            [lookup_to_laravel_resource(r) for r in rows],
+        )
+
+    def project_types(self) -> Dict[str, Any]:
+        rows = (
+            self.db.query(ProjectType)
+            .filter(ProjectType.active == 1)
+            .order_by(ProjectType.name.asc())
+            .all()
+        )
+        # ProjectTypeResource has count; we don't have user context here, use 0
+        return _success_with_collection(
+            "Project Types Loaded Successfully",
+            "project_types",
+            [{**project_type_to_laravel_resource(r), "count": getattr(r, "count", 0)} for r in rows],
+        )
+
+    def job_types(self) -> Dict[str, Any]:
+        rows = (
+            self.db.query(JobType)
+            .filter(JobType.active == 1, JobType.hide_from_customers == 0)
+            .order_by(JobType.name.asc())
+            .all()
+        )
+        return _success_with_collection(
+            "Job Types Loaded Successfully",
+            "jobTypes",
+            [lookup_to_laravel_resource(r) for r in rows],
+        )
+
+    def reasons(self, tag: Optional[str] = None) -> Dict[str, Any]:
+        """Laravel requires tag; without it return empty."""
+        if not tag:
+            return _success_with_collection("Reasons Loaded Successfully", "reasons", [])
+        rows = (
+            self.db.query(Reason)
+            .filter(Reason.active == 1, Reason.tags.ilike(f"%{tag}%"))
+            .order_by(Reason.name.asc())
+            .all()
+        )
+        return _success_with_collection(
+            "Reasons Loaded Successfully",
+            "reasons",
+            [reason_to_laravel_resource(r) for r in rows],
+        )
+
+    def referrals(self) -> Dict[str, Any]:
+        rows = (
+            self.db.query(Referral)
+            .filter(Referral.active == 1, Referral.deleted_at.is_(None))
+            .order_by(Referral.name.asc())
+            .all()
+        )
+        return _success_with_collection(
+            "Referrals Loaded Successfully",
+            "referrals",
+            [referral_to_laravel_resource(r) for r in rows],
+        )
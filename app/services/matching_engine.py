@@ -0,0 +1,370 @@
+"""
+Creator ranking for POST /matching/creators.
+
+Every active creator is a row of a boolean feature matrix (one column per
+skill / job type / content vertical / platform / software / creative style
+id, via the Laravel pivot tables) plus utc-offset and country columns. A
+project's requirements become a weight vector over the matrix columns, so
+scoring all creators is one gather + mat-vec (`X[:, cols] @ w`) and the top-k
+comes from np.argpartition.
+
+The matrix lives per process. It is rebuilt every MATCHING_INDEX_TTL seconds;
+in between, users whose updated_at moved (polled every
+MATCHING_REFRESH_SECONDS) or who were passed to mark_creators_dirty() get
+their rows re-read in place. Lookup ids created after a build only count
+once the next full rebuild adds their columns.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import Table
+from sqlalchemy.orm import Session
+
+from app.db.models import pivots
+from app.db.models.content_vertical import ContentVertical
+from app.db.models.creative_style import CreativeStyle
+from app.db.models.job_type import JobType
+from app.db.models.platform import Platform
+from app.db.models.skill import Skill
+from app.db.models.software import Software
+from app.db.models.user import User
+from app.services.location_index import normalize
+
+logger = logging.getLogger(__name__)
+
+MATCHING_INDEX_TTL = float(os.getenv("MATCHING_INDEX_TTL", "3600"))
+MATCHING_REFRESH_SECONDS = float(os.getenv("MATCHING_REFRESH_SECONDS", "60"))
+DEFAULT_TOP_K = 20
+MAX_TOP_K = 100
+
+
+class Facet(NamedTuple):
+    name: str
+    lookup: Any  # lookup model (Skill, JobType, ...)
+    user_pivot: Table
+    project_pivot: Table
+    fk: str
+    weight: float
+
+
+FACETS: Tuple[Facet, ...] = (
+    Facet("skills", Skill, pivots.user_skills, pivots.project_skills, "skill_id", 3.0),
+    Facet("job_types", JobType, pivots.user_job_types, pivots.project_job_types, "job_type_id", 3.0),
+    Facet("content_verticals", ContentVertical, pivots.user_content_verticals, pivots.project_content_verticals, "content_vertical_id", 2.0),
+    Facet("platforms", Platform, pivots.user_platforms, pivots.project_platforms, "platform_id", 1.5),
+    Facet("softwares", Software, pivots.user_software, pivots.project_software, "software_id", 1.5),
+    Facet("creative_styles", CreativeStyle, pivots.user_creative_styles, pivots.project_creative_styles, "creative_style_id", 1.0),
+)
+TIMEZONE_WEIGHT = 1.0
+LOCATION_WEIGHT = 1.0
+
+_OFFSET_RE = re.compile(r"([+-])?\s*(\d{1,2})(?:[:.](\d{1,2}))?")
+
+
+def parse_utc_offset(value: Any) -> Optional[float]:
+    """'+05:30', '-8', 'UTC+2', '5.5' -> hours; None if unparseable."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if -14 <= value <= 14 else None
+    text = str(value).strip().upper().replace("UTC", "").replace("GMT", "")
+    if "." in text and ":" not in text:
+        try:
+            hours = float(text)
+            return hours if -14 <= hours <= 14 else None
+        except ValueError:
+            return None
+    m = _OFFSET_RE.fullmatch(text.strip()) if text.strip() else None
+    if not m:
+        return None
+    hours = int(m.group(2)) + int(m.group(3) or 0) / 60.0
+    hours = -hours if m.group(1) == "-" else hours
+    return hours if -14 <= hours <= 14 else None
+
+
+class Requirements(NamedTuple):
+    facets: Dict[str, List[int]]  # facet name -> lookup ids
+    utc_offset: Optional[float]
+    country: Optional[str]
+    exclude_user_ids: Tuple[int, ...] = ()
+
+
+class Match(NamedTuple):
+    user_id: int
+    score: float
+
+
+class CreatorMatrix:
+    def __init__(self, vocab: Dict[str, np.ndarray]):
+        # Columns: each facet's lookup ids (sorted) occupy a contiguous block.
+        self.vocab = vocab
+        self.offsets: Dict[str, int] = {}
+        width = 0
+        for facet in FACETS:
+            self.offsets[facet.name] = width
+            width += len(vocab[facet.name])
+        self.width = width
+        self.size = 0
+        self.row_of: Dict[int, int] = {}
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self.features = np.zeros((0, width), dtype=bool, order="F")
+        self.utc = np.empty(0, dtype=np.float32)
+        self.country = np.empty(0, dtype=np.int32)
+        self.active = np.empty(0, dtype=bool)
+        self.country_codes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def columns(self, facet: str, lookup_ids: Iterable[int]) -> np.ndarray:
+        """Matrix columns for known lookup ids of facet (unknown ids are dropped)."""
+        vocab = self.vocab[facet]
+        ids = np.asarray(list(lookup_ids), dtype=np.int64)
+        if not len(ids) or not len(vocab):
+            return np.empty(0, dtype=np.int64)
+        pos = np.clip(np.searchsorted(vocab, ids), 0, len(vocab) - 1)
+        return (pos[vocab[pos] == ids] + self.offsets[facet]).astype(np.int64)
+
+    def country_code(self, country: Optional[str], create: bool = False) -> int:
+        key = normalize(country)
+        if not key:
+            return -1
+        code = self.country_codes.get(key)
+        if code is None and create:
+            code = self.country_codes[key] = len(self.country_codes)
+        return -1 if code is None else code
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows <= len(self.user_ids):
+            return
+        cap = max(rows, 2 * len(self.user_ids), 64)
+
+        def grow(arr: np.ndarray, fill: Any) -> np.ndarray:
+            out = np.full((cap,) + arr.shape[1:], fill, dtype=arr.dtype, order="F")
+            out[: len(arr)] = arr
+            return out
+
+        self.user_ids = grow(self.user_ids, 0)
+        self.features = grow(self.features, False)
+        self.utc = grow(self.utc, np.nan)
+        self.country = grow(self.country, -1)
+        self.active = grow(self.active, False)
+
+    def load(self, users: List[Tuple[int, Any, Any, Any]], pairs: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> None:
+        """
+        Write (user_id, active, utc_offset, country) rows plus their pivot pairs
+        {facet: (user_ids, lookup_ids)}; existing rows are replaced in place.
+        """
+        with self._lock:
+            new = [u[0] for u in users if u[0] not in self.row_of]
+            self._ensure_capacity(self.size + len(new))
+            for uid in new:
+                self.row_of[uid] = self.size
+                self.user_ids[self.size] = uid
+                self.size += 1
+            rows = np.array([self.row_of[u[0]] for u in users], dtype=np.int64)
+            if not len(rows):
+                return
+            self.features[rows, :] = False
+            self.active[rows] = [bool(u[1]) for u in users]
+            self.utc[rows] = [np.nan if (o := parse_utc_offset(u[2])) is None else o for u in users]
+            self.country[rows] = [self.country_code(u[3], create=True) for u in users]
+            order = np.argsort(self.user_ids[: self.size], kind="stable")
+            sorted_ids = self.user_ids[: self.size][order]
+            for facet in FACETS:
+                user_ids, lookup_ids = pairs.get(facet.name, (np.empty(0), np.empty(0)))
+                if not len(user_ids):
+                    continue
+                vocab = self.vocab[facet.name]
+                pos = np.clip(np.searchsorted(vocab, lookup_ids), 0, max(len(vocab) - 1, 0))
+                known = (vocab[pos] == lookup_ids) if len(vocab) else np.zeros(len(lookup_ids), dtype=bool)
+                upos = np.clip(np.searchsorted(sorted_ids, user_ids), 0, self.size - 1)
+                known &= sorted_ids[upos] == user_ids
+                self.features[order[upos[known]], pos[known] + self.offsets[facet.name]] = True
+
+    def top(self, req: Requirements, k: int) -> List[Match]:
+        """Best k active creators for req (score > 0), best first; score is 0..1."""
+        n = self.size
+        if not n:
+            return []
+        score = np.zeros(n, dtype=np.float32)
+        total = 0.0
+        cols: List[np.ndarray] = []
+        weights: List[np.ndarray] = []
+        for facet in FACETS:
+            c = self.columns(facet.name, req.facets.get(facet.name, ()))
+            if len(c):
+                cols.append(c)
+                weights.append(np.full(len(c), facet.weight / len(c), dtype=np.float32))
+                total += facet.weight
+        if cols:
+            all_cols = np.concatenate(cols)
+            score += self.features[:n, all_cols].astype(np.float32) @ np.concatenate(weights)
+        if req.utc_offset is not None:
+            gap = np.abs(self.utc[:n] - np.float32(req.utc_offset))
+            gap = np.minimum(gap, 24 - gap)
+            score += TIMEZONE_WEIGHT * np.nan_to_num(1 - np.minimum(gap, 12) / 12, nan=0.0)
+            total += TIMEZONE_WEIGHT
+        code = self.country_code(req.country)
+        if req.country:
+            if code >= 0:
+                score += LOCATION_WEIGHT * (self.country[:n] == code)
+            total += LOCATION_WEIGHT
+        if total <= 0:
+            return []
+        score /= total
+        score[~self.active[:n]] = -1
+        for uid in req.exclude_user_ids:
+            row = self.row_of.get(uid)
+            if row is not None:
+                score[row] = -1
+        k = min(k, n)
+        cand = np.argpartition(-score, k - 1)[:k]
+        cand = cand[score[cand] > 0]
+        ids = self.user_ids[cand]
+        cand = cand[np.lexsort((ids, -score[cand]))]
+        return [Match(int(self.user_ids[r]), round(float(score[r]), 4)) for r in cand]
+
+    def vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (user ids ascending, rows) for active creators with at least one lookup:
+        facet-weighted, L2-normalised float32 rows, so X @ X.T is cosine similarity.
+        """
+        weights = np.empty(self.width, dtype=np.float32)
+        for facet in FACETS:
+            start = self.offsets[facet.name]
+            weights[start:start + len(self.vocab[facet.name])] = facet.weight
+        with self._lock:
+            n = self.size
+            rows = np.flatnonzero(self.active[:n] & self.features[:n].any(axis=1))
+            rows = rows[np.argsort(self.user_ids[rows], kind="stable")]
+            ids = self.user_ids[rows].copy()
+            x = self.features[rows].astype(np.float32)
+        x *= weights
+        x /= np.linalg.norm(x, axis=1, keepdims=True)
+        return ids, x
+
+
+def _load_vocab(db: Session) -> Dict[str, np.ndarray]:
+    return {
+        f.name: np.array(sorted(r[0] for r in db.query(f.lookup.id).all()), dtype=np.int64)
+        for f in FACETS
+    }
+
+
+def _load_users(db: Session, user_ids: Optional[List[int]] = None):
+    q = db.query(User.id, User.active, User.utc_offset, User.country)
+    if user_ids is None:
+        q = q.filter(User.active.is_(True))
+    else:
+        q = q.filter(User.id.in_(user_ids))
+    users = q.all()
+    pairs: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    for f in FACETS:
+        owner, fk = f.user_pivot.c.user_id, f.user_pivot.c[f.fk]
+        pq = db.query(owner, fk)
+        if user_ids is not None:
+            pq = pq.filter(owner.in_(user_ids))
+        rows = pq.all()
+        pairs[f.name] = (
+            np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows)),
+            np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows)),
+        )
+    return users, pairs
+
+
+def project_requirements(db: Session, project: Any) -> Requirements:
+    """Requirements from a project's pivot tables, timezone/utc_offset and country."""
+    facets = {}
+    for f in FACETS:
+        pivot = f.project_pivot
+        facets[f.name] = [r[0] for r in db.query(pivot.c[f.fk]).filter(pivot.c.project_id == project.id).all()]
+    return Requirements(
+        facets=facets,
+        utc_offset=parse_utc_offset(project.utc_offset),
+        country=project.country or None,
+        exclude_user_ids=(project.user_id,),
+    )
+
+
+_matrix: Optional[CreatorMatrix] = None
+_built_at = 0.0
+_checked_at = 0.0
+_synced_until: Optional[datetime] = None
+_dirty: Set[int] = set()
+_state_lock = threading.Lock()
+_build_lock = threading.Lock()
+
+
+def mark_creators_dirty(user_ids: Iterable[int]) -> None:
+    """Re-read these users' rows on the next lookup (after a profile/pivot write)."""
+    with _state_lock:
+        _dirty.update(user_ids)
+
+
+def build_creator_matrix(db: Session) -> CreatorMatrix:
+    """A fresh matrix of every active creator (not shared; see get_creator_matrix)."""
+    matrix = CreatorMatrix(_load_vocab(db))
+    users, pairs = _load_users(db)
+    matrix.load(users, pairs)
+    return matrix
+
+
+def _build(db: Session) -> None:
+    global _matrix, _built_at, _checked_at, _synced_until
+    matrix = build_creator_matrix(db)
+    _synced_until = db.query(User.updated_at).order_by(User.updated_at.desc()).limit(1).scalar()
+    _matrix = matrix
+    _built_at = _checked_at = time.monotonic()
+
+
+def _refresh(db: Session) -> None:
+    global _checked_at, _synced_until
+    q = db.query(User.id, User.updated_at)
+    q = q.filter(User.updated_at >= _synced_until) if _synced_until is not None else q.filter(User.updated_at.isnot(None))
+    changed = q.all()
+    with _state_lock:
+        ids = set(_dirty) | {r[0] for r in changed}
+        _dirty.clear()
+    if ids:
+        users, pairs = _load_users(db, sorted(ids))
+        _matrix.load(users, pairs)
+    newest = max((r[1] for r in changed if r[1] is not None), default=None)
+    if newest is not None and (_synced_until is None or newest > _synced_until):
+        _synced_until = newest
+    _checked_at = time.monotonic()
+
+
+def get_creator_matrix(db: Session) -> CreatorMatrix:
+    """
+    Shared matrix: built on first use, topped up incrementally, rebuilt after
+    the TTL. Blocking (DB reads and numpy work under a thread lock): call it
+    from a worker thread, never through AsyncSession.run_sync on the loop.
+    """
+    global _checked_at
+    matrix = _matrix
+    now = time.monotonic()
+    if matrix is not None and now - _built_at < MATCHING_INDEX_TTL and (
+        now - _checked_at < MATCHING_REFRESH_SECONDS and not _dirty
+    ):
+        return matrix
+    if not _build_lock.acquire(blocking=matrix is None):
+        return matrix
+    try:
+        try:
+            if _matrix is None or time.monotonic() - _built_at >= MATCHING_INDEX_TTL:
+                _build(db)
+            else:
+                _refresh(db)
+        except Exception:
+            if _matrix is None:
+                raise
+            logger.exception("Creator matrix refresh failed; serving the previous one")
+            _checked_at = time.monotonic()
+        return _matrix
+    finally:
+        _build_lock.release()
@@ -1,13 +1,24 @@
-"""Matching: create, list, get by id/token, update."""
+"""Matching: create, list, get by id/token, update, rank creators for a project."""
 import uuid as uuid_lib
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session, contains_eager, joinedload, lazyload
 
+from app.core.laravel_response import user_to_laravel_user_resource
+from app.core.pagination import paginate_counted
 from app.db.models.matching import Matching
 from app.db.models.project import Project
 from app.db.models.user import User
+from app.services.matching_engine import (
+    DEFAULT_TOP_K,
+    FACETS,
+    MAX_TOP_K,
+    Requirements,
+    get_creator_matrix,
+    parse_utc_offset,
+    project_requirements,
+)
 
 
 def _matching_resource(m: Matching, project: Optional[Project] = None, editor: Optional[User] = None) -> Dict[str, Any]:
@@ -25,52 +36,54 @@ class MatchingService:
     def __init__(self, db: Session):
         self.db = db
 
-    def list_for_user(self, user_id: int, page: int = 1, per_page: int = 15) -> Dict[str, Any]:
+    def _query(self) -> Query:
+        """
+        Matchings joined to their project with the editor eager-loaded, so a
+        page (or a single row) is one SELECT instead of 1 + 2N lookups.
+        User.projects is selectin by default; skip it, the resource never reads it.
+        """
+        return (
+            self.db.query(Matching)
+            .join(Matching.project)
+            .options(
+                contains_eager(Matching.project),
+                joinedload(Matching.editor).lazyload(User.projects),
+            )
+        )
+
+    def list_for_user(self, user_id: int, page: int = 1, per_page: int = 15, cursor: Optional[str] = None) -> Dict[str, Any]:
         try:
-            q = self.db.query(Matching).join(Project).filter(Project.user_id == user_id)
-            total = q.count()
-            items = q.order_by(Matching.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
-            out = []
-            for m in items:
-                proj = self.db.query(Project).filter(Project.id == m.project_id).first()
-                ed = self.db.query(User).filter(User.id == m.editor_id).first() if m.editor_id else None
-                out.append(_matching_resource(m, proj, ed))
-            return {"matching": out, "total": total, "page": page}
+            q = self._query().filter(Project.user_id == user_id)
+            result = paginate_counted(q, Matching, page=page, per_page=per_page, cursor=cursor)
+            out = [_matching_resource(m, m.project, m.editor) for m in result.items]
+            return {"matching": out, "total": result.total, "page": page, "next_cursor": result.next_cursor}
         except Exception:
-            return {"matching": [], "total": 0, "page": page}
+            return {"matching": [], "total": 0, "page": page, "next_cursor": None}
 
     def get_by_uuid(self, uuid: str) -> Optional[Dict[str, Any]]:
         try:
-            m = self.db.query(Matching).filter(Matching.uuid == uuid).first()
+            m = self._query().filter(Matching.uuid == uuid).first()
             if not m:
                 return None
-            proj = self.db.query(Project).filter(Project.id == m.project_id).first()
-            ed = self.db.query(User).filter(User.id == m.editor_id).first() if m.editor_id else None
-            return _matching_resource(m, proj, ed)
+            return _matching_resource(m, m.project, m.editor)
         except Exception:
             return None
 
     def get_by_token(self, token: str) -> Optional[Dict[str, Any]]:
         try:
-            m = self.db.query(Matching).filter(Matching.token == token).first()
+            m = self._query().filter(Matching.token == token).first()
             if not m:
                 return None
-            proj = self.db.query(Project).filter(Project.id == m.project_id).first()
-            ed = self.db.query(User).filter(User.id == m.editor_id).first() if m.editor_id else None
-            return _matching_resource(m, proj, ed)
+            return _matching_resource(m, m.project, m.editor)
         except Exception:
             return None
 
     def get_for_project(self, project_uuid: str) -> Optional[Dict[str, Any]]:
         try:
-            proj = self.db.query(Project).filter(Project.uuid == project_uuid).first()
-            if not proj:
-                return None
-            m = self.db.query(Matching).filter(Matching.project_id == proj.id).first()
+            m = self._query().filter(Project.uuid == project_uuid).first()
             if not m:
                 return None
-            ed = self.db.query(User).filter(User.id == m.editor_id).first() if m.editor_id else None
-            return _matching_resource(m, proj, ed)
+            return _matching_resource(m, m.project, m.editor)
         except Exception:
             return None
 
@@ -103,16 +116,79 @@ class MatchingService:
 
     def update(self, uuid: str, payload: Any = None) -> Optional[Dict[str, Any]]:
         try:
-            m = self.db.query(Matching).filter(Matching.uuid == uuid).first()
+            m = self._query().filter(Matching.uuid == uuid).first()
             if not m:
                 return None
             if payload and isinstance(payload, dict) and "editor_id" in payload:
                 m.editor_id = payload["editor_id"]
             m.updated_at = datetime.utcnow()
             self.db.commit()
-            self.db.refresh(m)
-            proj = self.db.query(Project).filter(Project.id == m.project_id).first()
-            ed = self.db.query(User).filter(User.id == m.editor_id).first() if m.editor_id else None
-            return _matching_resource(m, proj, ed)
+            # Reload row, project and editor together after the commit expired them.
+            m = self._query().filter(Matching.id == m.id).populate_existing().first()
+            return _matching_resource(m, m.project, m.editor)
         except Exception:
             return None
+
+    def _requirements(self, user_id: int, payload: Dict[str, Any]) -> Optional[Requirements]:
+        """
+        From the caller's project (payload "project" = uuid) or a matching link
+        ("token"), else from explicit lookup uuid lists ("skills", "job_types", ...,
+        plus "utc_offset"/"timezone" and "country").
+        """
+        project = None
+        if payload.get("project"):
+            project = (
+                self.db.query(Project)
+                .filter(Project.uuid == str(payload["project"]), Project.user_id == user_id, Project.deleted_at.is_(None))
+                .first()
+            )
+        elif payload.get("token"):
+            project = self._query().filter(Matching.token == str(payload["token"])).first()
+            project = project.project if project else None
+        if project is not None:
+            return project_requirements(self.db, project)
+        if payload.get("project") or payload.get("token"):
+            return None
+        facets: Dict[str, List[int]] = {}
+        for facet in FACETS:
+            uuids = payload.get(facet.name)
+            if isinstance(uuids, str):
+                uuids = [uuids]
+            if isinstance(uuids, list) and uuids:
+                rows = self.db.query(facet.lookup.id).filter(facet.lookup.uuid.in_([str(u) for u in uuids])).all()
+                facets[facet.name] = [r[0] for r in rows]
+        return Requirements(
+            facets=facets,
+            utc_offset=parse_utc_offset(payload.get("utc_offset", payload.get("timezone"))),
+            country=payload.get("country") or None,
+            exclude_user_ids=(user_id,),
+        )
+
+    def match_creators(self, user_id: int, payload: Any = None) -> List[Dict[str, Any]]:
+        """Top-k creators (user resource + score 0..1) for a project's requirements."""
+        payload = payload if isinstance(payload, dict) else {}
+        try:
+            k = min(max(int(payload.get("limit") or DEFAULT_TOP_K), 1), MAX_TOP_K)
+        except (TypeError, ValueError):
+            k = DEFAULT_TOP_K
+        try:
+            req = self._requirements(user_id, payload)
+            if req is None:
+                return []
+            matches = get_creator_matrix(self.db).top(req, k)
+            if not matches:
+                return []
+            users = {
+                u.id: u
+                for u in self.db.query(User)
+                .options(lazyload(User.projects))
+                .filter(User.id.in_([m.user_id for m in matches]))
+                .all()
+            }
+            return [
+                {**user_to_laravel_user_resource(users[m.user_id]), "score": m.score}
+                for m in matches
+                if m.user_id in users
+            ]
+        except Exception:
+            return []
@@ -1,14 +1,108 @@
 """
 Profile service: get user, update user, get statistics.
 Laravel parity for profile endpoints.
+
+Photos queued for background rendering (PROFILE_PHOTO_ASYNC in the profile
+router) wait in PROFILE_PHOTO_PENDING_DIR (default "pending_photos"), which
+must sit outside UPLOAD_DIR so the raw upload, with its EXIF/GPS data, is
+never served, and be shared with the Celery workers. Per user it holds the
+raw files as <user_id>-<sha256> and a <user_id>.pending file naming the
+newest one; a later upload or any other photo change supersedes it.
 """
+import logging
+import os
+import shutil
+import tempfile
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, lazyload
 
+from app.core.image_pipeline import RenderedImage, render_variants
+from app.core.uploads import SpooledUpload, discard
 from app.db.models.project import Project
 from app.db.models.user import User
+from app.services.blob_store import blob_sha_for_url, discard_blob, put_blob, release_blob, retain_blob
+from app.services.current_user import forget_current_user
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PHOTO_PENDING_DIR = os.getenv("PROFILE_PHOTO_PENDING_DIR", "pending_photos")
+
+
+def _pending_raw_path(user_id: int, sha256: str) -> str:
+    return os.path.join(PROFILE_PHOTO_PENDING_DIR, f"{user_id}-{sha256}")
+
+
+def _pending_marker(user_id: int) -> str:
+    return os.path.join(PROFILE_PHOTO_PENDING_DIR, f"{user_id}.pending")
+
+
+def pending_photo_sha(user_id: int) -> Optional[str]:
+    """Content hash of the user's newest queued photo, if one is pending."""
+    try:
+        with open(_pending_marker(user_id)) as fp:
+            return fp.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def stage_pending_photo(user_id: int, upload: SpooledUpload) -> Optional[str]:
+    """
+    Move a raw photo upload into the private pending directory and mark it
+    as the user's newest; its content hash, or None on failure. Blocking:
+    run in the threadpool.
+    """
+    try:
+        os.makedirs(PROFILE_PHOTO_PENDING_DIR, exist_ok=True)
+        shutil.move(upload.path, _pending_raw_path(user_id, upload.sha256))
+        fd, tmp = tempfile.mkstemp(dir=PROFILE_PHOTO_PENDING_DIR, prefix=f".{user_id}-")
+        with os.fdopen(fd, "w") as fp:
+            fp.write(upload.sha256)
+        os.replace(tmp, _pending_marker(user_id))
+        return upload.sha256
+    except OSError:
+        logger.exception("Could not stage profile photo for user %s", user_id)
+        discard(upload)
+        discard_pending_photo(user_id, upload.sha256)
+        return None
+
+
+def discard_pending_photo(user_id: int, sha256: str) -> None:
+    """Drop a queued raw photo. The marker may name it still; with its file gone the task is a no-op."""
+    try:
+        os.unlink(_pending_raw_path(user_id, sha256))
+    except FileNotFoundError:
+        pass
+
+
+def cancel_pending_photo(user_id: int) -> None:
+    """Supersede any queued photo for the user (the photo was set another way)."""
+    sha256 = pending_photo_sha(user_id)
+    if sha256:
+        try:
+            os.unlink(_pending_marker(user_id))
+        except FileNotFoundError:
+            pass
+        discard_pending_photo(user_id, sha256)
+
+
+def sweep_pending_photos(grace: float) -> int:
+    """Remove pending files (raw uploads and markers) older than `grace` seconds; returns how many."""
+    if not os.path.isdir(PROFILE_PHOTO_PENDING_DIR):
+        return 0
+    removed = 0
+    stale_before = time.time() - grace
+    for entry in os.scandir(PROFILE_PHOTO_PENDING_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < stale_before:
+                os.unlink(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
 
 
 class ProfileService:
@@ -23,14 +117,67 @@ class ProfileService:
         return getattr(payload, key, default)
 
     def get_user(self, user_id: int) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
+        # By primary key: reuses the instance get_current_user put in the session.
+        return self.db.get(User, user_id, options=[lazyload(User.projects)])
+
+    def store_photo(self, upload: SpooledUpload) -> Optional[str]:
+        """
+        File a processed photo in the content-addressed store; its URL, or
+        None on failure. update() takes the reference when it sets user.photo.
+        """
+        blob = None
+        try:
+            blob = put_blob(self.db, upload, reference=False)
+            self.db.commit()
+            return blob.url
+        except Exception:
+            discard_blob(blob)
+            self.db.rollback()
+            discard(upload)
+            return None
+
+    def store_photo_variants(self, rendered: List[RenderedImage]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        File rendered variants like store_photo. Returns (photo URL, the full
+        JPEG; photo_variants) or None on failure.
+        """
+        blobs = []
+        try:
+            variants: Dict[str, Dict[str, Any]] = {}
+            for r in rendered:
+                blob = put_blob(self.db, r.upload, reference=False)
+                blobs.append(blob)
+                entry = variants.setdefault(r.variant, {"width": r.width, "height": r.height})
+                entry[r.format] = blob.url
+            self.db.commit()
+            return variants["full"]["jpeg"], variants
+        except Exception:
+            for blob in blobs:
+                discard_blob(blob)
+            self.db.rollback()
+            for r in rendered:
+                discard(r.upload)
+            return None
+
+    @staticmethod
+    def _photo_blobs(photo: Optional[str], variants: Optional[Dict[str, Any]]) -> Set[str]:
+        """Content hashes of a photo and its variants (each counted once)."""
+        urls: List[Any] = [photo]
+        for variant in (variants or {}).values():
+            if isinstance(variant, dict):
+                urls.extend(variant.values())
+        return {sha for sha in (blob_sha_for_url(u) for u in urls if isinstance(u, str)) if sha}
 
     def update(
         self,
         user_id: int,
         payload: Any,
+        photo_variants: Optional[Dict[str, Any]] = None,
     ) -> Optional[User]:
-        """Update user profile from payload (first_name, last_name, email, phone, photo, etc.)."""
+        """
+        Update user profile from payload (first_name, last_name, email, phone, photo, etc.).
+        photo_variants belong to payload["photo"]; a photo set without them clears the old ones.
+        """
         user = self.get_user(user_id)
         if not user or payload is None:
             return user
@@ -47,14 +194,87 @@ class ProfileService:
             if val is not None:
                 if key == "utc_offset" and not isinstance(val, str):
                     val = str(val)
+                if key == "photo" and val != user.photo:
+                    cancel_pending_photo(user.id)
+                    for sha in self._photo_blobs(val, photo_variants):
+                        retain_blob(self.db, sha)
+                    for sha in self._photo_blobs(user.photo, user.photo_variants):
+                        release_blob(self.db, sha)
+                    user.photo_variants = photo_variants
                 setattr(user, key, val)
         if not user.name and (user.first_name or user.last_name):
             user.name = f"{user.first_name or ''} {user.last_name or ''}".strip()
         user.updated_at = datetime.utcnow()
         self.db.commit()
+        forget_current_user(user.id)
         self.db.refresh(user)
         return user
 
+    def process_photo(self, user_id: int, sha256: str) -> bool:
+        """
+        Render a photo queued by the profile update (see PROFILE_PHOTO_ASYNC)
+        and make it the user's photo. Keyed by the raw upload's content hash:
+        a no-op once the raw file is gone or a newer photo superseded it, so
+        retries and duplicate deliveries are safe. Blocking; runs in the
+        Celery worker.
+        """
+        raw_path = _pending_raw_path(user_id, sha256)
+        if pending_photo_sha(user_id) != sha256:
+            discard_pending_photo(user_id, sha256)
+            return False
+        if not os.path.exists(raw_path):
+            return False
+        try:
+            rendered = render_variants(raw_path)
+        except Exception as exc:
+            # Not a decodable image: it was never published, so the old photo simply stays.
+            logger.warning("Could not render profile photo %s: %s", sha256, exc)
+            discard_pending_photo(user_id, sha256)
+            return False
+        stored = self.store_photo_variants(rendered)
+        if stored is None:
+            # Kept for a redelivery; the pending sweep removes it if none comes.
+            return False
+        url, variants = stored
+        swapped = self._swap_photo(user_id, sha256, url, variants)
+        discard_pending_photo(user_id, sha256)
+        return swapped
+
+    def _swap_photo(self, user_id: int, sha256: str, url: str, variants: Dict[str, Any]) -> bool:
+        """
+        Set photo and photo_variants with an UPDATE conditioned on the photo
+        read just before, so a change committed meanwhile is never
+        overwritten (or its blobs released); retried while `sha256` is still
+        the user's newest pending photo.
+        """
+        for _ in range(3):
+            if pending_photo_sha(user_id) != sha256:
+                return False
+            row = self.db.execute(select(User.photo, User.photo_variants).where(User.id == user_id)).first()
+            if row is None:
+                return False
+            current, current_variants = row
+            unchanged = User.photo.is_(None) if current is None else User.photo == current
+            result = self.db.execute(
+                update(User)
+                .where(User.id == user_id, unchanged)
+                .values(photo=url, photo_variants=variants, updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            if not result.rowcount:
+                self.db.rollback()
+                continue
+            new_blobs = self._photo_blobs(url, variants)
+            old_blobs = self._photo_blobs(current, current_variants)
+            for sha in new_blobs - old_blobs:
+                retain_blob(self.db, sha)
+            for sha in old_blobs - new_blobs:
+                release_blob(self.db, sha)
+            self.db.commit()
+            forget_current_user(user_id)
+            return True
+        return False
+
     def get_statistics(self, user_id: int) -> Dict[str, Any]:
         """Return Laravel-style statistics (project counts, etc.)."""
         projects_count = (
@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.pagination import paginate_counted
 from app.db.models.project import Project
 from app.db.models.project_application import ProjectApplication
 from app.db.models.user import User
@@ -28,23 +29,23 @@ class ProjectApplicationService:
     def __init__(self, db: Session):
         self.db = db
 
-    def list_for_user(self, user_id: int, page: int = 1, per_page: int = 15) -> Dict[str, Any]:
+    def list_for_user(self, user_id: int, page: int = 1, per_page: int = 15, cursor: Optional[str] = None) -> Dict[str, Any]:
         try:
             q = (
                 self.db.query(ProjectApplication)
                 .filter(ProjectApplication.deleted_at.is_(None))
                 .filter(ProjectApplication.user_id == user_id)
             )
-            total = q.count()
-            items = q.order_by(ProjectApplication.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+            result = paginate_counted(q, ProjectApplication, page=page, per_page=per_page, cursor=cursor)
+            total, next_cursor = result.total, result.next_cursor
             applications = []
-            for app in items:
+            for app in result.items:
                 proj = self.db.query(Project).filter(Project.id == app.project_id).first()
                 usr = self.db.query(User).filter(User.id == app.user_id).first()
                 applications.append(_application_to_resource(app, proj, usr))
-            return {"applications": applications, "total": total, "page": page}
+            return {"applications": applications, "total": total, "page": page, "next_cursor": next_cursor}
         except Exception:
-            return {"applications": [], "total": 0, "page": page}
+            return {"applications": [], "total": 0, "page": page, "next_cursor": None}
 
     def get_by_uuid(self, uuid: str, user_id: Optional[int] = None) -> Optional[ProjectApplication]:
         q = self.db.query(ProjectApplication).filter(ProjectApplication.uuid == uuid, ProjectApplication.deleted_at.is_(None))
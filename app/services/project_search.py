@@ -0,0 +1,201 @@
+"""
+Relevance-ranked full-text search over projects (title + description), shared
+by project search, the public job listing and admin project search.
+
+Backends (PROJECT_SEARCH_BACKEND, default "auto"):
+
+- MySQL: FULLTEXT index on (title, description). Every query word must
+  match as a prefix (BOOLEAN MODE `+word*`); rows rank by the
+  NATURAL LANGUAGE MODE score.
+- PostgreSQL: GIN index on to_tsvector('simple', title || ' ' || description),
+  `word:* & ...` tsquery, ranked by ts_rank.
+- memory: a per-process TextIndex (BM25, title terms count double), caught
+  up from projects.updated_at at most every PROJECT_SEARCH_REFRESH_SECONDS
+  (default 5). Used for SQLite / tests.
+
+"auto" picks the database backend on MySQL / PostgreSQL and memory otherwise.
+The database indexes are created by scripts/create_project_search_index.py;
+until it has run (checked every SEARCH_INDEX_CHECK_SECONDS), and for a query
+with no indexable words, search falls back to the old ILIKE filter.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, inspect, literal_column
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import get_settings
+from app.core.pagination import page_with_total
+from app.db.models.project import Project
+from app.services.text_index import TextIndex, tokenize
+
+logger = logging.getLogger(__name__)
+
+PROJECT_SEARCH_BACKEND = os.getenv("PROJECT_SEARCH_BACKEND", "auto").lower()
+PROJECT_SEARCH_REFRESH_SECONDS = float(os.getenv("PROJECT_SEARCH_REFRESH_SECONDS", "5"))
+SEARCH_INDEX_NAME = "projects_title_description_fulltext"
+SEARCH_INDEX_CHECK_SECONDS = 300.0
+TITLE_WEIGHT = 2
+MYSQL_MIN_TOKEN = 3
+
+_TS_CONFIG = literal_column("'simple'::regconfig")
+_EMPTY = literal_column("''")
+_SPACE = literal_column("' '")
+
+
+def backend_for(db: Session) -> str:
+    """Backend name for this session's database: mysql, postgresql or memory."""
+    if PROJECT_SEARCH_BACKEND in ("memory", "mysql", "postgresql"):
+        return PROJECT_SEARCH_BACKEND
+    dialect = db.get_bind().dialect.name
+    return dialect if dialect in ("mysql", "postgresql") else "memory"
+
+
+def uses_memory_index() -> bool:
+    """
+    Whether searches may go through the in-process TextIndex (CPU work):
+    callers keep such services off AsyncSession.run_sync.
+    """
+    if PROJECT_SEARCH_BACKEND != "auto":
+        return PROJECT_SEARCH_BACKEND == "memory"
+    return get_settings().DB_CONNECTION not in ("mysql", "pgsql")
+
+
+_db_index: Optional[Tuple[bool, float]] = None  # (present, checked_at)
+
+
+def has_database_index(db: Session) -> bool:
+    """Whether SEARCH_INDEX_NAME exists; a missing index is looked for again every SEARCH_INDEX_CHECK_SECONDS."""
+    global _db_index
+    state = _db_index
+    if state is not None and (state[0] or time.monotonic() - state[1] < SEARCH_INDEX_CHECK_SECONDS):
+        return state[0]
+    try:
+        present = any(ix["name"] == SEARCH_INDEX_NAME for ix in inspect(db.connection()).get_indexes("projects"))
+    except Exception:
+        logger.exception("Could not inspect the projects indexes")
+        present = False
+    if not present:
+        logger.warning("%s is missing; project search uses ILIKE (run scripts/create_project_search_index.py)", SEARCH_INDEX_NAME)
+    _db_index = (present, time.monotonic())
+    return present
+
+
+def _pg_document():
+    return func.to_tsvector(
+        _TS_CONFIG,
+        # Literals, not bind parameters, so the expression matches the GIN index's.
+        func.coalesce(Project.title, _EMPTY).op("||")(_SPACE).op("||")(func.coalesce(Project.description, _EMPTY)),
+    )
+
+
+_index: Optional[TextIndex] = None
+_synced_until: Optional[datetime] = None
+_checked_at = 0.0
+_generation = 0  # bumped by invalidate, so a catch-up that started earlier is dropped
+_catching_up = False
+# Guards the globals above; never held while querying.
+_state_lock = threading.Lock()
+
+
+def get_project_text_index(db: Session) -> Optional[TextIndex]:
+    """
+    Shared in-memory index, caught up from updated_at at most every
+    PROJECT_SEARCH_REFRESH_SECONDS by one request at a time; the others keep
+    the current index, or get None while the first build is running.
+    """
+    global _index, _synced_until, _checked_at, _catching_up
+    with _state_lock:
+        index, since, generation = _index, _synced_until, _generation
+        if _catching_up or (index is not None and time.monotonic() - _checked_at < PROJECT_SEARCH_REFRESH_SECONDS):
+            return index
+        _catching_up = True
+    try:
+        q = db.query(Project.id, Project.title, Project.description, Project.deleted_at, Project.updated_at)
+        if index is None:
+            target = TextIndex()
+        else:
+            target = index
+            if since is not None:
+                q = q.filter(Project.updated_at >= since)
+        newest = since
+        for pid, title, description, deleted_at, updated_at in q.yield_per(1000):
+            if deleted_at is not None:
+                target.remove(pid)
+            else:
+                target.add(pid, ((title, TITLE_WEIGHT), (description, 1)))
+            if updated_at is not None and (newest is None or updated_at > newest):
+                newest = updated_at
+        with _state_lock:
+            if _generation == generation:
+                _index, _synced_until, _checked_at = target, newest, time.monotonic()
+        return target
+    except Exception:
+        logger.exception("Project text index catch-up failed; serving the previous one")
+        return index
+    finally:
+        with _state_lock:
+            _catching_up = False
+
+
+def invalidate_project_text_index() -> None:
+    """Drop the in-memory index; the next search rebuilds it."""
+    global _index, _synced_until, _generation
+    with _state_lock:
+        _index, _synced_until = None, None
+        _generation += 1
+
+
+def _ilike_search(query: Query, text: str, page: int, per_page: int) -> Tuple[List[Project], int]:
+    like = f"%{text}%"
+    query = query.filter(Project.title.ilike(like) | Project.description.ilike(like))
+    return page_with_total(query, (Project.created_at.desc(),), page=page, per_page=per_page)
+
+
+def search_projects(db: Session, query: Query, text: str, page: int = 1, per_page: int = 15) -> Tuple[List[Project], int]:
+    """
+    One page of `query` (a filtered Project query) matching `text`, most
+    relevant first (newest first among equals), plus the total match count.
+    """
+    words = tokenize(text)
+    backend = backend_for(db)
+    if backend in ("mysql", "postgresql") and not has_database_index(db):
+        words = []
+    if backend == "mysql":
+        # InnoDB does not index words shorter than innodb_ft_min_token_size (3).
+        words = [w for w in words if len(w) >= MYSQL_MIN_TOKEN]
+    index = get_project_text_index(db) if words and backend == "memory" else None
+    if not words or (backend == "memory" and index is None):
+        return _ilike_search(query, text, page, per_page)
+
+    if backend == "mysql":
+        required = match(Project.title, Project.description, against=" ".join(f"+{w}*" for w in words)).in_boolean_mode()
+        relevance = match(Project.title, Project.description, against=" ".join(words)).in_natural_language_mode()
+        query = query.filter(required > 0)
+        return page_with_total(query, (relevance.desc(), Project.created_at.desc()), page=page, per_page=per_page)
+    if backend == "postgresql":
+        tsquery = func.to_tsquery(_TS_CONFIG, " & ".join(f"{w}:*" for w in words))
+        document = _pg_document()
+        query = query.filter(document.op("@@")(tsquery))
+        order = (func.ts_rank(document, tsquery).desc(), Project.created_at.desc())
+        return page_with_total(query, order, page=page, per_page=per_page)
+
+    scores = index.search(text)
+    if not scores:
+        return [], 0
+    ids = list(scores)
+    rows: List[Tuple[int, Optional[datetime]]] = []
+    for start in range(0, len(ids), 1000):
+        chunk = ids[start:start + 1000]
+        rows.extend(query.filter(Project.id.in_(chunk)).with_entities(Project.id, Project.created_at).all())
+    rows.sort(key=lambda r: (-scores[r[0]], -(r[1].timestamp() if r[1] else 0), -r[0]))
+    page_ids = [r[0] for r in rows[(page - 1) * per_page:page * per_page]]
+    if not page_ids:
+        return [], len(rows)
+    by_id = {p.id: p for p in query.filter(Project.id.in_(page_ids)).all()}
+    return [by_id[i] for i in page_ids if i in by_id], len(rows)
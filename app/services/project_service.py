@@ -5,8 +5,20 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.pagination import page_with_total, paginate, paginate_counted
 from app.db.models.project import Project
 from app.db.models.user import User
+from app.services.project_search import search_projects
+from app.services.project_status_counts import count_key, record_project_change, stored_status_counts
+
+
+def _metrics(counts: Dict[Optional[str], int]) -> Dict[str, int]:
+    """Laravel's metrics shape: NULL status is reported as "pending"."""
+    out: Dict[str, int] = {}
+    for status, n in counts.items():
+        key = str(status or "pending")
+        out[key] = out.get(key, 0) + n
+    return out
 
 
 class ProjectService:
@@ -25,7 +37,16 @@ class ProjectService:
         search: Optional[str] = None,
         status: Optional[str] = None,
         statuses: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
+        """
+        The user's projects (owner or editor), newest first, or by relevance
+        with `search`. `cursor` (a previous next_cursor) pages by keyset;
+        text search pages by offset only. Without `search` the total comes
+        from the live per-status counts already needed for `metrics`; stored
+        counters can trail outside writes, so with them it is counted with
+        the page instead.
+        """
         query = (
             self.db.query(Project)
             .filter(Project.deleted_at.is_(None))
@@ -33,22 +54,25 @@ class ProjectService:
                 (Project.user_id == user_id) | (Project.editor_id == user_id)
             )
         )
-        if search:
-            q = f"%{search}%"
-            query = query.filter(
-                (Project.title.ilike(q)) | (Project.description.ilike(q))
-            )
         if statuses:
             query = query.filter(Project.status.in_(statuses))
         elif status:
             query = query.filter(Project.status == status)
-        total = query.count()
-        items: List[Project] = (
-            query.order_by(Project.created_at.desc())
-            .offset((page - 1) * per_page)
-            .limit(per_page)
-            .all()
-        )
+        stored = stored_status_counts(self.db, user_id)
+        counts = stored if stored is not None else self._live_status_counts(user_id)
+        next_cursor = None
+        if search:
+            items, total = search_projects(self.db, query, search, page=page, per_page=per_page)
+        elif stored is not None:
+            items, total, next_cursor, _ = paginate_counted(query, Project, page=page, per_page=per_page, cursor=cursor)
+        else:
+            if statuses:
+                total = sum(counts.get(s, 0) for s in set(statuses))
+            elif status:
+                total = counts.get(status, 0)
+            else:
+                total = sum(counts.values())
+            items, next_cursor = paginate(query, Project, page=page, per_page=per_page, cursor=cursor)
         projects_data = [
             {
                 "uuid": p.uuid,
@@ -58,16 +82,26 @@ class ProjectService:
             }
             for p in items
         ]
-        metrics = self.status_metrics(user_id)
+        metrics = _metrics(counts)
         return {
             "projects": projects_data,
             "total": total,
             "page": page,
             "metrics": metrics,
+            "next_cursor": next_cursor,
         }
 
-    def status_metrics(self, user_id: int) -> Dict[str, int]:
-        """Count projects by status for user (as owner or editor)."""
+    def _status_counts(self, user_id: int) -> Dict[Optional[str], int]:
+        """
+        Live projects per raw status (None kept apart) for user as owner or
+        editor, from the project_status_counts table when enabled.
+        """
+        stored = stored_status_counts(self.db, user_id)
+        if stored is not None:
+            return stored
+        return self._live_status_counts(user_id)
+
+    def _live_status_counts(self, user_id: int) -> Dict[Optional[str], int]:
         rows = (
             self.db.query(Project.status, func.count(Project.id))
             .filter(Project.deleted_at.is_(None))
@@ -77,7 +111,11 @@ class ProjectService:
             .group_by(Project.status)
             .all()
         )
-        return {str(r[0] or "pending"): r[1] for r in rows}
+        return {r[0]: r[1] for r in rows}
+
+    def status_metrics(self, user_id: int) -> Dict[str, int]:
+        """Count projects by status for user (as owner or editor)."""
+        return _metrics(self._status_counts(user_id))
 
     def get_by_uuid(self, uuid: str) -> Optional[Project]:
         return (
@@ -122,6 +160,7 @@ class ProjectService:
             updated_at=datetime.utcnow(),
         )
         self.db.add(project)
+        record_project_change(self.db, None, count_key(project))
         self.db.commit()
         self.db.refresh(project)
         return project
@@ -130,6 +169,7 @@ class ProjectService:
         project = self.get_by_uuid(project_uuid)
         if not project or payload is None:
             return project
+        before = count_key(project)
         title = self._get(payload, "title")
         if title is not None:
             project.title = title
@@ -151,6 +191,7 @@ class ProjectService:
             if editor:
                 project.editor_id = editor.id
         project.updated_at = datetime.utcnow()
+        record_project_change(self.db, before, count_key(project))
         self.db.commit()
         self.db.refresh(project)
         return project
@@ -159,8 +200,10 @@ class ProjectService:
         project = self.get_by_uuid(project_uuid)
         if not project:
             return None
+        before = count_key(project)
         project.status = "cancelled"
         project.updated_at = datetime.utcnow()
+        record_project_change(self.db, before, count_key(project))
         self.db.commit()
         self.db.refresh(project)
         return project
@@ -174,13 +217,7 @@ class ProjectService:
             .filter(Project.deleted_at.is_(None), Project.editor_id.is_(None))
             .filter(Project.user_id == user_id)
         )
-        total = query.count()
-        items = (
-            query.order_by(Project.created_at.desc())
-            .offset((page - 1) * per_page)
-            .limit(per_page)
-            .all()
-        )
+        items, total = page_with_total(query, (Project.created_at.desc(),), page=page, per_page=per_page)
         return {
             "projects": [
                 {"uuid": p.uuid, "title": p.title, "description": p.description, "status": p.status}
@@ -190,19 +227,19 @@ class ProjectService:
             "page": page,
         }
 
-    def public_search_no_auth(self, page: int = 1, per_page: int = 15) -> Dict[str, Any]:
+    def public_search_no_auth(
+        self, page: int = 1, per_page: int = 15, search: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Published jobs with no editor; `search` ranks by relevance."""
         query = (
             self.db.query(Project)
             .filter(Project.deleted_at.is_(None), Project.published == 1)
             .filter(Project.editor_id.is_(None))
         )
-        total = query.count()
-        items = (
-            query.order_by(Project.created_at.desc())
-            .offset((page - 1) * per_page)
-            .limit(per_page)
-            .all()
-        )
+        if search:
+            items, total = search_projects(self.db, query, search, page=page, per_page=per_page)
+        else:
+            items, total = page_with_total(query, (Project.created_at.desc(),), page=page, per_page=per_page)
         return {
             "projects": [
                 {"uuid": p.uuid, "title": p.title, "description": p.description, "status": p.status}
@@ -0,0 +1,121 @@
+"""
+Materialized per-user project counts by status, read by the project list
+(`metrics` and `total`) with a primary-key lookup instead of a GROUP BY over
+every project the user owns or edits.
+
+ProjectService applies +1/-1 deltas in the same transaction as each create,
+update and cancel. Writes that bypass it (the Laravel app, manual SQL) are
+folded in by reconcile_project_status_counts(), which Celery beat runs every
+PROJECT_COUNTS_RECONCILE_SECONDS (default 3600), so they can trail those
+writes by up to that long; they feed `metrics` only, never a paging total.
+
+Off by default: create and fill the table with
+scripts/create_project_status_counts.py first, then set
+PROJECT_STATUS_COUNTS=1. Until then every read and write uses live counts.
+"""
+import os
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, func, literal, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.db.models.project import Project
+from app.db.models.project_status_count import ProjectStatusCount
+from app.db.upsert import upsert_increment
+
+PROJECT_STATUS_COUNTS = os.getenv("PROJECT_STATUS_COUNTS", "0").lower() in ("1", "true", "yes")
+
+# (users counted, status) for one project: owner and editor, once each.
+CountKey = Tuple[Tuple[int, ...], Optional[str]]
+
+_table = ProjectStatusCount.__table__
+
+
+def count_key(project: Project) -> CountKey:
+    users = sorted({u for u in (project.user_id, project.editor_id) if u is not None})
+    return tuple(users), project.status
+
+
+def _increment(db: Session, user_id: int, status: str, delta: int, now: datetime) -> None:
+    upsert_increment(db, _table, {"user_id": user_id, "status": status}, "total", delta, {"updated_at": now})
+
+
+def record_project_change(db: Session, before: Optional[CountKey], after: Optional[CountKey]) -> None:
+    """
+    Queue the counter deltas for one project moving from `before` to `after`
+    (None for "not counted") on the caller's transaction; commit applies them.
+    """
+    if not PROJECT_STATUS_COUNTS or before == after:
+        return
+    deltas: Dict[Tuple[int, str], int] = {}
+    for key, sign in ((before, -1), (after, 1)):
+        if key is None:
+            continue
+        users, status = key
+        for user_id in users:
+            slot = (user_id, status or "")
+            deltas[slot] = deltas.get(slot, 0) + sign
+    now = datetime.utcnow()
+    for (user_id, status), delta in sorted(deltas.items()):
+        if delta:
+            _increment(db, user_id, status, delta, now)
+
+
+def stored_status_counts(db: Session, user_id: int) -> Optional[Dict[Optional[str], int]]:
+    """Raw status (None for NULL) -> live project count for user; None when disabled."""
+    if not PROJECT_STATUS_COUNTS:
+        return None
+    rows = db.query(ProjectStatusCount.status, ProjectStatusCount.total).filter(
+        ProjectStatusCount.user_id == user_id
+    )
+    return {(status or None): total for status, total in rows if total > 0}
+
+
+def _live_counts(db: Session) -> Dict[Tuple[int, str], int]:
+    live = Project.deleted_at.is_(None)
+    owners = select(Project.user_id.label("uid"), Project.status.label("status")).where(live)
+    editors = select(Project.editor_id.label("uid"), Project.status.label("status")).where(
+        live, Project.editor_id.isnot(None), Project.editor_id != Project.user_id
+    )
+    both = union_all(owners, editors).subquery()
+    status = func.coalesce(both.c.status, literal(""))
+    rows = db.execute(select(both.c.uid, status, func.count()).group_by(both.c.uid, status))
+    return {(uid, s): n for uid, s, n in rows}
+
+
+def reconcile_project_status_counts(db: Session, chunk: int = 1000) -> int:
+    """
+    Rewrite counters that differ from a fresh GROUP BY and commit; returns
+    how many changed. A write that commits during the run can be overwritten
+    with the older value; the next run corrects it.
+    """
+    live = _live_counts(db)
+    stored = {
+        (uid, status): total
+        for uid, status, total in db.query(
+            ProjectStatusCount.user_id, ProjectStatusCount.status, ProjectStatusCount.total
+        )
+    }
+    now = datetime.utcnow()
+    changed = 0
+    stale = [key for key in stored if key not in live]
+    for key, total in live.items():
+        if key not in stored:
+            # Upsert: a concurrent write-through may have just created the row.
+            _increment(db, key[0], key[1], total, now)
+        elif stored[key] != total:
+            db.execute(
+                update(_table)
+                .where(_table.c.user_id == key[0], _table.c.status == key[1])
+                .values(total=total, updated_at=now)
+            )
+        else:
+            continue
+        changed += 1
+        if changed % chunk == 0:
+            db.commit()
+    for user_id, status in stale:
+        db.execute(delete(_table).where(_table.c.user_id == user_id, _table.c.status == status))
+    db.commit()
+    return changed + len(stale)
@@ -0,0 +1,232 @@
+"""
+Precomputed "similar creators" for /usercreator/similar and /editor/{id}/related.
+
+Each active creator's top SIMILAR_CREATORS_TOP_N neighbours by cosine
+similarity over the matching feature rows (CreatorMatrix.vectors) are stored
+as fixed-width arrays in an .npz file at SIMILAR_CREATORS_PATH:
+
+    user_ids    int32 (n,)      ascending
+    neighbours  int32 (n, N)    best first, 0 = empty slot
+    scores      float32 (n, N)
+    synced_until                users.updated_at watermark of the snapshot
+
+The Celery worker writes the file (jobs.similar_creators.rebuild nightly,
+jobs.similar_creators.refresh every few minutes); API workers only read it,
+re-checking its mtime every SIMILAR_RELOAD_SECONDS, and a lookup is a dict
+hit on the user id. Nothing is computed at request time.
+
+SIMILAR_CREATORS_PATH must be on storage the worker and every API host
+share (e.g. an NFS or shared volume mount). A host that cannot see the file,
+or asks for a user the table does not have yet, gets EditorService's plain
+"other active creators" query instead.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.db.models.user import User
+from app.services.matching_engine import CreatorMatrix, build_creator_matrix, get_creator_matrix, mark_creators_dirty
+
+logger = logging.getLogger(__name__)
+
+SIMILAR_CREATORS_PATH = os.getenv("SIMILAR_CREATORS_PATH", "storage/similar_creators.npz")
+SIMILAR_RELOAD_SECONDS = float(os.getenv("SIMILAR_RELOAD_SECONDS", "60"))
+SIMILAR_CREATORS_TOP_N = 20
+# Similarity block size (rows x creators) kept to ~64 MB of float32.
+_BLOCK_ELEMENTS = 16 * 1024 * 1024
+_CHUNK = 256
+
+
+def _select(cand_ids: np.ndarray, cand_scores: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per row, the n best (id, score) candidates with score > 0, best first, 0-padded."""
+    rows, width = cand_scores.shape
+    neighbours = np.zeros((rows, n), dtype=np.int32)
+    scores = np.zeros((rows, n), dtype=np.float32)
+    k = min(n, width)
+    if not rows or not k:
+        return neighbours, scores
+    part = np.argpartition(-cand_scores, k - 1, axis=1)[:, :k]
+    top = np.take_along_axis(cand_scores, part, axis=1)
+    order = np.argsort(-top, axis=1, kind="stable")
+    part = np.take_along_axis(part, order, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    ids = np.take_along_axis(np.broadcast_to(cand_ids, cand_scores.shape), part, axis=1)
+    keep = top > 0
+    neighbours[:, :k] = np.where(keep, ids, 0)
+    scores[:, :k] = np.where(keep, top, 0)
+    return neighbours, scores
+
+
+def _similarities(x: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Cosine similarity of x[rows] against every row of x, self excluded."""
+    sims = x[rows] @ x.T
+    sims[np.arange(len(rows)), rows] = -1
+    return sims
+
+
+class NeighbourTable:
+    def __init__(self, user_ids: np.ndarray, neighbours: np.ndarray, scores: np.ndarray, synced_until: Optional[datetime]):
+        self.user_ids = user_ids
+        self.neighbours = neighbours
+        self.scores = scores
+        self.synced_until = synced_until
+        self._row = {int(u): i for i, u in enumerate(user_ids)}
+
+    @property
+    def top_n(self) -> int:
+        return self.neighbours.shape[1]
+
+    def get(self, user_id: int, limit: Optional[int] = None) -> List[int]:
+        """Neighbour user ids of user_id, most similar first."""
+        i = self._row.get(user_id)
+        if i is None:
+            return []
+        return [int(v) for v in self.neighbours[i, :limit] if v]
+
+    @classmethod
+    def compute(cls, ids: np.ndarray, x: np.ndarray, synced_until: Optional[datetime], top_n: int = SIMILAR_CREATORS_TOP_N) -> "NeighbourTable":
+        """All-pairs top-n over (ids, x) from CreatorMatrix.vectors(), in row blocks."""
+        m = len(ids)
+        neighbours = np.zeros((m, top_n), dtype=np.int32)
+        scores = np.zeros((m, top_n), dtype=np.float32)
+        block = max(1, _BLOCK_ELEMENTS // max(m, 1))
+        for start in range(0, m, block):
+            rows = np.arange(start, min(start + block, m))
+            neighbours[rows], scores[rows] = _select(ids, _similarities(x, rows), top_n)
+        return cls(ids.astype(np.int32), neighbours, scores, synced_until)
+
+    def refreshed(self, ids: np.ndarray, x: np.ndarray, changed: np.ndarray, synced_until: Optional[datetime]) -> "NeighbourTable":
+        """
+        New table for the current vectors where only `changed` users (and new
+        ones) are recomputed: their own rows in full, and each is offered to
+        everyone else's list. Entries pointing at a changed or vanished user
+        are dropped first, so such lists can run short until the next rebuild.
+        """
+        m, top_n = len(ids), self.top_n
+        old = np.searchsorted(self.user_ids, ids)
+        old = np.clip(old, 0, max(len(self.user_ids) - 1, 0))
+        present = (self.user_ids[old] == ids) if len(self.user_ids) else np.zeros(m, dtype=bool)
+        neighbours = np.zeros((m, top_n), dtype=np.int32)
+        scores = np.zeros((m, top_n), dtype=np.float32)
+        neighbours[present] = self.neighbours[old[present]]
+        scores[present] = self.scores[old[present]]
+
+        dirty = ~present | np.isin(ids, changed)
+        stale = (neighbours != 0) & (np.isin(neighbours, ids[dirty]) | ~np.isin(neighbours, ids))
+        neighbours[stale] = 0
+        scores[stale] = 0
+
+        dirty_rows = np.flatnonzero(dirty)
+        clean_rows = np.flatnonzero(~dirty)
+        for start in range(0, len(dirty_rows), _CHUNK):
+            rows = dirty_rows[start:start + _CHUNK]
+            sims = _similarities(x, rows)
+            neighbours[rows], scores[rows] = _select(ids, sims, top_n)
+            if len(clean_rows):
+                cand_ids = np.hstack([neighbours[clean_rows], np.broadcast_to(ids[rows], (len(clean_rows), len(rows)))])
+                cand_scores = np.hstack([scores[clean_rows], sims[:, clean_rows].T])
+                neighbours[clean_rows], scores[clean_rows] = _select(cand_ids, cand_scores, top_n)
+        return NeighbourTable(ids.astype(np.int32), neighbours, scores, synced_until)
+
+    def save(self, path: str) -> None:
+        """Write atomically (temp file + rename) so readers never see a partial file."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(
+                fh,
+                user_ids=self.user_ids,
+                neighbours=self.neighbours,
+                scores=self.scores,
+                synced_until=np.array(self.synced_until.isoformat() if self.synced_until else ""),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "NeighbourTable":
+        with np.load(path) as data:
+            synced = str(data["synced_until"])
+            return cls(
+                data["user_ids"],
+                data["neighbours"],
+                data["scores"],
+                datetime.fromisoformat(synced) if synced else None,
+            )
+
+
+_table: Optional[NeighbourTable] = None
+_mtime: Optional[float] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_neighbour_table() -> Optional[NeighbourTable]:
+    """The last table the worker wrote (None until the first rebuild has run)."""
+    global _table, _mtime, _checked_at
+    if time.monotonic() - _checked_at < SIMILAR_RELOAD_SECONDS:
+        return _table
+    if not _lock.acquire(blocking=False):
+        return _table
+    try:
+        try:
+            mtime = os.stat(SIMILAR_CREATORS_PATH).st_mtime
+            if mtime != _mtime:
+                _table = NeighbourTable.load(SIMILAR_CREATORS_PATH)
+                _mtime = mtime
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.exception("Could not load %s; serving the previous table", SIMILAR_CREATORS_PATH)
+        _checked_at = time.monotonic()
+        return _table
+    finally:
+        _lock.release()
+
+
+def _watermark(db: Session) -> Optional[datetime]:
+    return db.query(User.updated_at).order_by(User.updated_at.desc()).limit(1).scalar()
+
+
+def _store(table: NeighbourTable) -> int:
+    global _checked_at
+    table.save(SIMILAR_CREATORS_PATH)
+    _checked_at = 0.0
+    return len(table.user_ids)
+
+
+def rebuild_similar_creators(db: Session) -> int:
+    """Recompute every creator's neighbours from a fresh matrix; returns rows written."""
+    synced_until = _watermark(db)
+    ids, x = build_creator_matrix(db).vectors()
+    return _store(NeighbourTable.compute(ids, x, synced_until))
+
+
+def refresh_similar_creators(db: Session) -> int:
+    """
+    Fold in creators whose users.updated_at moved since the stored table's
+    watermark; falls back to a full rebuild when there is no table yet.
+    """
+    try:
+        table = NeighbourTable.load(SIMILAR_CREATORS_PATH)
+    except FileNotFoundError:
+        return rebuild_similar_creators(db)
+    q = db.query(User.id, User.updated_at)
+    if table.synced_until is not None:
+        q = q.filter(User.updated_at >= table.synced_until)
+    changed = q.all()
+    if not changed:
+        return 0
+    changed_ids = [r[0] for r in changed]
+    newest = max((r[1] for r in changed if r[1] is not None), default=table.synced_until)
+    mark_creators_dirty(changed_ids)
+    matrix: CreatorMatrix = get_creator_matrix(db)
+    ids, x = matrix.vectors()
+    table = table.refreshed(ids, x, np.asarray(changed_ids, dtype=np.int64), newest)
+    _store(table)
+    return len(changed_ids)
@@ -0,0 +1,135 @@
+"""
+In-memory inverted index with BM25 ranking, shared by project search
+(memory backend) and creator search.
+
+Documents are integer ids with weighted text fields (a title word can count
+double). Postings are dicts so documents can be re-added or removed in place;
+each term also caches numpy arrays of (doc ids, tf, doc length). Scoring a
+query is vectorized over those arrays. Every query word must match, as a
+prefix of an indexed term.
+"""
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.location_index import normalize
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Upper bound on vocabulary terms one query word expands to as a prefix.
+MAX_PREFIX_TERMS = 64
+
+_WORD_RE = re.compile(r"\w+")
+_EMPTY = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased, accent-free word tokens."""
+    return _WORD_RE.findall(normalize(text))
+
+
+class TextIndex:
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._terms: Dict[int, Dict[str, int]] = {}
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self._vocab: Optional[List[str]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, doc_id: int, fields: Iterable[Tuple[Optional[str], int]]) -> None:
+        """(Re)index doc_id from (text, weight) fields."""
+        terms: Dict[str, int] = defaultdict(int)
+        for text, weight in fields:
+            for tok in tokenize(text):
+                terms[tok] += weight
+        with self._lock:
+            self.remove(doc_id)
+            if not terms:
+                return
+            for term, tf in terms.items():
+                if term not in self._postings:
+                    self._vocab = None
+                self._postings[term][doc_id] = tf
+                self._arrays.pop(term, None)
+            self._terms[doc_id] = dict(terms)
+            self._lengths[doc_id] = sum(terms.values())
+            self._total_length += self._lengths[doc_id]
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            terms = self._terms.pop(doc_id, None)
+            if terms is None:
+                return
+            for term in terms:
+                posting = self._postings[term]
+                posting.pop(doc_id, None)
+                self._arrays.pop(term, None)
+                if not posting:
+                    del self._postings[term]
+                    self._vocab = None
+            self._total_length -= self._lengths.pop(doc_id)
+
+    def _expand(self, word: str) -> List[str]:
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        lo = bisect_left(self._vocab, word)
+        hi = bisect_left(self._vocab, word + "\U0010ffff", lo)
+        return self._vocab[lo:min(hi, lo + MAX_PREFIX_TERMS)]
+
+    def _term_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            posting = self._postings[term]
+            ids = np.fromiter(posting.keys(), dtype=np.int64, count=len(posting))
+            tf = np.fromiter(posting.values(), dtype=np.float64, count=len(posting))
+            lengths = np.fromiter((self._lengths[d] for d in posting), dtype=np.float64, count=len(posting))
+            arrays = self._arrays[term] = (ids, tf, lengths)
+        return arrays
+
+    def search_arrays(self, text: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(doc ids ascending, BM25 scores) of documents matching every query word."""
+        words = list(dict.fromkeys(tokenize(text)))
+        if not words:
+            return _EMPTY
+        with self._lock:
+            n = len(self._lengths)
+            if not n:
+                return _EMPTY
+            avg = self._total_length / n
+            ids: Optional[np.ndarray] = None
+            scores: Optional[np.ndarray] = None
+            for word in words:
+                parts = []
+                for term in self._expand(word):
+                    t_ids, tf, lengths = self._term_arrays(term)
+                    idf = np.log(1 + (n - len(t_ids) + 0.5) / (len(t_ids) + 0.5))
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * lengths / avg)
+                    parts.append((t_ids, idf * tf * (BM25_K1 + 1) / norm))
+                if not parts:
+                    return _EMPTY
+                w_ids = np.concatenate([p[0] for p in parts])
+                w_scores = np.concatenate([p[1] for p in parts])
+                w_ids, inverse = np.unique(w_ids, return_inverse=True)
+                w_scores = np.bincount(inverse, weights=w_scores, minlength=len(w_ids))
+                if ids is None:
+                    ids, scores = w_ids, w_scores
+                else:
+                    ids, left, right = np.intersect1d(ids, w_ids, assume_unique=True, return_indices=True)
+                    scores = scores[left] + w_scores[right]
+                if not len(ids):
+                    return _EMPTY
+            return ids, scores
+
+    def search(self, text: Optional[str]) -> Dict[int, float]:
+        """Doc id -> BM25 score for documents matching every query word."""
+        ids, scores = self.search_arrays(text)
+        return dict(zip(ids.tolist(), scores.tolist()))
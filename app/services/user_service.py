@@ -2,9 +2,10 @@
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 
 from app.db.models.user import User
+from app.services.current_user import forget_current_user
 
 
 class UserService:
@@ -14,6 +15,16 @@ class UserService:
     def get_by_uuid(self, uuid: str) -> Optional[User]:
         return self.db.query(User).filter(User.uuid == uuid).first()
 
+    def get_owned(self, user_uuid: str, current_user_id: int) -> Optional[User]:
+        """
+        The current user if user_uuid is theirs, else None. Loaded by primary key,
+        so a user already in the session (get_current_user) is not queried again.
+        """
+        user = self.db.get(User, current_user_id, options=[lazyload(User.projects)])
+        if not user or user.uuid != user_uuid:
+            return None
+        return user
+
     def _get(self, payload: Any, key: str, default: Any = None) -> Any:
         if payload is None:
             return default
@@ -22,8 +33,8 @@ class UserService:
         return getattr(payload, key, default)
 
     def update_by_uuid(self, user_uuid: str, current_user_id: int, payload: Any) -> Optional[User]:
-        user = self.get_by_uuid(user_uuid)
-        if not user or user.id != current_user_id:
+        user = self.get_owned(user_uuid, current_user_id)
+        if not user:
             return None
         if payload is None:
             return user
@@ -36,12 +47,13 @@ class UserService:
             user.name = f"{user.first_name or ''} {user.last_name or ''}".strip()
         user.updated_at = datetime.utcnow()
         self.db.commit()
+        forget_current_user(user.id)
         self.db.refresh(user)
         return user
 
     def update_timezone(self, user_uuid: str, current_user_id: int, timezone: Optional[str] = None, utc_offset: Optional[str] = None) -> Optional[User]:
-        user = self.get_by_uuid(user_uuid)
-        if not user or user.id != current_user_id:
+        user = self.get_owned(user_uuid, current_user_id)
+        if not user:
             return None
         if hasattr(user, "timezone") and timezone is not None:
             setattr(user, "timezone", timezone)
@@ -49,27 +61,30 @@ class UserService:
             setattr(user, "utc_offset", utc_offset)
         user.updated_at = datetime.utcnow()
         self.db.commit()
+        forget_current_user(user.id)
         self.db.refresh(user)
         return user
 
     def accept_policy(self, user_uuid: str, current_user_id: int) -> Optional[User]:
-        user = self.get_by_uuid(user_uuid)
-        if not user or user.id != current_user_id:
+        user = self.get_owned(user_uuid, current_user_id)
+        if not user:
             return None
         user.policy_accepted = True
         user.policy_accepted_at = datetime.utcnow()
         if hasattr(user, "updated_at"):
             user.updated_at = datetime.utcnow()
         self.db.commit()
+        forget_current_user(user.id)
         self.db.refresh(user)
         return user
 
     def delete_by_uuid(self, user_uuid: str, current_user_id: int) -> bool:
-        user = self.get_by_uuid(user_uuid)
-        if not user or user.id != current_user_id:
+        user = self.get_owned(user_uuid, current_user_id)
+        if not user:
             return False
         self.db.delete(user)
         self.db.commit()
+        forget_current_user(current_user_id)
         return True
 
     def get_referral_by_code(self, code: str) -> Dict[str, Any]:
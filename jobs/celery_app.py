@@ -1,6 +1,7 @@
 import os
 
 from celery import Celery
+from celery.schedules import crontab
 
 from app.core.config import get_settings
 
@@ -14,6 +15,18 @@ celery_app = Celery(
 
 celery_app.conf.update(
     task_default_queue="default",
+    beat_schedule={
+        "similar-creators-rebuild": {"task": "jobs.similar_creators.rebuild", "schedule": crontab(hour=3, minute=0)},
+        "similar-creators-refresh": {
+            "task": "jobs.similar_creators.refresh",
+            "schedule": float(os.getenv("SIMILAR_REFRESH_SECONDS", "900")),
+        },
+        "project-status-counts-reconcile": {
+            "task": "jobs.project_status_counts.reconcile",
+            "schedule": float(os.getenv("PROJECT_COUNTS_RECONCILE_SECONDS", "3600")),
+        },
+        "file-blobs-sweep": {"task": "jobs.file_blobs.sweep", "schedule": crontab(hour=4, minute=0)},
+    },
 )
 
 
@@ -24,3 +37,71 @@ def dummy_task() -> None:
     defined in the migration spec (ProcessUserCreatorRefresh, etc.).
     """
 
+
+@celery_app.task(name="jobs.similar_creators.rebuild")
+def rebuild_similar_creators_task() -> int:
+    """Nightly: recompute every creator's similar-creator neighbours."""
+    from app.db.session import SessionLocal
+    from app.services.similar_creators import rebuild_similar_creators
+
+    db = SessionLocal()
+    try:
+        return rebuild_similar_creators(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="jobs.similar_creators.refresh")
+def refresh_similar_creators_task() -> int:
+    """Fold creators changed since the last run into the neighbour table."""
+    from app.db.session import SessionLocal
+    from app.services.similar_creators import refresh_similar_creators
+
+    db = SessionLocal()
+    try:
+        return refresh_similar_creators(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="jobs.project_status_counts.reconcile")
+def reconcile_project_status_counts_task() -> int:
+    """Correct per-user project status counters for writes made outside ProjectService."""
+    from app.db.session import SessionLocal
+    from app.services.project_status_counts import PROJECT_STATUS_COUNTS, reconcile_project_status_counts
+
+    if not PROJECT_STATUS_COUNTS:
+        return 0
+    db = SessionLocal()
+    try:
+        return reconcile_project_status_counts(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="jobs.file_blobs.sweep")
+def sweep_file_blobs_task() -> int:
+    """Nightly: delete uploads no longer referenced by any file or photo, and stale queued photos."""
+    from app.db.session import SessionLocal
+    from app.services.blob_store import BLOB_GC_GRACE_SECONDS, sweep_unreferenced_blobs
+    from app.services.profile_service import sweep_pending_photos
+
+    sweep_pending_photos(BLOB_GC_GRACE_SECONDS)
+    db = SessionLocal()
+    try:
+        return sweep_unreferenced_blobs(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="jobs.profile_photos.process", acks_late=True)
+def process_profile_photo_task(user_id: int, sha256: str) -> bool:
+    """Render a queued raw profile photo and swap its variants in (idempotent per content hash)."""
+    from app.db.session import SessionLocal
+    from app.services.profile_service import ProfileService
+
+    db = SessionLocal()
+    try:
+        return ProfileService(db).process_photo(user_id, sha256)
+    finally:
+        db.close()
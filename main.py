@@ -1,5 +1,6 @@
 import logging
 import os
+from contextlib import asynccontextmanager
 
 import sqlalchemy.exc
 from fastapi import FastAPI, Request
@@ -36,9 +37,17 @@ from app.api.shortlist.router import router as shortlist_router
 from app.api.profile_visit.router import router as profile_visit_router
 from app.api.data.router import router as data_router
 from app.api.health.router import router as health_router
+from app.api.uploads.router import UPLOAD_ACCEL_REDIRECT, router as uploads_router
 from app.core.config import get_settings
+from app.core.image_pipeline import shutdown_image_pool
 from app.core.cors import configure_cors
+from app.core.json_response import FastJSONResponse
 from app.core.laravel_response import validation_error_body
+from app.core.uploads import UploadSizeLimitMiddleware
+from app.db.schema import check_schema
+from app.middleware.rate_limit_middleware import RateLimitHeadersMiddleware
+from app.db.session import engine
+from app.services.chat_hub import get_chat_hub
 
 
 def _laravel_validation_exception_handler(
@@ -86,22 +95,41 @@ def _database_exception_handler(request: Request, exc: Exception) -> JSONRespons
     )
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # Refuse to serve until scripts/ has added the columns the models map.
+    check_schema(engine)
+    yield
+    # Stop the chat broker's Redis listener so workers shut down cleanly.
+    await get_chat_hub().close()
+    shutdown_image_pool()
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
 
     app = FastAPI(
         title=settings.APP_NAME,
+        lifespan=_lifespan,
         version="1.0.0",
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
         redirect_slashes=False,  # Prevent 307 redirects on trailing slash; routes handle both forms
+        default_response_class=FastJSONResponse,
     )
 
+    # Caps request bodies before Starlette parses any form; added first so CORS headers still wrap its 413.
+    app.add_middleware(UploadSizeLimitMiddleware)
+    # X-RateLimit-* from the rate limit dependencies, on every response class.
+    app.add_middleware(RateLimitHeadersMiddleware)
     configure_cors(app)
 
     upload_dir = os.environ.get("UPLOAD_DIR", "uploads")
-    if os.path.isdir(upload_dir):
+    if UPLOAD_ACCEL_REDIRECT:
+        # nginx serves the bytes; the app only answers with X-Accel-Redirect.
+        app.include_router(uploads_router)
+    elif os.path.isdir(upload_dir):
         app.mount("/uploads", StaticFiles(directory=upload_dir), name="uploads")
 
     app.add_exception_handler(RequestValidationError, _laravel_validation_exception_handler)
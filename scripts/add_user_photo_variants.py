@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Add the users.photo_variants JSON column holding the thumb / medium / full
+profile photo variants (app/core/image_pipeline.py). Existing photos keep
+photo_variants NULL until the user uploads a new one. Safe to re-run.
+Run from project root: python3 scripts/add_user_photo_variants.py
+"""
+import sys
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+from sqlalchemy import inspect, text  # noqa: E402
+
+from app.db.session import engine  # noqa: E402
+
+
+def main() -> int:
+    existing = {c["name"] for c in inspect(engine).get_columns("users")}
+    if "photo_variants" in existing:
+        print("users.photo_variants already exists")
+        return 0
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE users ADD COLUMN photo_variants JSON NULL"))
+    print("Added users.photo_variants")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
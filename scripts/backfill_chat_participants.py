@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Create conversation_participants (if missing) and backfill it from existing
+chat data: every message sender and the owner/editor of the conversation's
+project become participants. Read cursors start at the participant's own
+latest message, so older messages from others show as unread.
+Run from project root: python3 scripts/backfill_chat_participants.py
+"""
+import sys
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+from sqlalchemy import func  # noqa: E402
+
+from app.db.models.conversation import Conversation, ConversationParticipant, Message  # noqa: E402
+from app.db.models.project import Project  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+
+
+def main() -> int:
+    ConversationParticipant.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        pairs = {}
+        for conv_id, user_id, last_id in (
+            db.query(Message.conversation_id, Message.user_id, func.max(Message.id))
+            .group_by(Message.conversation_id, Message.user_id)
+        ):
+            pairs[(conv_id, user_id)] = last_id
+        for conv_id, owner_id, editor_id in (
+            db.query(Conversation.id, Project.user_id, Project.editor_id)
+            .join(Project, Project.id == Conversation.project_id)
+        ):
+            for uid in (owner_id, editor_id):
+                if uid:
+                    pairs.setdefault((conv_id, uid), None)
+
+        existing = set(db.query(ConversationParticipant.conversation_id, ConversationParticipant.user_id))
+        now = datetime.utcnow()
+        added = 0
+        for (conv_id, user_id), last_id in pairs.items():
+            if (conv_id, user_id) in existing:
+                continue
+            db.add(
+                ConversationParticipant(
+                    conversation_id=conv_id,
+                    user_id=user_id,
+                    last_read_message_id=last_id,
+                    last_read_at=now if last_id else None,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+            added += 1
+        db.commit()
+        print(f"Added {added} conversation participants.")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-user cost of rendering a page of Laravel user resources,
+as FastAPI's default path (jsonable_encoder + json.dumps) versus
+json_response (orjson). Users are loaded from an in-memory SQLite copy of
+the users table, as list endpoints load them.
+Run from project root: python3 scripts/bench_user_resource.py [users] [rounds]
+"""
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session, lazyload  # noqa: E402
+
+import app.db.models  # noqa: E402,F401
+from app.core.json_response import dump_json  # noqa: E402
+from app.core.laravel_response import success_with_message, user_to_laravel_user_resource  # noqa: E402
+from app.db.models.user import User  # noqa: E402
+
+
+def _users(n: int):
+    now = datetime(2024, 1, 1, 12, 30, 15, 123456)
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    db = Session(engine)
+    db.add_all(
+        User(
+            id=i,
+            uuid=f"00000000-0000-0000-0000-{i:012d}",
+            name=f"Creator {i}",
+            first_name="Creator",
+            last_name=str(i),
+            email=f"creator{i}@example.com",
+            photo=f"/uploads/{i}.jpg",
+            city="Lisbon",
+            country="Portugal",
+            open_for_work=1,
+            password="x",
+            created_at=now - timedelta(days=i),
+            updated_at=now,
+        )
+        for i in range(1, n + 1)
+    )
+    db.commit()
+    return db.query(User).options(lazyload(User.projects)).order_by(User.id).all()
+
+
+def _per_user_us(fn, users: int, rounds: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds / users * 1e6
+
+
+def main() -> int:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    users = _users(n)
+    build = lambda: [user_to_laravel_user_resource(u) for u in users]  # noqa: E731
+    payload = success_with_message("Creators Loaded Successfully", creators=build())
+
+    def stdlib():
+        return json.dumps(
+            jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    def fast():
+        return dump_json(payload)
+
+    if json.loads(stdlib()) != json.loads(fast()):
+        print("warning: stdlib and orjson output differ")
+    rows = [
+        ("user_to_laravel_user_resource", _per_user_us(build, n, rounds)),
+        ("jsonable_encoder + json.dumps", _per_user_us(stdlib, n, rounds)),
+        ("dump_json (orjson)", _per_user_us(fast, n, rounds)),
+    ]
+    print(f"{n} users x {rounds} rounds, microseconds per user:")
+    for name, us in rows:
+        print(f"  {name:<32} {us:8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
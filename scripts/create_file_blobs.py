@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Create the file_blobs table and the files.sha256 / files.size columns used by
+content-addressed upload storage (app/services/blob_store.py). Existing
+uploads keep their paths and are not deduplicated. Safe to re-run.
+Run from project root: python3 scripts/create_file_blobs.py
+"""
+import sys
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+from sqlalchemy import inspect, text  # noqa: E402
+
+from app.db.models.file import FileBlob  # noqa: E402
+from app.db.session import engine  # noqa: E402
+
+COLUMNS = {"sha256": "VARCHAR(64) NULL", "size": "BIGINT NULL"}
+INDEX_NAME = "files_sha256_index"
+
+
+def main() -> int:
+    FileBlob.__table__.create(bind=engine, checkfirst=True)
+    inspector = inspect(engine)
+    existing = {c["name"] for c in inspector.get_columns("files")}
+    indexes = {ix["name"] for ix in inspector.get_indexes("files")}
+    with engine.begin() as conn:
+        for name, ddl in COLUMNS.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE files ADD COLUMN {name} {ddl}"))
+                print(f"Added files.{name}")
+        if INDEX_NAME not in indexes:
+            conn.execute(text(f"CREATE INDEX {INDEX_NAME} ON files (sha256)"))
+            print(f"Created {INDEX_NAME}")
+    print("file_blobs ready")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Create the (created_at, id) indexes that newest-first list pages walk
+(app/core/pagination.py): `<table>_created_at_id_index` on every table a
+paginated endpoint lists. PostgreSQL gets (created_at DESC NULLS LAST, id DESC)
+to match its ORDER BY; MySQL and SQLite scan (created_at, id) backwards.
+Safe to re-run.
+Run from project root: python3 scripts/create_pagination_indexes.py
+"""
+import sys
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+from sqlalchemy import inspect, text  # noqa: E402
+
+from app.core.pagination import pagination_index_name  # noqa: E402
+from app.db.session import engine  # noqa: E402
+
+TABLES = ("projects", "matchings", "project_applications", "users")
+
+
+def main() -> int:
+    dialect = engine.dialect.name
+    columns = "created_at DESC NULLS LAST, id DESC" if dialect == "postgresql" else "created_at, id"
+    inspector = inspect(engine)
+    for table in TABLES:
+        name = pagination_index_name(table)
+        if name in {ix["name"] for ix in inspector.get_indexes(table)}:
+            print(f"{name} already exists")
+            continue
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
+        print(f"Created {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Create the full-text index that app/services/project_search.py queries:
+MySQL FULLTEXT (title, description) or a PostgreSQL GIN index on the same
+to_tsvector('simple', ...) expression. Other databases use the in-memory
+index and need nothing. Safe to re-run.
+Run from project root: python3 scripts/create_project_search_index.py
+"""
+import sys
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+from sqlalchemy import inspect, text  # noqa: E402
+
+from app.db.session import engine  # noqa: E402
+from app.services.project_search import SEARCH_INDEX_NAME as INDEX_NAME  # noqa: E402
+
+
+def main() -> int:
+    dialect = engine.dialect.name
+    if dialect not in ("mysql", "postgresql"):
+        print(f"{dialect}: no database index needed (in-memory search)")
+        return 0
+    existing = {ix["name"] for ix in inspect(engine).get_indexes("projects")}
+    if INDEX_NAME in existing:
+        print(f"{INDEX_NAME} already exists")
+        return 0
+    with engine.begin() as conn:
+        if dialect == "mysql":
+            conn.execute(text(f"ALTER TABLE projects ADD FULLTEXT INDEX {INDEX_NAME} (title, description)"))
+        else:
+            conn.execute(text(
+                f"CREATE INDEX {INDEX_NAME} ON projects USING GIN "
+                "(to_tsvector('simple'::regconfig, coalesce(title, '') || ' ' || coalesce(description, '')))"
+            ))
+    print(f"Created {INDEX_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Create the project_status_counts table read by the project list's metrics
+(app/services/project_status_counts.py) and fill it from projects. Safe to
+re-run: an existing table is reconciled against the live counts.
+Run from project root: python3 scripts/create_project_status_counts.py
+"""
+import sys
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+from app.db.models.project_status_count import ProjectStatusCount  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.services.project_status_counts import reconcile_project_status_counts  # noqa: E402
+
+
+def main() -> int:
+    ProjectStatusCount.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        changed = reconcile_project_status_counts(db)
+    finally:
+        db.close()
+    print(f"project_status_counts: {changed} rows written")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
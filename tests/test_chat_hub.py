@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.db.models.conversation import Conversation, ConversationParticipant
+from app.db.models.user import User
+from app.services import chat_hub
+from app.services.chat_hub import ChatHub, InMemoryChatBroker, broadcast_message, conversation_channel, user_channel
+from app.services.chat_service import ChatService
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    hub = ChatHub(InMemoryChatBroker())
+    monkeypatch.setattr(chat_hub, "get_chat_hub", lambda: hub)
+    return hub
+
+
+def _seed(db) -> str:
+    now = datetime(2024, 1, 1)
+    db.add(User(id=1, uuid="sender", email="sender@example.com", name="Sender", password="x"))
+    db.add(User(id=2, uuid="recipient", email="recipient@example.com", name="Recipient", password="x"))
+    db.add(Conversation(id=10, uuid="conv-1", created_at=now, updated_at=now))
+    for user_id in (1, 2):
+        db.add(ConversationParticipant(conversation_id=10, user_id=user_id, created_at=now, updated_at=now))
+    db.commit()
+    return "conv-1"
+
+
+def test_message_sent_through_chat_service_reaches_subscribers(db, hub):
+    conversation = _seed(db)
+    service = ChatService(db)
+
+    async def run():
+        async with hub.subscribe([conversation_channel(conversation), user_channel(2)]) as queue:
+            msg = service.add_message(conversation, 1, "hello")
+            recipients = [uid for uid in service.participant_user_ids(conversation) if uid != 1]
+            await broadcast_message(conversation, msg, recipients)
+            return [await asyncio.wait_for(queue.get(), timeout=1) for _ in range(2)]
+
+    first, second = asyncio.run(run())
+
+    assert '"event": "ChatMessageEvent"' in first and '"body": "hello"' in first
+    assert '"event": "ChatEvent"' in second and '"senderId": "sender"' in second
+
+
+def test_unsubscribed_channels_get_nothing(hub):
+    async def run():
+        async with hub.subscribe([user_channel(3)]) as queue:
+            await hub.publish(user_channel(4), "ChatEvent", {})
+            return queue.empty()
+
+    assert asyncio.run(run())
+
+
+def test_close_ends_every_subscription(hub):
+    async def reader(channel):
+        async with hub.subscribe([channel]) as queue:
+            while True:
+                payload = await queue.get()
+                if payload is None:
+                    return "closed"
+
+    async def run():
+        readers = [asyncio.create_task(reader(user_channel(uid))) for uid in (1, 2)]
+        await asyncio.sleep(0)
+        await hub.close()
+        return await asyncio.wait_for(asyncio.gather(*readers), timeout=1)
+
+    assert asyncio.run(run()) == ["closed", "closed"]
+    assert hub._subscribers == {}
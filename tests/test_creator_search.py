@@ -0,0 +1,130 @@
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.creator_search import CreatorQuery, CreatorSearchIndex, parse_creator_query
+
+LOOKUPS = {
+    "skills": [(1, "sk-edit", "Editing"), (2, "sk-photo", "Photography"), (3, "sk-motion", "Motion")],
+    "platforms": [(10, "pl-yt", "YouTube"), (11, "pl-tt", "TikTok")],
+}
+NOW = datetime.fromtimestamp(time.time())
+
+
+def _user(id, name, country, open_for_work=True, active=True, job_title=None):
+    return SimpleNamespace(
+        id=id, active=active, open_for_work=open_for_work, country=country, created_at=NOW,
+        name=name, first_name=None, last_name=None, username=None, job_title=job_title, fun_fact=None,
+    )
+
+
+USERS = [
+    _user(1, "Ada Editor", "Canada", job_title="Video editor"),
+    _user(2, "Bo Photo", "Canada", open_for_work=False),
+    _user(3, "Cy Motion", "France", job_title="Editor"),
+    _user(4, "Di Editor", "France"),
+    _user(5, "Ed Gone", "Canada", active=False, job_title="Editor"),
+]
+SKILLS = {1: [1], 2: [2], 3: [1, 3], 4: [1, 2], 5: [1]}
+PLATFORMS = {1: [10], 2: [10, 11], 3: [11], 4: [10]}
+
+
+def _pairs(by_user, users):
+    ids = {u.id for u in users}
+    pairs = [(u, v) for u, vs in by_user.items() if u in ids for v in vs]
+    return np.array([p[0] for p in pairs], dtype=np.int64), np.array([p[1] for p in pairs], dtype=np.int64)
+
+
+def _load(index, users):
+    index.load(users, {"skills": _pairs(SKILLS, users), "platforms": _pairs(PLATFORMS, users)})
+
+
+@pytest.fixture
+def index():
+    index = CreatorSearchIndex(LOOKUPS)
+    _load(index, USERS)
+    return index
+
+
+def _counts(facets, name):
+    return {v.get("uuid", v["name"]): v["count"] for v in facets[name]}
+
+
+def test_filters_and_across_facets_and_or_within_one(index):
+    ids, total, _ = index.search(CreatorQuery(facets={"skills": ("sk-photo", "sk-motion")}, countries=("france",)))
+
+    assert total == 2 and sorted(ids) == [3, 4]
+
+
+def test_facet_counts_ignore_their_own_filter(index):
+    _, _, facets = index.search(CreatorQuery(facets={"skills": ("sk-edit",)}, countries=("Canada",)))
+
+    # skills: counted over Canada only (users 1, 2); inactive user 5 never counts.
+    assert _counts(facets, "skills") == {"sk-edit": 1, "sk-photo": 1}
+    # country: counted over sk-edit only (users 1, 3, 4).
+    assert _counts(facets, "country") == {"France": 2, "Canada": 1}
+    # platforms and open_for_work: every filter applies (user 1).
+    assert _counts(facets, "platforms") == {"pl-yt": 1}
+    assert facets["open_for_work"] == {"1": 1, "0": 0}
+
+
+def test_text_ranks_by_bm25_and_narrows_the_facets(index):
+    ids, total, facets = index.search(CreatorQuery(text="editor"))
+
+    # Name and job title both say editor for user 1; user 5 is inactive.
+    assert ids[0] == 1
+    assert sorted(ids) == [1, 3, 4] and total == 3
+    assert _counts(facets, "skills") == {"sk-edit": 3, "sk-photo": 1, "sk-motion": 1}
+
+
+def test_reload_replaces_rows_in_place(index):
+    moved = _user(2, "Bo Editor", "France", open_for_work=True)
+    before = dict(SKILLS)
+    SKILLS[2] = [1]
+    try:
+        _load(index, [moved, _user(6, "Fi Editor", "Canada")])
+    finally:
+        SKILLS.clear()
+        SKILLS.update(before)
+
+    ids, total, facets = index.search(CreatorQuery(text="editor", countries=("France",)))
+
+    assert index.size == 6
+    assert sorted(ids) == [2, 3, 4] and total == 3
+    # User 2's old sk-photo pair is gone.
+    assert _counts(facets, "skills") == {"sk-edit": 3, "sk-photo": 1, "sk-motion": 1}
+    assert _counts(facets, "platforms") == {"pl-yt": 2, "pl-tt": 2}
+
+
+def test_rows_past_the_snapshot_size_are_ignored(index):
+    # A reader that took `size` before a concurrent load published row 5 (user 6).
+    _load(index, [_user(6, "Fi Editor", "Canada")])
+    index.size = 5
+
+    ids, total, facets = index.search(CreatorQuery(text="editor", facets={"skills": ("sk-edit",)}))
+
+    assert 6 not in ids and total == 3
+    assert _counts(facets, "skills")["sk-edit"] == 3
+
+
+def test_pages_are_ranked_by_recency_without_text(index):
+    index.created[index.row_of[4]] = time.time() - 400 * 86400
+
+    # Users 1-3 tie on recency; ids break the tie across the page edge.
+    first, total, _ = index.search(CreatorQuery(), per_page=2)
+    second, _, _ = index.search(CreatorQuery(), page=2, per_page=2)
+
+    assert total == 4
+    assert first + second == [3, 2, 1, 4]
+
+
+def test_parse_creator_query_reads_lists_and_flags():
+    query = parse_creator_query({"q": "editor", "skills[]": ["sk-a", "sk-b"], "platforms": "pl-a, pl-b", "open_for_work": "no"})
+
+    assert query.text == "editor"
+    assert query.facets == {"skills": ("sk-a", "sk-b"), "platforms": ("pl-a", "pl-b")}
+    assert query.open_for_work is False
+    assert parse_creator_query(None) == CreatorQuery()
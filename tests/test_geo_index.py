@@ -0,0 +1,126 @@
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.db.models.user import User
+from app.services import geo_index
+from app.services.geo_index import EARTH_RADIUS_KM, GeoIndex, parse_geo_query, run_geo_query
+
+rng = np.random.default_rng(7)
+N = 400
+IDS = np.arange(1, N + 1)
+# Uniform on the sphere, plus a cluster straddling the antimeridian and one by the pole.
+LATS = np.concatenate([np.degrees(np.arcsin(rng.uniform(-1, 1, N - 80))), rng.uniform(-20, -15, 40), rng.uniform(85, 90, 40)])
+LNGS = np.concatenate([rng.uniform(-180, 180, N - 80), rng.choice([-1, 1], 40) * rng.uniform(178, 180, 40), rng.uniform(-180, 180, 40)])
+
+CENTRES = [(0.0, 0.0), (51.5, -0.1), (-17.5, 179.9), (-17.5, -179.9), (89.5, 10.0), (-60.0, 45.0)]
+
+
+def _distance(lat, lng, lat2, lng2):
+    p1, p2 = math.radians(lat), math.radians(lat2)
+    a = math.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lng2 - lng) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def _brute(points, lat, lng):
+    """Every (id, km) from (lat, lng), nearest first, ties by id."""
+    return sorted(((i, _distance(lat, lng, a, b)) for i, (a, b) in points.items()), key=lambda p: (p[1], p[0]))
+
+
+def _points():
+    return {int(i): (float(a), float(b)) for i, a, b in zip(IDS, LATS, LNGS)}
+
+
+@pytest.fixture
+def index():
+    return GeoIndex(IDS, LATS, LNGS)
+
+
+def _assert_matches(got, expected):
+    ids, dist = got
+    assert ids.tolist() == [i for i, _ in expected]
+    assert np.allclose(dist, [d for _, d in expected])
+
+
+@pytest.mark.parametrize("lat,lng", CENTRES)
+@pytest.mark.parametrize("radius_km", [0.0, 150.0, 800.0, 3000.0, 12000.0, 25000.0])
+def test_within_matches_brute_force(index, lat, lng, radius_km):
+    expected = [p for p in _brute(_points(), lat, lng) if p[1] <= radius_km]
+
+    _assert_matches(index.within(lat, lng, radius_km), expected)
+
+
+@pytest.mark.parametrize("lat,lng", CENTRES)
+@pytest.mark.parametrize("k", [1, 5, 40, N + 10])
+def test_nearest_matches_brute_force(index, lat, lng, k):
+    _assert_matches(index.nearest(lat, lng, k), _brute(_points(), lat, lng)[:k])
+
+
+@pytest.mark.parametrize("lat,lng", CENTRES)
+def test_nearest_stops_at_max_radius(index, lat, lng):
+    expected = [p for p in _brute(_points(), lat, lng) if p[1] <= 500.0][:10]
+
+    _assert_matches(index.nearest(lat, lng, 10, max_radius_km=500.0), expected)
+
+
+def test_nearest_with_zero_max_radius_finds_only_exact_points(index):
+    lat, lng = float(LATS[0]), float(LNGS[0])
+
+    ids, dist = index.nearest(lat, lng, 5, max_radius_km=0)
+
+    assert ids.tolist() == [1] and dist.tolist() == [0.0]
+
+
+def test_overlay_upserts_moves_and_removes(index):
+    points = _points()
+    index.update({3: (-17.0, 179.5), 5: None, 10_001: (-17.2, -179.8), 10_002: (float("nan"), 0.0)})
+    index.update({7: (-17.4, 179.95)})
+    points.update({3: (-17.0, 179.5), 7: (-17.4, 179.95), 10_001: (-17.2, -179.8)})
+    del points[5]
+
+    assert len(index) == len(points)
+    for lat, lng in CENTRES:
+        _assert_matches(index.within(lat, lng, 2000.0), [p for p in _brute(points, lat, lng) if p[1] <= 2000.0])
+        _assert_matches(index.nearest(lat, lng, 25), _brute(points, lat, lng)[:25])
+
+
+def test_invalid_coordinates_are_not_indexed():
+    index = GeoIndex([1, 2, 3, 4], [10.0, float("nan"), 91.0, 10.0], [20.0, 0.0, 0.0, 181.0])
+
+    assert len(index) == 1
+    assert index.within(10.0, 20.0, 1.0)[0].tolist() == [1]
+
+
+def test_geo_query_runs_nearest_capped_by_radius_or_a_radius_search(index):
+    lat, lng = CENTRES[1]
+    nearest = parse_geo_query({"lat": str(lat), "lng": str(lng), "nearest": "3", "radius": "1000"})
+    radius = parse_geo_query({"latitude": lat, "longitude": lng})
+
+    _assert_matches(run_geo_query(index, nearest, lat, lng), [p for p in _brute(_points(), lat, lng) if p[1] <= 1000][:3])
+    _assert_matches(run_geo_query(index, radius, lat, lng), [p for p in _brute(_points(), lat, lng) if p[1] <= 50])
+    assert parse_geo_query({"lat": "x", "lng": "1"}) is None
+    assert parse_geo_query({"location": "loc-1", "nearest": "9999"}).nearest == 500
+
+
+def test_creator_index_picks_up_changed_users(db, monkeypatch):
+    monkeypatch.setattr(geo_index, "_creators", None)
+    monkeypatch.setattr(geo_index, "_synced_until", None)
+    stamp = datetime(2024, 1, 1)
+    for uid, lat, lng, active in [(1, "51.50", "-0.12", True), (2, "48.85", "2.35", True), (3, "", "", True), (4, "51.5", "-0.1", False)]:
+        db.add(User(id=uid, email=f"u{uid}@example.com", password="x", latitude=lat, longitude=lng, active=active, updated_at=stamp))
+    db.commit()
+
+    index = geo_index.get_creator_geo_index(db)
+    assert index.nearest(51.5, -0.1, 5)[0].tolist() == [1, 2]
+
+    later = datetime(2024, 1, 2)
+    db.query(User).filter(User.id == 1).update({"active": False, "updated_at": later})
+    db.query(User).filter(User.id == 3).update({"latitude": "51.51", "longitude": "-0.13", "updated_at": later})
+    db.commit()
+    monkeypatch.setattr(geo_index, "_checked_at", 0.0)
+
+    assert geo_index.get_creator_geo_index(db) is index
+    assert index.nearest(51.5, -0.1, 5)[0].tolist() == [3, 2]
+    assert len(index) == 2
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from app.services.location_index import LocationIndex
+
+
+def _row(id, city, country, admin_name, population):
+    return SimpleNamespace(
+        id=id, uuid=f"loc-{id}", city=city, city_ascii=city, country=country, admin_name=admin_name,
+        iso2=None, iso3=None, population=str(population), lat=None, lng=None,
+    )
+
+
+ROWS = [
+    _row(1, "Toronto", "Canada", "Ontario", 5_000_000),
+    _row(2, "Calgary", "Canada", "Alberta", 1_300_000),
+    _row(3, "Los Angeles", "United States", "California", 4_000_000),
+    _row(4, "Cairo", "Egypt", "Cairo", 9_000_000),
+    _row(5, "Oakland", "United States", "California", 400_000),
+    _row(6, "Cannes", "France", "Provence-Alpes-Cote d'Azur", 75_000),
+]
+
+
+def _cities(index, query):
+    rows, total = index.search(query, limit=50)
+    assert total == len(rows)
+    return [index.cities[i] for i in rows]
+
+
+def test_short_needle_matches_city_then_country_and_state_prefixes():
+    index = LocationIndex(ROWS)
+
+    # City prefixes by population, then rows whose country (Canada) or state (California) starts with it.
+    assert _cities(index, "ca") == ["Cairo", "Calgary", "Cannes", "Toronto", "Los Angeles", "Oakland"]
+    assert _cities(index, "U") == ["Los Angeles", "Oakland"]
+
+
+def test_long_needle_matches_city_or_country_anywhere():
+    index = LocationIndex(ROWS)
+
+    assert _cities(index, "gyp") == ["Cairo"]
+    assert _cities(index, "land") == ["Oakland"]
+    assert _cities(index, "cal") == ["Calgary"]
+
+
+def test_empty_query_lists_every_row_by_population():
+    index = LocationIndex(ROWS)
+
+    assert _cities(index, "") == ["Cairo", "Toronto", "Los Angeles", "Calgary", "Oakland", "Cannes"]
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from app.db.models.matching import Matching
+from app.db.models.project import Project
+from app.db.models.user import User
+from app.services.matching_service import MatchingService
+
+
+def _seed(db, n: int) -> None:
+    now = datetime(2024, 1, 1)
+    db.add(User(id=1, uuid="owner", email="owner@example.com", name="Owner", password="x"))
+    for i in range(n):
+        editor_id, project_id = 100 + i, 1000 + i
+        db.add(User(id=editor_id, uuid=f"editor-{i}", email=f"editor{i}@example.com", name=f"Editor {i}", password="x"))
+        db.add(Project(
+            id=project_id, uuid=f"project-{i}", user_id=1, title=f"Project {i}", description="", created_at=now,
+        ))
+        db.add(Matching(
+            uuid=f"matching-{i}", project_id=project_id, editor_id=editor_id,
+            token=f"token-{i}", status="pending", created_at=now - timedelta(minutes=i),
+        ))
+    db.commit()
+
+
+def _list_statements(db, count_statements, n: int):
+    _seed(db, n)
+    db.expire_all()
+    return count_statements(lambda: MatchingService(db).list_for_user(1, per_page=15))
+
+
+def test_list_for_user_loads_projects_and_editors(db, count_statements):
+    result, _ = _list_statements(db, count_statements, 3)
+
+    assert [(m["project"]["uuid"], m["editor"]["uuid"]) for m in result["matching"]] == [
+        (f"project-{i}", f"editor-{i}") for i in range(3)
+    ]
+
+
+def test_list_for_user_query_count_does_not_grow_with_the_page(db, count_statements):
+    _, one = _list_statements(db, count_statements, 1)
+    db.query(Matching).delete()
+    db.query(Project).delete()
+    db.query(User).delete()
+    db.commit()
+    _, fifteen = _list_statements(db, count_statements, 15)
+
+    # Projects and editors are eager-loaded: no query per matching.
+    assert fifteen == one
+
+
+def test_list_for_user_cursor_continues_after_the_first_page(db):
+    _seed(db, 10)
+    first = MatchingService(db).list_for_user(1, per_page=4)
+    second = MatchingService(db).list_for_user(1, per_page=4, cursor=first["next_cursor"])
+
+    assert [m["uuid"] for m in second["matching"]] == [f"matching-{i}" for i in range(4, 8)]
+
+
+def test_list_for_user_first_page_is_one_statement(db, count_statements):
+    result, statements = _list_statements(db, count_statements, 5)
+
+    # Page + total in one windowed SELECT.
+    assert statements == 1
+    assert result["total"] == 5
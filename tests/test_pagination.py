@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.pagination import clear_total_cache, decode_cursor, encode_cursor, paginate, paginate_counted
+from app.db.models.project import Project
+
+
+def _seed(db, n: int, undated=()) -> None:
+    now = datetime(2024, 1, 1)
+    for i in range(1, n + 1):
+        # Pairs share a timestamp so the id tiebreak is exercised.
+        created_at = None if i in undated else now - timedelta(minutes=i // 2)
+        db.add(Project(id=i, uuid=f"p{i}", user_id=1, title="t", description="", created_at=created_at))
+    db.commit()
+
+
+def _newest_first(db):
+    rows = db.query(Project).all()
+    dated = sorted((p for p in rows if p.created_at), key=lambda p: (p.created_at, p.id), reverse=True)
+    undated = sorted((p for p in rows if not p.created_at), key=lambda p: p.id, reverse=True)
+    return [p.id for p in dated + undated]
+
+
+def _walk(db, per_page: int):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = paginate(db.query(Project), Project, per_page=per_page, cursor=cursor)
+        seen.extend(p.id for p in rows)
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("per_page", [1, 3, 4, 20])
+def test_cursor_pages_walk_every_row_once_in_newest_first_order(db, per_page):
+    _seed(db, 11, undated={3, 7, 9})
+
+    assert _walk(db, per_page) == _newest_first(db)
+
+
+def test_cursor_page_matches_offset_page(db):
+    _seed(db, 10)
+    first, cursor = paginate(db.query(Project), Project, per_page=4)
+    by_cursor, _ = paginate(db.query(Project), Project, per_page=4, cursor=cursor)
+    by_offset, _ = paginate(db.query(Project), Project, page=2, per_page=4)
+
+    assert [p.id for p in by_cursor] == [p.id for p in by_offset]
+
+
+def test_malformed_cursor_starts_from_the_page(db):
+    _seed(db, 5)
+    rows, _ = paginate(db.query(Project), Project, per_page=2, cursor="not-a-cursor")
+
+    assert [p.id for p in rows] == _newest_first(db)[:2]
+
+
+def test_cursor_round_trip():
+    at = datetime(2024, 1, 1, 12, 30)
+
+    assert decode_cursor(encode_cursor(at, 7)) == (at, 7)
+    assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+
+
+def test_first_counted_page_reads_rows_and_total_in_one_statement(db, count_statements):
+    _seed(db, 10, undated={4})
+
+    page, statements = count_statements(lambda: paginate_counted(db.query(Project), Project, per_page=4))
+
+    assert statements == 1
+    assert page.total == 10
+    assert [p.id for p in page.items] == _newest_first(db)[:4]
+    assert page.next_cursor is not None
+
+
+def test_counted_cursor_page_keeps_the_full_total(db, count_statements):
+    _seed(db, 10, undated={4})
+    first = paginate_counted(db.query(Project), Project, per_page=4)
+
+    page, statements = count_statements(
+        lambda: paginate_counted(db.query(Project), Project, per_page=4, cursor=first.next_cursor)
+    )
+
+    # Keyset page plus the total, which ignores the cursor.
+    assert statements == 2
+    assert page.total == 10
+    assert [p.id for p in page.items] == _newest_first(db)[4:8]
+
+
+def test_counted_page_past_the_end_still_counts(db):
+    _seed(db, 3)
+
+    page = paginate_counted(db.query(Project), Project, page=3, per_page=2)
+
+    assert page.items == [] and page.total == 3 and page.next_cursor is None
+
+
+def test_cached_total_skips_the_count(db, count_statements):
+    clear_total_cache()
+    _seed(db, 5)
+    paginate_counted(db.query(Project), Project, per_page=2, cache_total=True)
+    db.add(Project(id=6, uuid="p6", user_id=1, title="t", description="", created_at=datetime(2024, 1, 2)))
+    db.commit()
+
+    page, statements = count_statements(
+        lambda: paginate_counted(db.query(Project), Project, per_page=2, cache_total=True)
+    )
+
+    assert statements == 1
+    assert page.total == 5
+    clear_total_cache()
@@ -0,0 +1,34 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core import rate_limit
+from app.core.rate_limit import MemoryRateLimitBackend
+
+
+def test_memory_backend_drops_replenished_keys(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    backend = MemoryRateLimitBackend()
+
+    asyncio.run(backend.hit("a", 10, 60))
+    asyncio.run(backend.hit("b", 10, 60))
+    now[0] += 61
+    asyncio.run(backend.hit("c", 10, 60))
+
+    assert list(backend._tats) == ["c"]
+
+
+def test_memory_backend_is_lru_bounded():
+    backend = MemoryRateLimitBackend(max_keys=2)
+    for key in ("a", "b", "c"):
+        asyncio.run(backend.hit(key, 10, 60))
+
+    assert list(backend._tats) == ["b", "c"]
+
+
+def test_memory_backend_limits():
+    backend = MemoryRateLimitBackend()
+    results = [asyncio.run(backend.hit("k", 3, 60)) for _ in range(4)]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results[:3]] == [2, 1, 0]
@@ -0,0 +1,55 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.lookups.router import router as lookups_router
+from app.core.dependencies import lenient_rate_limit
+from app.core.json_response import json_response
+from app.core.lookup_cache import get_lookup_cache
+from app.core.rate_limit import get_rate_limit_backend
+from app.middleware.rate_limit_middleware import RateLimitHeadersMiddleware
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_BACKEND", "memory")
+    get_rate_limit_backend.cache_clear()
+    get_lookup_cache().put("skills", {"status": "success", "message": "Skills Loaded Successfully", "skills": []})
+
+    app = FastAPI()
+    app.add_middleware(RateLimitHeadersMiddleware)
+    app.include_router(lookups_router)
+
+    @app.get("/listing", dependencies=[Depends(lenient_rate_limit)])
+    async def listing():
+        return json_response({"status": "success"})
+
+    yield TestClient(app)
+    get_lookup_cache().invalidate()
+    get_rate_limit_backend.cache_clear()
+
+
+def test_skills_carries_rate_limit_headers(client):
+    first = client.get("/skills")
+    second = client.get("/skills")
+
+    assert first.status_code == 200
+    assert first.headers["X-RateLimit-Limit"] == "120"
+    assert first.headers["X-RateLimit-Remaining"] == "119"
+    assert second.headers["X-RateLimit-Remaining"] == "118"
+
+
+def test_not_modified_skills_carries_rate_limit_headers(client):
+    etag = client.get("/skills").headers["ETag"]
+    response = client.get("/skills", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["X-RateLimit-Limit"] == "120"
+
+
+def test_json_response_carries_rate_limit_headers(client):
+    response = client.get("/listing")
+
+    assert response.headers["X-RateLimit-Limit"] == "120"
+    # Set once, not once by FastAPI and again by the middleware.
+    assert response.headers.get_list("X-RateLimit-Remaining") == ["119"]
@@ -0,0 +1,86 @@
+import math
+
+import pytest
+
+from app.services.text_index import BM25_B, BM25_K1, TextIndex
+
+DOCS = {
+    1: [("Video editor", 3), ("Wedding films and travel vlogs", 1)],
+    2: [("Motion designer", 3), ("Editor of short films", 1)],
+    3: [("Photographer", 3), ("Travel travel travel", 1)],
+    4: [("Editor", 3), ("Editing documentaries, films and editorials", 1)],
+    5: [("Colourist", 3), ("Grading for film editors", 1)],
+}
+
+
+def _terms(fields):
+    terms = {}
+    for text, weight in fields:
+        for word in text.lower().replace(",", " ").split():
+            terms[word] = terms.get(word, 0) + weight
+    return terms
+
+
+def _bm25(docs, query):
+    """Brute-force BM25 with prefix matching and every query word required."""
+    terms = {d: _terms(f) for d, f in docs.items()}
+    lengths = {d: sum(t.values()) for d, t in terms.items()}
+    avg = sum(lengths.values()) / len(docs)
+    vocab = {w for t in terms.values() for w in t}
+    out = {}
+    for d, t in terms.items():
+        total = 0.0
+        for word in dict.fromkeys(query.lower().split()):
+            expanded = [v for v in vocab if v.startswith(word)]
+            if not any(v in t for v in expanded):
+                break
+            for v in expanded:
+                if v in t:
+                    df = sum(v in other for other in terms.values())
+                    idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                    tf = t[v]
+                    total += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * lengths[d] / avg))
+        else:
+            out[d] = total
+    return out
+
+
+@pytest.fixture
+def index():
+    index = TextIndex()
+    for doc_id, fields in DOCS.items():
+        index.add(doc_id, fields)
+    return index
+
+
+@pytest.mark.parametrize("query", ["editor", "edit", "films", "travel", "edit films", "film editor", "travel edit", "zzz", ""])
+def test_scores_match_brute_force_bm25(index, query):
+    got = index.search(query)
+    expected = _bm25(DOCS, query) if query else {}
+
+    assert got.keys() == expected.keys()
+    assert all(got[d] == pytest.approx(expected[d]) for d in expected)
+
+
+def test_weighted_title_outranks_body_mentions(index):
+    scores = index.search("editor")
+
+    # Title "Editor" (x3, short doc) ranks first; "Video editor" beats a body-only "Editor".
+    assert max(scores, key=scores.get) == 4
+    assert scores[1] > scores[2]
+
+
+def test_readd_and_remove_update_postings_and_lengths(index):
+    docs = dict(DOCS)
+    docs[3] = [("Travel editor", 3)]
+    del docs[5]
+    index.add(3, docs[3])
+    index.remove(5)
+    index.remove(99)
+
+    assert len(index) == 4
+    for query in ("editor", "travel", "grading", "edit films"):
+        expected = _bm25(docs, query)
+        got = index.search(query)
+        assert got.keys() == expected.keys()
+        assert all(got[d] == pytest.approx(expected[d]) for d in expected)
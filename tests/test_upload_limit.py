@@ -0,0 +1,91 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.profile.router import get_profile_service, router as profile_router
+from app.core.dependencies import get_current_user_id, require_auth
+from app.core.uploads import UploadSizeLimitMiddleware
+
+CAP = 1024
+
+
+class _ProfileServiceStub:
+    def __init__(self):
+        self.updates = []
+
+    async def update(self, user_id, payload, photo_variants=None):
+        self.updates.append(payload)
+        return None
+
+
+@pytest.fixture
+def service():
+    return _ProfileServiceStub()
+
+
+@pytest.fixture
+def client(service):
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=CAP)
+    app.include_router(profile_router, prefix="/api")
+    app.dependency_overrides[require_auth] = lambda: "token"
+    app.dependency_overrides[get_current_user_id] = lambda: 1
+    app.dependency_overrides[get_profile_service] = lambda: service
+    return TestClient(app)
+
+
+def _chunked(body: bytes, size: int = 256):
+    # A generator body is sent with Transfer-Encoding: chunked and no Content-Length.
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+def _multipart(name_value: bytes) -> bytes:
+    return (
+        b"--zzz\r\nContent-Disposition: form-data; name=\"first_name\"\r\n\r\n"
+        + name_value
+        + b"\r\n--zzz--\r\n"
+    )
+
+
+def test_chunked_form_over_the_cap_is_refused(client, service):
+    response = client.post(
+        "/api/profile/update",
+        content=_chunked(_multipart(b"x" * 5 * CAP)),
+        headers={"content-type": "multipart/form-data; boundary=zzz"},
+    )
+
+    assert response.status_code == 413
+    assert service.updates == []
+
+
+def test_chunked_json_over_the_cap_is_refused(client, service):
+    response = client.post(
+        "/api/profile/update",
+        content=_chunked(b'{"first_name": "' + b"x" * 5 * CAP + b'"}'),
+        headers={"content-type": "application/json"},
+    )
+
+    assert response.status_code == 413
+    assert service.updates == []
+
+
+def test_content_length_over_the_cap_is_refused_before_reading(client, service):
+    response = client.post(
+        "/api/profile/update",
+        content=_multipart(b"x" * 5 * CAP),
+        headers={"content-type": "multipart/form-data; boundary=zzz"},
+    )
+
+    assert response.status_code == 413
+    assert service.updates == []
+
+
+def test_chunked_form_under_the_cap_reaches_the_handler(client, service):
+    client.post(
+        "/api/profile/update",
+        content=_chunked(_multipart(b"Ada")),
+        headers={"content-type": "multipart/form-data; boundary=zzz"},
+    )
+
+    assert service.updates == [{"first_name": "Ada"}]